@@ -2,7 +2,7 @@
 
 import asyncio
 import uuid
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from langchain.tools import BaseTool
 
@@ -19,17 +19,25 @@ class LogAnalyzerAgent(BaseAgent):
     3. Provide actionable fix suggestions
     """
 
-    def get_tools(self) -> List[BaseTool]:
+    def get_tools(self, context: Optional[Dict[str, Any]] = None) -> List[BaseTool]:
         """
         Get tools for log analysis.
+
+        Args:
+            context: Event metadata; knowledge base searches are scoped to
+                its ``repository``
         
         Returns:
             List of tools including knowledge base search
         """
         from app.tools.knowledge_base import KnowledgeBaseTool
+
+        repository = (context or {}).get("repository")
+        if repository == "unknown":
+            repository = None
         
         return [
-            KnowledgeBaseTool(),
+            KnowledgeBaseTool(repository=repository),
         ]
 
     def get_system_prompt(self) -> str:
@@ -101,7 +109,7 @@ Provide:
 """
         
         # Create executor
-        executor = self.create_executor()
+        executor = self.create_executor(context)
         
         # Execute agent with timeout
         try:
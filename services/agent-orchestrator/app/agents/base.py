@@ -59,10 +59,13 @@ class BaseAgent(ABC):
             )
 
     @abstractmethod
-    def get_tools(self) -> List[BaseTool]:
+    def get_tools(self, context: Optional[Dict[str, Any]] = None) -> List[BaseTool]:
         """
         Get list of tools for this agent.
 
+        Args:
+            context: Metadata of the analyzed event (repository, branch, ...)
+
         Returns:
             List of LangChain tools
         """
@@ -91,18 +94,21 @@ class BaseAgent(ABC):
         """
         pass
 
-    def create_executor(self) -> AgentExecutor:
+    def create_executor(self, context: Optional[Dict[str, Any]] = None) -> AgentExecutor:
         """
         Create AgentExecutor with configured tools and settings.
         
         Uses ReAct agent framework which works with any LLM (including GPT-2).
         ReAct agents use text-based reasoning instead of function calling.
+
+        Args:
+            context: Metadata of the analyzed event, passed to ``get_tools``
         
         Returns:
             Configured AgentExecutor
         """
 
-        tools = self.get_tools()
+        tools = self.get_tools(context)
         
         # Create ReAct agent using initialize_agent (LangChain 1.x standard)
         # AgentType.ZERO_SHOT_REACT_DESCRIPTION works with any LLM (text-based reasoning)
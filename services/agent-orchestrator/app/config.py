@@ -28,6 +28,14 @@ class Settings(BaseSettings):
         default="http://localhost:9200",
         description="Elasticsearch connection URL",
     )
+    elasticsearch_connections_per_node: int = Field(
+        default=10,
+        description="Keep-alive connections pooled per Elasticsearch node",
+    )
+    elasticsearch_http_compress: bool = Field(
+        default=False,
+        description="Gzip Elasticsearch request bodies and accept gzip responses",
+    )
     model_service_url: str = Field(
         default="http://localhost:8004",
         description="Model service base URL",
@@ -13,6 +13,7 @@ from app.config import settings
 from app.config import settings
 from app.api import health, workflows
 from app.consumers import StreamConsumer
+from app.tools import close_clients
 from app.workflows import WorkflowProcessor
 
 
@@ -83,6 +84,7 @@ async def lifespan(app: FastAPI):
     if workflow_processor:
         await workflow_processor.stop()
     await redis_client.close()
+    await close_clients()
     print("Cleanup complete")
 
 # Create FastAPI app
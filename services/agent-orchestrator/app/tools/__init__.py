@@ -1,5 +1,5 @@
 """Tools package."""
 
-from app.tools.knowledge_base import KnowledgeBaseTool
+from app.tools.knowledge_base import KnowledgeBaseTool, close_clients
 
-__all__ = ["KnowledgeBaseTool"]
+__all__ = ["KnowledgeBaseTool", "close_clients"]
@@ -8,6 +8,63 @@ import httpx
 
 from app.config import settings
 
+# Clients shared by all tool calls (connections are pooled and kept alive)
+_http_client: Optional[httpx.AsyncClient] = None
+_es_client = None
+# Whether the knowledge base index routes by tenant (read once, see _tenant_routing)
+_es_tenant_routing: Optional[bool] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared Indexing Service HTTP client."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(base_url=settings.indexing_service_url, timeout=30.0)
+    return _http_client
+
+
+def _get_es_client():
+    """Get or create the shared Elasticsearch client for the fallback search."""
+    global _es_client
+    if _es_client is None:
+        from elasticsearch import AsyncElasticsearch
+
+        _es_client = AsyncElasticsearch(
+            [settings.elasticsearch_url],
+            connections_per_node=settings.elasticsearch_connections_per_node,
+            http_compress=settings.elasticsearch_http_compress,
+        )
+    return _es_client
+
+
+async def _tenant_routing(es) -> bool:
+    """
+    Whether the knowledge base index routes documents by tenant.
+
+    Read from the ``_meta`` the Indexing Service records in the index behind
+    the alias; indices created before tenant routing route by document ID.
+    Looked up once per process, so degraded fallback searches do not pay
+    an extra round trip each.
+    """
+    global _es_tenant_routing
+    if _es_tenant_routing is None:
+        mapping = await es.indices.get_mapping(index="knowledge_base")
+        meta = next(iter(mapping.values()), {}).get("mappings", {}).get("_meta", {})
+        _es_tenant_routing = bool(meta.get("tenant_routing", False))
+    return _es_tenant_routing
+
+
+async def close_clients():
+    """Close the shared clients, if they were created."""
+    global _http_client, _es_client, _es_tenant_routing
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if _es_client is not None:
+        await _es_client.close()
+        _es_client = None
+    _es_tenant_routing = None
+
 
 class KnowledgeBaseInput(BaseModel):
     """Input schema for knowledge base search (single-input for ZeroShotAgent)."""
@@ -22,6 +79,8 @@ class KnowledgeBaseTool(BaseTool):
     
     Connects to the Indexing Service to perform hybrid search
     (semantic + keyword) over indexed documentation, issues, and logs.
+    With a ``repository``, searches are scoped to that repository's
+    documents plus shared ones.
     """
     
     name: str = "knowledge_base_search"
@@ -33,9 +92,13 @@ Use this tool when you need to:
 - Search for known issues and their fixes
 - Retrieve relevant troubleshooting guides
 
-Input should be a clear, specific search query describing the issue or information needed."""
+Input should be a clear, specific search query describing the issue or information needed.
+An error message or stack trace excerpt can be passed as is; the search reduces it to
+its exception, top frames and error codes."""
     
     args_schema: Type[BaseModel] = KnowledgeBaseInput
+    # Tenant to scope searches to (the repository of the analyzed event)
+    repository: Optional[str] = None
     
     def _run(self, query: str) -> str:
         """
@@ -65,54 +128,58 @@ Input should be a clear, specific search query describing the issue or informati
             top_k = 5
             
             # Call Indexing Service search endpoint
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{settings.indexing_service_url}/search",
-                    json={
-                        "query": query,
-                        "top_k": top_k,
-                        "search_type": "hybrid",  # Semantic + keyword
-                    },
+            response = await _get_http_client().post(
+                "/search",
+                json={
+                    "query": query,
+                    "top_k": top_k,
+                    "search_type": "hybrid",  # Semantic + keyword
+                    "highlight": True,  # Fragments around matched terms
+                    "tenant": self.repository,
+                },
+            )
+            response.raise_for_status()
+            
+            results = response.json()
+            
+            # Format results for agent consumption
+            if not results.get("results"):
+                return f"No relevant results found for: {query}"
+            
+            formatted_results = [f"Search results for '{query}':\n"]
+            
+            for i, result in enumerate(results["results"], 1):
+                title = result.get("title", "Untitled")
+                # Matched-term fragments, else the stored summary
+                content = " ... ".join(result.get("highlights") or []) or result.get(
+                    "content", ""
                 )
-                response.raise_for_status()
-                
-                results = response.json()
-                
-                # Format results for agent consumption
-                if not results.get("results"):
-                    return f"No relevant results found for: {query}"
-                
-                formatted_results = [f"Search results for '{query}':\n"]
+                score = result.get("score", 0.0)
+                source = result.get("source", "unknown")
+                url = result.get("url", "")
                 
-                for i, result in enumerate(results["results"], 1):
-                    title = result.get("title", "Untitled")
-                    content = result.get("content", "")[:300]  # Truncate
-                    score = result.get("score", 0.0)
-                    source = result.get("source", "unknown")
-                    url = result.get("url", "")
-                    
-                    formatted_results.append(
-                        f"{i}. **{title}** (score: {score:.2f}, source: {source})\n"
-                        f"   {content}...\n"
-                        f"   {url}\n"
-                    )
-                
-                return "\n".join(formatted_results)
+                formatted_results.append(
+                    f"{i}. **{title}** (score: {score:.2f}, source: {source})\n"
+                    f"   {content}...\n"
+                    f"   {url}\n"
+                )
+            
+            return "\n".join(formatted_results)
                 
         except httpx.HTTPStatusError as e:
             # Handle 404 or other HTTP errors gracefully
             if e.response.status_code == 404:
-                return self._fallback_elasticsearch_search(query)
+                return await self._fallback_elasticsearch_search(query)
             return f"Error searching knowledge base: {str(e)}"
             
         except httpx.RequestError as e:
             # Network errors - try direct Elasticsearch as fallback
-            return self._fallback_elasticsearch_search(query)
+            return await self._fallback_elasticsearch_search(query)
             
         except Exception as e:
             return f"Unexpected error during search: {str(e)}"
     
-    def _fallback_elasticsearch_search(self, query: str) -> str:
+    async def _fallback_elasticsearch_search(self, query: str) -> str:
         """
         Fallback: Direct Elasticsearch search if Indexing Service unavailable.
         
@@ -123,33 +190,56 @@ Input should be a clear, specific search query describing the issue or informati
             Search results or error message
         """
         try:
-            import asyncio
-            from elasticsearch import AsyncElasticsearch
+            # Hardcode top_k=5
+            top_k = 5
             
-            async def search():
-                es = AsyncElasticsearch([settings.elasticsearch_url])
-                
-                # Hardcode top_k=5
-                top_k = 5
-                
-                # Simple match query
-                result = await es.search(
-                    index="knowledge_base",
-                    body={
-                        "query": {
-                            "multi_match": {
-                                "query": query,
-                                "fields": ["title^2", "content", "error_message"],
+            query_body = {
+                "multi_match": {
+                    "query": query,
+                    "fields": ["title^2", "content", "error_message"],
+                }
+            }
+            es = _get_es_client()
+            routing = None
+            if self.repository:
+                # Same scope as the Indexing Service: the repository plus shared
+                # documents (including those indexed without a tenant)
+                tenants = [self.repository, "_shared"]
+                query_body = {
+                    "bool": {
+                        "must": [query_body],
+                        "filter": [{
+                            "bool": {
+                                "should": [
+                                    {"terms": {"tenant": tenants}},
+                                    {"bool": {"must_not": {"exists": {"field": "tenant"}}}},
+                                ],
+                                "minimum_should_match": 1,
                             }
-                        },
-                        "size": top_k,
+                        }],
                     }
-                )
-                
-                await es.close()
-                return result
-            
-            result = asyncio.create_task(search())
+                }
+                if await _tenant_routing(es):
+                    # Only the tenants' shards hold their documents; without
+                    # tenant routing the filter alone scopes the search
+                    routing = ",".join(tenants)
+
+            # Simple match query; return the short summary and matched
+            # fragments instead of the full content
+            result = await es.search(
+                index="knowledge_base",
+                routing=routing,
+                body={
+                    "query": query_body,
+                    "size": top_k,
+                    "_source": ["title", "summary"],
+                    "highlight": {
+                        "fields": {
+                            "content": {"fragment_size": 150, "number_of_fragments": 2}
+                        }
+                    },
+                }
+            )
             
             if not result.get("hits", {}).get("hits"):
                 return f"No results found for: {query}"
@@ -158,7 +248,9 @@ Input should be a clear, specific search query describing the issue or informati
             for i, hit in enumerate(result["hits"]["hits"], 1):
                 source = hit["_source"]
                 title = source.get("title", "Untitled")
-                content = source.get("content", "")[:300]
+                content = " ... ".join(
+                    hit.get("highlight", {}).get("content", [])
+                ) or source.get("summary", "")
                 score = hit.get("_score", 0.0)
                 
                 formatted.append(
@@ -0,0 +1,78 @@
+"""Unit tests for the knowledge base tool's direct Elasticsearch fallback."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.tools import knowledge_base
+from app.tools.knowledge_base import KnowledgeBaseTool, close_clients
+
+
+@pytest.fixture(autouse=True)
+async def reset_clients():
+    """Start every test without cached clients or routing flag."""
+    await close_clients()
+    yield
+    await close_clients()
+
+
+def es_client(meta):
+    """Elasticsearch client whose knowledge base index carries ``meta``."""
+    es = AsyncMock()
+    es.indices.get_mapping = AsyncMock(
+        return_value={"knowledge_base_v2": {"mappings": {"_meta": meta}}}
+    )
+    es.search = AsyncMock(return_value={"hits": {"hits": []}})
+    return es
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "meta, routing",
+    [
+        ({"tenant_routing": True}, "repo-a,_shared"),
+        ({"tenant_routing": False}, None),
+        ({}, None),
+    ],
+)
+async def test_fallback_routes_only_tenant_routed_indices(meta, routing):
+    """Test routing is only sent when the index routes by tenant."""
+    es = es_client(meta)
+    tool = KnowledgeBaseTool(repository="repo-a")
+
+    with patch("app.tools.knowledge_base._get_es_client", return_value=es):
+        await tool._fallback_elasticsearch_search("timeout")
+
+    kwargs = es.search.await_args.kwargs
+    assert kwargs["routing"] == routing
+    # The tenant filter scopes the search either way
+    assert kwargs["body"]["query"]["bool"]["filter"]
+
+
+@pytest.mark.asyncio
+async def test_fallback_without_repository_queries_every_shard():
+    """Test unscoped searches skip the routing lookup."""
+    es = es_client({"tenant_routing": True})
+    tool = KnowledgeBaseTool()
+
+    with patch("app.tools.knowledge_base._get_es_client", return_value=es):
+        await tool._fallback_elasticsearch_search("timeout")
+
+    es.indices.get_mapping.assert_not_awaited()
+    assert es.search.await_args.kwargs["routing"] is None
+
+
+@pytest.mark.asyncio
+async def test_routing_flag_is_read_once_per_process():
+    """Test the index mapping is only fetched by the first scoped search."""
+    es = es_client({"tenant_routing": True})
+    tool = KnowledgeBaseTool(repository="repo-a")
+
+    with patch("app.tools.knowledge_base._get_es_client", return_value=es):
+        await tool._fallback_elasticsearch_search("timeout")
+        await tool._fallback_elasticsearch_search("oom")
+
+    assert es.indices.get_mapping.await_count == 1
+    assert es.search.await_args.kwargs["routing"] == "repo-a,_shared"
+
+    await close_clients()
+    assert knowledge_base._es_tenant_routing is None
@@ -1,9 +1,13 @@
 """Health check endpoints for Indexing service."""
 
-from fastapi import APIRouter
+from typing import Any, Dict
+
+from fastapi import APIRouter, Response, status as http_status
+from prometheus_client import CONTENT_TYPE_LATEST
 
 from app.models.requests import HealthResponse
-from app.services import get_embedding_service, get_search_service
+from app.services import get_es_client, get_service_container
+from app.services.telemetry import prometheus_metrics
 from app.config import settings
 
 router = APIRouter(tags=["health"])
@@ -17,27 +21,14 @@ async def health_check() -> HealthResponse:
     Checks:
     - Service availability
     - Elasticsearch connection
-    - Embedding model loaded
+    - Embedding model loaded (without loading it)
     
     Returns:
         Health status with component checks
     """
-    # Check Elasticsearch
-    search_service = await get_search_service()
-    es_connected = False
-    try:
-        await search_service.es.ping()
-        es_connected = True
-    except Exception as e:
-        print(f"Elasticsearch health check failed: {e}")
-
-    # Check embedding model
-    model_loaded = False
-    try:
-        embedding_service = get_embedding_service()
-        model_loaded = True
-    except Exception as e:
-        print(f"Embedding model health check failed: {e}")
+    es_connected = await _ping_elasticsearch()
+    components = get_service_container().status()["components"]
+    model_loaded = components["embedding_model"]["status"] == "ready"
 
     status = "healthy" if (es_connected and model_loaded) else "degraded"
 
@@ -51,20 +42,44 @@ async def health_check() -> HealthResponse:
 
 
 @router.get("/ready")
-async def readiness_check():
+async def readiness_check(response: Response) -> Dict[str, Any]:
     """
     Kubernetes readiness probe.
     
-    Returns 200 if service is ready to accept traffic.
+    Returns 200 once Elasticsearch is reachable and (with preloading) the
+    search service and models are loaded, 503 before that, with the status
+    of each component. A failed preload is retried. Without preloading the
+    models load on first request, so only Elasticsearch is required.
     """
-    # Check critical components
-    search_service = await get_search_service()
+    container = get_service_container()
+    if settings.preload_services:
+        container.start()
+    readiness = container.status()
+    es_connected = await _ping_elasticsearch()
+    ready = es_connected and (readiness["ready"] or not settings.preload_services)
+    if not ready:
+        response.status_code = http_status.HTTP_503_SERVICE_UNAVAILABLE
+    return {**readiness, "ready": ready, "elasticsearch_connected": es_connected}
+
+
+async def _ping_elasticsearch() -> bool:
+    """Whether Elasticsearch answers a ping."""
     try:
-        await search_service.es.ping()
-        get_embedding_service()
-        return {"ready": True}
-    except Exception:
-        return {"ready": False}
+        return bool(await get_es_client().ping())
+    except Exception as e:
+        print(f"Elasticsearch health check failed: {e}")
+        return False
+
+
+@router.get("/metrics")
+async def metrics() -> Response:
+    """
+    Prometheus metrics.
+
+    Served from the background telemetry snapshot and in-process counters;
+    scraping does not query Elasticsearch.
+    """
+    return Response(prometheus_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 
 @router.get("/live")
@@ -1,19 +1,46 @@
 """Indexing and search API endpoints."""
 
+import json
+import time
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, List, Tuple
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
+from app.config import settings
 from app.models.requests import (
     DocumentIndexRequest,
     DocumentIndexResponse,
     BatchIndexRequest,
     BatchIndexResponse,
+    ReindexRequest,
+    RebuildRequest,
+    MigrateRequest,
+    JobResponse,
     SearchRequest,
     SearchResponse,
 )
-from app.services import get_embedding_service, get_search_service
+from app.services import (
+    EmbeddingService,
+    IndexingPipeline,
+    SearchService,
+    get_embedding_registry,
+    get_job_registry,
+    get_search_cache,
+    get_search_service,
+    get_service_container,
+    get_telemetry,
+)
+from app.services.es_client import client_metrics
+from app.services.rebuild import run_migration, run_rebuild
+from app.services.rerank import aget_rerank_service, peek_rerank_service
+from app.services.reindex import run_reindex
+from app.services.dedup import dedup_stats
+from app.services.log_parsing import query_signature
+from app.services.search import FACET_FIELDS, SearchResults, collapse_duplicates
+from app.services.tenants import tenant_scope
 
 router = APIRouter(tags=["indexing"])
 
@@ -37,31 +64,24 @@ async def index_document(request: DocumentIndexRequest) -> DocumentIndexResponse
         doc_id = request.id or str(uuid.uuid4())
         
         # Get services
-        embedding_service = get_embedding_service()
         search_service = await get_search_service()
+        embedding_service = await search_service.aembedding_service()
         
-        # Generate embedding
-        embedding = embedding_service.embed_text(f"{request.title} {request.content}")
-        
-        # Index document
-        success = await search_service.index_document(
-            doc_id=doc_id,
-            title=request.title,
-            content=request.content,
-            embedding=embedding,
-            metadata=request.metadata,
-        )
-        
-        if not success:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to index document",
-            )
+        # Embed and index (skipped if content and model are unchanged)
+        result: Dict[str, Any] = {}
+        pipeline = IndexingPipeline(embedding_service, search_service)
+        async for ok, result in pipeline.run([_document_dict(request, doc_id)]):
+            if not ok:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to index document: {result.get('error')}",
+                )
         
         return DocumentIndexResponse(
             id=doc_id,
             indexed=True,
             embedding_dimension=embedding_service.get_dimension(),
+            result=result.get("result") or "created",
         )
         
     except HTTPException:
@@ -86,32 +106,30 @@ async def index_batch(request: BatchIndexRequest) -> BatchIndexResponse:
     """
     try:
         # Get services
-        embedding_service = get_embedding_service()
         search_service = await get_search_service()
+        embedding_service = await search_service.aembedding_service()
         
-        # Prepare documents
-        documents = []
-        for doc_req in request.documents:
-            doc_id = doc_req.id or str(uuid.uuid4())
-            
-            # Generate embedding
-            text = f"{doc_req.title} {doc_req.content}"
-            embedding = embedding_service.embed_text(text)
-            
-            documents.append({
-                "id": doc_id,
-                "title": doc_req.title,
-                "content": doc_req.content,
-                "embedding": embedding,
-                "metadata": doc_req.metadata,
-            })
+        # Prepare documents (embedded by the pipeline in micro-batches)
+        documents = [
+            _document_dict(doc_req, doc_req.id or str(uuid.uuid4()))
+            for doc_req in request.documents
+        ]
         
         # Batch index
-        success_count, error_count = await search_service.index_batch(documents)
+        counts = {"indexed": 0, "failed": 0, "skipped": 0}
+        pipeline = IndexingPipeline(embedding_service, search_service)
+        async for ok, result in pipeline.run(documents):
+            if not ok:
+                counts["failed"] += 1
+            elif result.get("result") in ("skipped", "duplicate"):
+                counts["skipped"] += 1
+            else:
+                counts["indexed"] += 1
         
         return BatchIndexResponse(
-            indexed_count=success_count,
-            failed_count=error_count,
+            indexed_count=counts["indexed"],
+            failed_count=counts["failed"],
+            skipped_count=counts["skipped"],
             document_ids=[doc["id"] for doc in documents],
         )
         
@@ -122,10 +140,341 @@ async def index_batch(request: BatchIndexRequest) -> BatchIndexResponse:
         )
 
 
+@router.post("/index/stream")
+async def index_stream(request: Request) -> StreamingResponse:
+    """
+    Index documents streamed as NDJSON (one ``DocumentIndexRequest`` per line).
+
+    The body is parsed incrementally, so it can be sent with chunked transfer
+    encoding and never has to fit in memory. Documents are embedded in
+    micro-batches and flushed to Elasticsearch while later lines are still
+    arriving.
+
+    The response is NDJSON as well:
+    - ``{"event": "error", "line": ..., "id": ..., "error": ...}`` per failed line
+    - ``{"event": "progress", "indexed": ..., "skipped": ..., "failed": ...}`` periodically
+    - ``{"event": "summary", "indexed": ..., "skipped": ..., "failed": ..., "lines": ...}``
+      at the end
+
+    Args:
+        request: Raw request with an NDJSON body
+
+    Returns:
+        Streaming NDJSON progress response
+    """
+    try:
+        search_service = await get_search_service()
+        embedding_service = await search_service.aembedding_service()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Indexing unavailable: {str(e)}",
+        )
+
+    pipeline = IndexingPipeline(embedding_service, search_service)
+    return StreamingResponse(
+        _stream_index_events(request.stream(), pipeline),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _stream_index_events(
+    chunks: AsyncIterator[bytes],
+    pipeline: IndexingPipeline,
+) -> AsyncIterator[bytes]:
+    """Run the ingest pipeline over an NDJSON body and emit progress events."""
+    counts = {"indexed": 0, "skipped": 0, "failed": 0, "lines": 0}
+    pending_errors: List[Dict[str, Any]] = []
+    line_numbers: Dict[str, int] = {}
+
+    def event(payload: Dict[str, Any]) -> bytes:
+        return (json.dumps(payload) + "\n").encode("utf-8")
+
+    async def documents() -> AsyncIterator[Dict[str, Any]]:
+        async for line_no, line in _iter_ndjson(chunks):
+            counts["lines"] = line_no
+            try:
+                doc_req = DocumentIndexRequest.model_validate_json(line)
+            except ValidationError as e:
+                counts["failed"] += 1
+                pending_errors.append({
+                    "event": "error",
+                    "line": line_no,
+                    "error": f"Invalid document: {e.errors()[0]['msg']}",
+                })
+                continue
+
+            doc_id = doc_req.id or str(uuid.uuid4())
+            line_numbers[doc_id] = line_no
+            yield _document_dict(doc_req, doc_id)
+
+    processed = 0
+    try:
+        async for ok, result in pipeline.run(documents()):
+            line_no = line_numbers.pop(result["id"], None)
+            if ok and result.get("result") in ("skipped", "duplicate"):
+                counts["skipped"] += 1
+            elif ok:
+                counts["indexed"] += 1
+            else:
+                counts["failed"] += 1
+                pending_errors.append({
+                    "event": "error",
+                    "line": line_no,
+                    "id": result["id"],
+                    "error": result.get("error"),
+                })
+
+            while pending_errors:
+                yield event(pending_errors.pop(0))
+
+            processed += 1
+            if processed % settings.stream_progress_interval == 0:
+                yield event({
+                    "event": "progress",
+                    "indexed": counts["indexed"],
+                    "skipped": counts["skipped"],
+                    "failed": counts["failed"],
+                })
+    except Exception as e:
+        # Headers are already sent, so report the abort in-band
+        yield event({"event": "aborted", "error": str(e)})
+
+    while pending_errors:
+        yield event(pending_errors.pop(0))
+    yield event({"event": "summary", **counts})
+
+
+def _document_dict(doc_req: DocumentIndexRequest, doc_id: str) -> Dict[str, Any]:
+    """Convert an index request into a pipeline document."""
+    return {
+        "id": doc_id,
+        "title": doc_req.title,
+        "content": doc_req.content,
+        "metadata": doc_req.metadata,
+        "tenant": doc_req.tenant,
+    }
+
+
+async def _iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split a byte stream into non-empty NDJSON lines with 1-based line numbers."""
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+    if buffer.strip():
+        yield line_no + 1, buffer
+
+
+@router.post("/reindex", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_reindex(request: ReindexRequest) -> JobResponse:
+    """
+    Start an incremental reindex job in the background.
+
+    With ``documents``, unchanged documents are skipped, changed ones are
+    re-embedded and, with ``prune``, indexed documents missing from the set
+    are deleted. Without ``documents``, documents embedded with a different
+    model are re-embedded.
+
+    Args:
+        request: Reindex request
+
+    Returns:
+        Submitted job (poll ``GET /reindex/{job_id}`` for progress)
+    """
+    if request.documents is not None and any(doc.id is None for doc in request.documents):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Reindex documents must have an id",
+        )
+
+    try:
+        search_service = await get_search_service()
+        embedding_service = await search_service.aembedding_service()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Indexing unavailable: {str(e)}",
+        )
+
+    documents = None
+    if request.documents is not None:
+        documents = [_document_dict(doc_req, doc_req.id) for doc_req in request.documents]
+
+    job = get_job_registry().submit(
+        "reindex",
+        lambda job: run_reindex(
+            job,
+            embedding_service,
+            search_service,
+            documents=documents,
+            source=request.source,
+            prune=request.prune,
+        ),
+    )
+    return JobResponse(**job.to_dict())
+
+
+@router.get("/reindex/{job_id}", response_model=JobResponse)
+async def get_reindex(job_id: str) -> JobResponse:
+    """
+    Get reindex job status and counts.
+
+    Args:
+        job_id: Job ID returned by ``POST /reindex``
+
+    Returns:
+        Job status with created, updated, skipped, deleted and failed counts
+    """
+    return _job_response(job_id, "reindex")
+
+
+@router.post("/rebuild", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_rebuild(request: RebuildRequest) -> JobResponse:
+    """
+    Rebuild the index into a new versioned index without downtime.
+
+    Searches keep using the current index while documents are copied (and
+    re-embedded if needed) into the new one at bounded throughput; writes
+    arriving meanwhile go to both. The alias is swapped atomically at the end.
+    Use this after changing mappings, vector settings or the embedding model.
+
+    Args:
+        request: Rebuild options
+
+    Returns:
+        Submitted job (poll ``GET /rebuild/{job_id}`` for progress)
+    """
+    registry = get_job_registry()
+    if registry.running("rebuild") or registry.running("migrate"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A rebuild is already running",
+        )
+
+    try:
+        search_service = await get_search_service()
+        embedding_service = await search_service.aembedding_service()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Indexing unavailable: {str(e)}",
+        )
+
+    job = registry.submit(
+        "rebuild",
+        lambda job: run_rebuild(
+            job,
+            embedding_service,
+            search_service,
+            reembed=request.reembed,
+            delete_old=request.delete_old,
+            max_docs_per_second=request.max_docs_per_second,
+        ),
+    )
+    return JobResponse(**job.to_dict())
+
+
+@router.get("/rebuild/{job_id}", response_model=JobResponse)
+async def get_rebuild(job_id: str) -> JobResponse:
+    """
+    Get rebuild job status and counts.
+
+    Args:
+        job_id: Job ID returned by ``POST /rebuild``
+
+    Returns:
+        Job status with copied, re-embedded, superseded, reconciled and failed counts
+    """
+    return _job_response(job_id, "rebuild")
+
+
+@router.post("/migrate", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_migration(request: MigrateRequest) -> JobResponse:
+    """
+    Migrate the index to another embedding model without a restart.
+
+    The new model is loaded next to the current one and the index is
+    rebuilt with it in the background. Until the rebuild finishes, searches
+    are embedded with the current model against the current index; at the
+    alias swap both switch to the new model, so no search mixes the two.
+
+    Args:
+        request: Migration options
+
+    Returns:
+        Submitted job (poll ``GET /migrate/{job_id}`` for progress)
+    """
+    registry = get_job_registry()
+    if registry.running("rebuild") or registry.running("migrate"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A rebuild is already running",
+        )
+
+    try:
+        search_service = await get_search_service()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Indexing unavailable: {str(e)}",
+        )
+
+    job = registry.submit(
+        "migrate",
+        lambda job: run_migration(
+            job,
+            search_service,
+            request.model,
+            backend=request.backend,
+            delete_old=request.delete_old,
+            max_docs_per_second=request.max_docs_per_second,
+            unload_old=request.unload_old,
+        ),
+    )
+    return JobResponse(**job.to_dict())
+
+
+@router.get("/migrate/{job_id}", response_model=JobResponse)
+async def get_migration(job_id: str) -> JobResponse:
+    """
+    Get migration job status and counts.
+
+    Args:
+        job_id: Job ID returned by ``POST /migrate``
+
+    Returns:
+        Job status with the old and new model and the rebuild counts
+    """
+    return _job_response(job_id, "migrate")
+
+
+def _job_response(job_id: str, kind: str) -> JobResponse:
+    """Look up a job of the given kind or raise 404."""
+    job = get_job_registry().get(job_id)
+    if job is None or job.kind != kind:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job not found: {job_id}",
+        )
+    return JobResponse(**job.to_dict())
+
+
 @router.post("/search", response_model=SearchResponse)
 async def search(request: SearchRequest) -> SearchResponse:
     """
     Search indexed documents using hybrid (semantic + keyword) retrieval.
+
+    With a ``tenant``, only that repository's or team's documents (and, by
+    default, shared ones) are searched.
+
+    Long log excerpts and stack traces are searched by their failure
+    signature (see ``query_signature``), which is also what the cache keys on.
     
     Args:
         request: Search request
@@ -133,41 +482,78 @@ async def search(request: SearchRequest) -> SearchResponse:
     Returns:
         Search results
     """
+    unknown_facets = set(request.facets or []) - set(FACET_FIELDS)
+    if unknown_facets:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported facets {sorted(unknown_facets)}; use any of {FACET_FIELDS}",
+        )
+
+    if request.tenant:
+        # The tenant scope replaces any tenant filter (and is part of the cache key)
+        request.filters = {
+            **(request.filters or {}),
+            "tenant": tenant_scope(request.tenant, request.include_shared),
+        }
+
+    query = request.query
+    signature = query_signature(query) if _use_signature(request) else None
+    if signature:
+        # Both retrieval legs, the reranker and the cache see the signature
+        request.query = signature
+
+    get_telemetry().record_search()
     try:
         # Validate top_k
-        from app.config import settings
         top_k = min(request.top_k, settings.max_top_k)
         
         # Get services
-        embedding_service = get_embedding_service()
         search_service = await get_search_service()
         
-        # Execute search based on type
-        if request.search_type == "semantic":
-            # Semantic search only
-            query_embedding = embedding_service.embed_text(request.query)
-            results = await search_service.semantic_search(
-                query_embedding,
-                top_k,
-                request.filters,
-            )
-            
-        elif request.search_type == "keyword":
-            # Keyword search only
-            results = await search_service.keyword_search(
-                request.query,
-                top_k,
-                request.filters,
-            )
-            
-        else:  # hybrid (default)
-            # Hybrid search
-            query_embedding = embedding_service.embed_text(request.query)
-            results = await search_service.hybrid_search(
-                request.query,
-                query_embedding,
-                top_k,
-                request.filters,
+        rerank = settings.rerank_enabled if request.rerank is None else request.rerank
+        collapse = settings.dedup_collapse if request.collapse is None else request.collapse
+        
+        # Serve repeated queries from the cache until the next index write
+        cache = get_search_cache()
+        cache_key = cache.make_key(
+            request.query,
+            request.search_type,
+            top_k,
+            request.filters,
+            rerank=rerank,
+            collapse=collapse,
+            facets=sorted(request.facets or []),
+            facet_size=request.facet_size,
+            highlight=request.highlight,
+        )
+        generation = search_service.generation
+        results = cache.get(cache_key, generation)
+        
+        if results is None:
+            started = time.perf_counter()
+            if rerank:
+                rerank_service = await aget_rerank_service()
+                # Retrieve a wider candidate set for the cross-encoder
+                candidates = await _execute_search(
+                    request,
+                    max(top_k, settings.rerank_top_n),
+                    search_service,
+                    collapse,
+                )
+                results = SearchResults(
+                    await rerank_service.rerank(
+                        request.query, candidates, top_k, generation
+                    ),
+                    candidates.facets,
+                )
+            else:
+                results = await _execute_search(request, top_k, search_service, collapse)
+            cache.put(
+                cache_key,
+                results,
+                generation,
+                compute_ms=(time.perf_counter() - started) * 1000,
+                cacheable=search_service.writes_settled(),
             )
         
         # Format response
@@ -182,15 +568,20 @@ async def search(request: SearchRequest) -> SearchResponse:
                 source=r.get("source"),
                 url=r.get("url"),
                 metadata=r.get("metadata"),
+                highlights=r.get("highlights"),
+                cluster_id=r.get("cluster_id"),
+                duplicates=r.get("duplicates", 0),
             )
             for r in results
         ]
         
         return SearchResponse(
-            query=request.query,
+            query=query,
+            signature=signature,
             results=search_results,
             total=len(search_results),
             search_type=request.search_type,
+            facets=results.facets if request.facets else None,
         )
         
     except Exception as e:
@@ -200,32 +591,166 @@ async def search(request: SearchRequest) -> SearchResponse:
         )
 
 
+def _use_signature(request: SearchRequest) -> bool:
+    """Whether the request's query may be reduced to its failure signature."""
+    return settings.query_signature_enabled if request.signature is None else request.signature
+
+
+async def _execute_search(
+    request: SearchRequest,
+    top_k: int,
+    search_service: SearchService,
+    collapse: bool = False,
+) -> SearchResults:
+    """
+    Run the search with the query embedded by the serving index's model.
+
+    If the index is cut over to another model while the search runs (its
+    query vector then no longer matches the index, and the old model may
+    already be unloaded), the search is repeated with the new model rather
+    than failed.
+    """
+    model = search_service.embedding_model_version
+    try:
+        results = await _run_search(
+            request, top_k, await search_service.aembedding_service(), search_service, collapse
+        )
+    except Exception:
+        if search_service.embedding_model_version == model:
+            raise
+        results = None
+    if search_service.embedding_model_version != model:
+        print(f"Index cut over to {search_service.embedding_model_version} mid-search; retrying")
+        results = await _run_search(
+            request, top_k, await search_service.aembedding_service(), search_service, collapse
+        )
+    return results
+
+
+async def _run_search(
+    request: SearchRequest,
+    top_k: int,
+    embedding_service: EmbeddingService,
+    search_service: SearchService,
+    collapse: bool = False,
+) -> SearchResults:
+    """Run the requested search type, collapsing near-duplicates if asked."""
+    if collapse:
+        # Over-fetch so enough distinct clusters remain after collapsing
+        results = await _run_search(
+            request,
+            top_k * settings.dedup_collapse_oversample,
+            embedding_service,
+            search_service,
+        )
+        return collapse_duplicates(results, top_k)
+
+    # Execute search based on type
+    if request.search_type == "semantic":
+        # Semantic search only
+        query_embedding = await embedding_service.aembed_text(request.query)
+        return await search_service.semantic_search(
+            query_embedding,
+            top_k,
+            request.filters,
+            facets=request.facets,
+            facet_size=request.facet_size,
+        )
+
+    if request.search_type == "keyword":
+        # Keyword search only
+        return await search_service.keyword_search(
+            request.query,
+            top_k,
+            request.filters,
+            facets=request.facets,
+            facet_size=request.facet_size,
+            highlight=request.highlight,
+        )
+
+    # Hybrid search (default)
+    query_embedding = await embedding_service.aembed_text(request.query)
+    return await search_service.hybrid_search(
+        request.query,
+        query_embedding,
+        top_k,
+        request.filters,
+        facets=request.facets,
+        facet_size=request.facet_size,
+        highlight=request.highlight,
+    )
+
+
 @router.get("/stats")
-async def get_stats() -> Dict[str, Any]:
+async def get_stats(refresh: bool = False) -> Dict[str, Any]:
     """
     Get indexing statistics.
-    
+
+    Index statistics come from the background telemetry snapshot (see
+    ``IndexTelemetry``), so polling this endpoint does not query
+    Elasticsearch; ``telemetry.age_seconds`` tells how old they are. Models
+    that are not loaded yet are reported as such rather than loaded.
+
+    Args:
+        refresh: Collect fresh index statistics first (e.g. right after a load)
+
     Returns:
-        Index statistics (document count, size, etc.)
+        Index statistics (document count, size, segments, rates, etc.)
     """
-    try:
-        search_service = await get_search_service()
-        
-        # Get index stats
-        stats = await search_service.es.indices.stats(index=search_service.index)
-        
-        index_stats = stats["indices"].get(search_service.index, {})
-        
-        return {
-            "index": search_service.index,
-            "document_count": index_stats.get("total", {}).get("docs", {}).get("count", 0),
-            "size_bytes": index_stats.get("total", {}).get("store", {}).get("size_in_bytes", 0),
-            "embedding_model": get_embedding_service().model_name,
-            "embedding_dimension": get_embedding_service().get_dimension(),
-        }
-        
-    except Exception as e:
+    telemetry = get_telemetry()
+    if refresh or not telemetry.snapshot:
+        # Also covers the first request before the first background collection
+        await telemetry.collect()
+    snapshot = telemetry.stats()
+    if not telemetry.snapshot:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Stats error: {str(e)}",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Stats unavailable: {telemetry.last_error}",
         )
+
+    search_service = await get_search_service()
+    registry = get_embedding_registry()
+    embedding_service = registry.peek(
+        search_service.embedding_model, search_service.embedding_backend
+    )
+    rerank_service = peek_rerank_service()
+    return {
+        **{key: snapshot[key] for key in _SNAPSHOT_FIELDS},
+        "embedding_models_loaded": registry.loaded(),
+        "embedding_rebuild_model": search_service.rebuild_model,
+        "tenant_routing": search_service.tenant_routing,
+        "embedding_batching": embedding_service.batching_stats() if embedding_service else None,
+        "search_cache": get_search_cache().stats(),
+        "rerank": rerank_service.stats() if rerank_service else None,
+        "dedup": dedup_stats.stats(),
+        "elasticsearch_client": {
+            **client_metrics.stats(),
+            "connections": snapshot["connections"],
+        },
+        "telemetry": {key: snapshot[key] for key in _TELEMETRY_FIELDS},
+        "services": get_service_container().status(),
+    }
+
+
+# Fields of the telemetry snapshot returned at the top level of /stats
+_SNAPSHOT_FIELDS = [
+    "index",
+    "physical_index",
+    "rebuild_target",
+    "document_count",
+    "size_bytes",
+    "segment_count",
+    "vector_memory_bytes",
+    "ingest_docs_per_second",
+    "queries_per_second",
+    "embedding_model",
+    "embedding_dimension",
+]
+_TELEMETRY_FIELDS = [
+    "collected_at",
+    "age_seconds",
+    "interval_seconds",
+    "collections",
+    "failures",
+    "last_error",
+]
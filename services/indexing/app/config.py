@@ -1,5 +1,7 @@
 """Configuration management for Indexing service."""
 
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -18,6 +20,13 @@ class Settings(BaseSettings):
     port: int = Field(default=8003, description="Server port")
     debug: bool = Field(default=False, description="Debug mode")
     host: str = Field(default="0.0.0.0", description="Server host")
+    preload_services: bool = Field(
+        default=True,
+        description=(
+            "Load the search service and models in the background at startup; /ready "
+            "reports ready once they are (otherwise they load on first request)"
+        ),
+    )
 
     # Elasticsearch Configuration
     elasticsearch_url: str = Field(
@@ -28,6 +37,36 @@ class Settings(BaseSettings):
         default="knowledge_base",
         description="Default Elasticsearch index",
     )
+    elasticsearch_connections_per_node: int = Field(
+        default=25,
+        description="Keep-alive connections pooled per Elasticsearch node",
+    )
+    elasticsearch_http_compress: bool = Field(
+        default=False,
+        description="Gzip request bodies and accept gzip responses",
+    )
+    elasticsearch_request_timeout: float = Field(
+        default=30.0,
+        description="Elasticsearch request timeout in seconds",
+    )
+    elasticsearch_max_retries: int = Field(
+        default=3,
+        description="Retries of failed or timed-out Elasticsearch requests",
+    )
+    elasticsearch_shards: int = Field(
+        default=1,
+        description="Primary shards of newly created (or rebuilt) physical indices",
+    )
+
+    # Tenant Partitioning Configuration
+    tenant_routing: bool = Field(
+        default=True,
+        description=(
+            "Route each tenant's (repository's or team's) documents to one shard so "
+            "tenant-scoped searches only query that shard; applies to indices created "
+            "or rebuilt afterwards"
+        ),
+    )
 
     # Embedding Model Configuration
     embedding_model: str = Field(
@@ -42,10 +81,108 @@ class Settings(BaseSettings):
         default="cpu",
         description="Device for inference (cuda/cpu)",
     )
+    embedding_backend: Literal["torch", "onnx"] = Field(
+        default="torch",
+        description="Inference backend: torch (sentence-transformers) or onnx (ONNX Runtime, CPU)",
+    )
+    onnx_cache_dir: str = Field(
+        default="./cache/onnx",
+        description="Directory for ONNX models exported from sentence-transformers",
+    )
+    onnx_quantize: bool = Field(
+        default=True,
+        description="Use int8 dynamic quantization for the ONNX backend",
+    )
     batch_size: int = Field(
         default=32,
         description="Batch size for embedding generation",
     )
+    embedding_workers: int = Field(
+        default=1,
+        description="Threads running encode calls off the event loop",
+    )
+    embedding_coalesce_window_ms: float = Field(
+        default=2.0,
+        description="Wait this long for concurrent embedding requests to share one encode call",
+    )
+    embedding_max_batch_size: int = Field(
+        default=64,
+        description="Maximum texts merged into one encode call from concurrent requests",
+    )
+    torch_num_threads: int = Field(
+        default=0,
+        description=(
+            "Intra-op threads for torch or ONNX Runtime (0 = runtime default); "
+            "keep workers x threads <= cores"
+        ),
+    )
+
+    # Vector Storage Configuration
+    vector_storage: Literal["float", "int8_hnsw", "binary"] = Field(
+        default="float",
+        description=(
+            "Vector storage mode: float (exact script_score), int8_hnsw (int8-quantized HNSW, "
+            "ES >= 8.12) or binary (bit vectors with float rescoring, ES >= 8.15)"
+        ),
+    )
+    knn_candidates_factor: int = Field(
+        default=10,
+        description="kNN num_candidates per requested result for quantized storage modes",
+    )
+    binary_rescore_oversample: int = Field(
+        default=4,
+        description="Extra candidate multiplier for binary vectors before float rescoring",
+    )
+
+    # Bulk / Streaming Ingest Configuration
+    bulk_chunk_size: int = Field(
+        default=500,
+        description="Documents per Elasticsearch bulk request",
+    )
+    bulk_max_chunk_bytes: int = Field(
+        default=10 * 1024 * 1024,
+        description="Maximum size in bytes of a single bulk request",
+    )
+    bulk_concurrency: int = Field(
+        default=2,
+        description="Concurrent bulk writers per ingest pipeline",
+    )
+    incremental_indexing: bool = Field(
+        default=True,
+        description="Skip re-embedding documents whose content and model are unchanged",
+    )
+    stream_batch_size: int = Field(
+        default=64,
+        description="Documents per embedding micro-batch for streaming ingest",
+    )
+    stream_queue_size: int = Field(
+        default=4,
+        description="Embedded micro-batches buffered ahead of the bulk writer",
+    )
+    stream_progress_interval: int = Field(
+        default=500,
+        description="Documents between progress events on /index/stream",
+    )
+
+    # Index Rebuild Configuration
+    rebuild_batch_size: int = Field(
+        default=256,
+        description="Documents copied per batch during a background index rebuild",
+    )
+    rebuild_max_docs_per_second: float = Field(
+        default=200.0,
+        description="Throughput cap for background index rebuilds (0 = unlimited)",
+    )
+
+    # Snapshot Configuration (export / import, see app.services.snapshot)
+    snapshot_batch_size: int = Field(
+        default=5000,
+        description="Documents per record batch written to or read from a snapshot",
+    )
+    snapshot_compression: str = Field(
+        default="zstd",
+        description="Snapshot compression: zstd or lz4 (Arrow and Parquet), snappy (Parquet)",
+    )
 
     # Search Configuration
     default_top_k: int = Field(
@@ -56,6 +193,156 @@ class Settings(BaseSettings):
         default=100,
         description="Maximum number of search results",
     )
+    summary_length: int = Field(
+        default=500,
+        description="Length of the stored summary returned in place of full content",
+    )
+    highlight_fragment_size: int = Field(
+        default=150,
+        description="Characters per highlight fragment",
+    )
+    highlight_fragments: int = Field(
+        default=3,
+        description="Highlight fragments returned per result",
+    )
+
+    # Log Analysis Configuration (indices with the log-aware analyzers)
+    log_match_tie_breaker: float = Field(
+        default=0.3,
+        description=(
+            "Weight of the other fields' scores when a keyword query matches both the "
+            "standard and the log-analyzed fields"
+        ),
+    )
+    log_error_code_boost: float = Field(
+        default=3.0,
+        description="Score added for each error code shared with the query (ORA-00942, ...)",
+    )
+    log_path_boost: float = Field(
+        default=2.0,
+        description="Score added for a file path or file name shared with the query",
+    )
+
+    # Query Signature Configuration (log excerpts pasted as search queries)
+    query_signature_enabled: bool = Field(
+        default=True,
+        description=(
+            "Search long log excerpts and stack traces by their failure signature "
+            "(exception types, top frames, error codes) instead of the raw text"
+        ),
+    )
+    query_signature_min_chars: int = Field(
+        default=200,
+        description=(
+            "Queries this long, or with stack frames, are reduced to their signature "
+            "(log excerpts) or stripped of timestamps, addresses and IDs (prose)"
+        ),
+    )
+    query_signature_max_frames: int = Field(
+        default=3,
+        description="Application stack frames kept in a signature, innermost first",
+    )
+    query_signature_max_chars: int = Field(
+        default=300,
+        description="Longest signature searched; longer ones are cut at a word boundary",
+    )
+
+    # Near-Duplicate Configuration
+    dedup_policy: Literal["off", "link", "skip", "merge"] = Field(
+        default="link",
+        description=(
+            "What to do with near-duplicates at ingest: link (index with the original's "
+            "cluster_id), skip (do not index), merge (count on the original), or off"
+        ),
+    )
+    # Below dedup.SIMHASH_BANDS: band lookups only find fingerprints within
+    # SIMHASH_BANDS - 1 bits, so larger distances would silently miss matches
+    dedup_max_distance: int = Field(
+        default=3,
+        ge=0,
+        lt=4,
+        description="Maximum SimHash bit difference of near-duplicates (at most 3)",
+    )
+    dedup_candidates: int = Field(
+        default=10,
+        description="Indexed candidates compared per incoming document",
+    )
+    # Off by default: collapsing changes the results of existing /search callers
+    dedup_collapse: bool = Field(
+        default=False,
+        description="Collapse near-duplicate search results unless the request says otherwise",
+    )
+    dedup_collapse_oversample: int = Field(
+        default=3,
+        description="Fetch this many times top_k results before collapsing",
+    )
+
+    # Rerank Configuration
+    rerank_enabled: bool = Field(
+        default=False,
+        description="Rerank search results with a cross-encoder unless the request says otherwise",
+    )
+    rerank_model: str = Field(
+        default="cross-encoder/ms-marco-MiniLM-L-6-v2",
+        description="sentence-transformers CrossEncoder model used for reranking",
+    )
+    rerank_top_n: int = Field(
+        default=20,
+        description="Retrieval candidates passed to the cross-encoder",
+    )
+    rerank_batch_size: int = Field(
+        default=16,
+        description="(query, document) pairs per cross-encoder batch",
+    )
+    rerank_budget_ms: float = Field(
+        default=150.0,
+        description="Stop scoring new batches once reranking has taken this long",
+    )
+    rerank_cache_size: int = Field(
+        default=10000,
+        description="Cached (query, document) rerank scores",
+    )
+
+    # Local Vector Index Configuration
+    local_index_enabled: bool = Field(
+        default=False,
+        description="Mirror writes into an embedded in-process vector index",
+    )
+    local_index_path: str = Field(
+        default="./data/local_index",
+        description="Directory of the local index (memory-mapped embeddings + document log)",
+    )
+    local_index_policy: Literal["fallback", "prefer"] = Field(
+        default="fallback",
+        description=(
+            "fallback: serve searches locally only when Elasticsearch is unavailable; "
+            "prefer: always serve searches from the local index"
+        ),
+    )
+
+    # Search Cache Configuration
+    search_cache_enabled: bool = Field(
+        default=True,
+        description="Cache search results until the next index write",
+    )
+    search_cache_ttl_seconds: float = Field(
+        default=300.0,
+        description="Lifetime of cached search results",
+    )
+    search_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Approximate memory budget for cached search results",
+    )
+    search_cache_write_grace_seconds: float = Field(
+        default=1.0,
+        description="Do not cache results computed this soon after a write (ES refresh interval)",
+    )
+
+    # Telemetry Configuration
+    telemetry_interval_seconds: float = Field(
+        default=15.0,
+        description="Seconds between background index statistics collections for /stats",
+    )
 
 
 # Global settings instance
@@ -8,7 +8,17 @@ import uvicorn
 
 from app.config import settings
 from app.api import health, indexing
-from app.services import get_embedding_service
+from app.services import (
+    close_embedding_service,
+    close_es_client,
+    close_rerank_service,
+    close_search_service,
+    close_service_container,
+    close_telemetry,
+    get_job_registry,
+    get_service_container,
+    get_telemetry,
+)
 
 
 @asynccontextmanager
@@ -17,8 +27,9 @@ async def lifespan(app: FastAPI):
     Lifespan context manager for startup/shutdown events.
     
     Startup:
-    - Load embedding model
-    - Initialize Elasticsearch connection
+    - Preload (in the background) the Elasticsearch connection and index,
+      the embedding model and the rerank model; /ready waits for them
+    - Start background index telemetry
     
     Shutdown:
     - Cleanup resources
@@ -29,13 +40,25 @@ async def lifespan(app: FastAPI):
     print(f"Elasticsearch URL: {settings.elasticsearch_url}")
     print(f"Device: {settings.device}")
     
-    # NOTE: Model will be loaded lazily on first request to avoid startup delay
-    print("Indexing service ready (model will load on first request)")
+    if settings.preload_services:
+        # Load before traffic arrives, without delaying startup; /ready reports progress
+        get_service_container().start()
+        print("Indexing service started (preloading services)")
+    else:
+        print("Indexing service ready (models will load on first request)")
+    get_telemetry().start()
     
     yield
     
     # Shutdown
     print("Shutting down Indexing Service")
+    await close_service_container()
+    await close_telemetry()
+    await get_job_registry().shutdown()
+    close_embedding_service()
+    close_rerank_service()
+    await close_search_service()
+    await close_es_client()
 
 
 # Create FastAPI app
@@ -6,8 +6,12 @@ from app.models.requests import (
     DocumentIndexResponse,
     BatchIndexRequest,
     BatchIndexResponse,
+    ReindexRequest,
+    RebuildRequest,
+    JobResponse,
     SearchRequest,
     SearchResult,
+    FacetBucket,
     SearchResponse,
 )
 
@@ -17,7 +21,11 @@ __all__ = [
     "DocumentIndexResponse",
     "BatchIndexRequest",
     "BatchIndexResponse",
+    "ReindexRequest",
+    "RebuildRequest",
+    "JobResponse",
     "SearchRequest",
     "SearchResult",
+    "FacetBucket",
     "SearchResponse",
 ]
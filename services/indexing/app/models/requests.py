@@ -1,6 +1,6 @@
 """Request and response models for Indexing service."""
 
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any
 from pydantic import BaseModel, Field
 
 
@@ -24,6 +24,13 @@ class DocumentIndexRequest(BaseModel):
         default=None,
         description="Additional metadata (source, url, tags, etc.)",
     )
+    tenant: Optional[str] = Field(
+        default=None,
+        description=(
+            "Repository or team owning the document (default: metadata.tenant, else shared "
+            "with every tenant); must not change on re-index, delete the document instead"
+        ),
+    )
 
 
 class DocumentIndexResponse(BaseModel):
@@ -32,6 +39,13 @@ class DocumentIndexResponse(BaseModel):
     id: str = Field(description="Document ID")
     indexed: bool = Field(description="Successfully indexed")
     embedding_dimension: int = Field(description="Embedding vector dimension")
+    result: str = Field(
+        default="created",
+        description=(
+            "Outcome: created, updated, skipped (content and model unchanged), or "
+            "duplicate (near-duplicate not indexed under the skip/merge dedup policy)"
+        ),
+    )
 
 
 class BatchIndexRequest(BaseModel):
@@ -45,9 +59,86 @@ class BatchIndexResponse(BaseModel):
 
     indexed_count: int = Field(description="Number of successfully indexed documents")
     failed_count: int = Field(description="Number of failed documents")
+    skipped_count: int = Field(
+        default=0,
+        description="Number of unchanged or near-duplicate documents that were not indexed",
+    )
     document_ids: List[str] = Field(description="List of indexed document IDs")
 
 
+class ReindexRequest(BaseModel):
+    """Request to start an incremental reindex job."""
+
+    documents: Optional[List[DocumentIndexRequest]] = Field(
+        default=None,
+        description=(
+            "Desired document set (each with an id). If omitted, documents embedded "
+            "with a different model are re-embedded in place"
+        ),
+    )
+    source: Optional[str] = Field(
+        default=None,
+        description="Restrict pruning to documents with this source",
+    )
+    prune: bool = Field(
+        default=False,
+        description="Delete indexed documents that are not in the document set",
+    )
+
+
+class RebuildRequest(BaseModel):
+    """Request to rebuild the index into a new versioned index."""
+
+    reembed: bool = Field(
+        default=False,
+        description="Re-embed every document (otherwise only documents from another model)",
+    )
+    delete_old: bool = Field(
+        default=False,
+        description="Delete the previous physical index after the alias swap",
+    )
+    max_docs_per_second: Optional[float] = Field(
+        default=None,
+        description="Throughput cap for the rebuild (default from settings, 0 = unlimited)",
+    )
+
+
+class MigrateRequest(BaseModel):
+    """Request to migrate the index to another embedding model."""
+
+    model: str = Field(description="Sentence Transformers model to migrate to")
+    backend: Optional[Literal["torch", "onnx"]] = Field(
+        default=None,
+        description="Inference backend for the new model (default from settings)",
+    )
+    delete_old: bool = Field(
+        default=False,
+        description="Delete the previous physical index after the cut-over",
+    )
+    max_docs_per_second: Optional[float] = Field(
+        default=None,
+        description="Throughput cap for re-embedding (default from settings, 0 = unlimited)",
+    )
+    unload_old: bool = Field(
+        default=True,
+        description="Unload the previous model after the cut-over",
+    )
+
+
+class JobResponse(BaseModel):
+    """Status of a background job."""
+
+    id: str = Field(description="Job ID")
+    kind: str = Field(description="Job type")
+    status: str = Field(description="pending, running, completed, failed, or cancelled")
+    counts: Dict[str, int] = Field(description="Progress counters")
+    details: Dict[str, Any] = Field(default_factory=dict, description="Job-specific details")
+    error: Optional[str] = Field(default=None, description="Error message if the job failed")
+    created_at: str = Field(description="Submission time")
+    started_at: Optional[str] = Field(default=None, description="Start time")
+    finished_at: Optional[str] = Field(default=None, description="Completion time")
+
+
 class SearchRequest(BaseModel):
     """Request for hybrid search."""
 
@@ -59,7 +150,51 @@ class SearchRequest(BaseModel):
     )
     filters: Optional[Dict[str, Any]] = Field(
         default=None,
-        description="Optional filters (source, tags, etc.)",
+        description=(
+            "Optional filters (source, tags, metadata.category, ...): a value, a list of "
+            "values, or a range such as {\"indexed_at\": {\"gte\": \"now-7d\"}}"
+        ),
+    )
+    facets: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Fields to return value counts for (source, tags, metadata.category, ...); "
+            "counts cover the keyword matches, or the filtered candidates for semantic search"
+        ),
+    )
+    facet_size: int = Field(default=10, description="Values returned per facet")
+    rerank: Optional[bool] = Field(
+        default=None,
+        description="Rerank the top candidates with a cross-encoder (default from settings)",
+    )
+    collapse: Optional[bool] = Field(
+        default=None,
+        description="Return one result per near-duplicate cluster (default from settings)",
+    )
+    highlight: bool = Field(
+        default=False,
+        description=(
+            "Return content fragments around matched query terms "
+            "(keyword and hybrid search)"
+        ),
+    )
+    tenant: Optional[str] = Field(
+        default=None,
+        description=(
+            "Repository or team to search; only its shard is queried when the index is "
+            "routed by tenant (default: all tenants)"
+        ),
+    )
+    include_shared: bool = Field(
+        default=True,
+        description="With a tenant, also return documents shared with every tenant",
+    )
+    signature: Optional[bool] = Field(
+        default=None,
+        description=(
+            "Search a pasted log excerpt or stack trace by its failure signature "
+            "(default from settings)"
+        ),
     )
 
 
@@ -68,7 +203,7 @@ class SearchResult(BaseModel):
 
     id: str = Field(description="Document ID")
     title: str = Field(description="Document title")
-    content: str = Field(description="Document content (truncated)")
+    content: str = Field(description="Document summary (content shortened at a word boundary)")
     score: float = Field(description="Relevance score")
     source: Optional[str] = Field(default=None, description="Document source")
     url: Optional[str] = Field(default=None, description="Document URL")
@@ -76,12 +211,36 @@ class SearchResult(BaseModel):
         default=None,
         description="Additional metadata",
     )
+    highlights: Optional[List[str]] = Field(
+        default=None,
+        description="Content fragments with matched terms wrapped in <em> tags",
+    )
+    cluster_id: Optional[str] = Field(default=None, description="Near-duplicate cluster ID")
+    duplicates: int = Field(
+        default=0,
+        description="Near-duplicates of this result collapsed into it",
+    )
+
+
+class FacetBucket(BaseModel):
+    """Count of documents with one facet value."""
+
+    value: Any = Field(description="Field value")
+    count: int = Field(description="Number of matching documents")
 
 
 class SearchResponse(BaseModel):
     """Response from search."""
 
     query: str = Field(description="Original query")
+    signature: Optional[str] = Field(
+        default=None,
+        description="Failure signature searched instead of the query, if one was extracted",
+    )
     results: List[SearchResult] = Field(description="Search results")
     total: int = Field(description="Total number of matches")
     search_type: str = Field(description="Search type used")
+    facets: Optional[Dict[str, List[FacetBucket]]] = Field(
+        default=None,
+        description="Value counts per requested facet field",
+    )
@@ -1,11 +1,49 @@
 """Services package."""
 
-from app.services.embeddings import EmbeddingService, get_embedding_service
-from app.services.search import SearchService, get_search_service
+from app.services.embeddings import (
+    EmbeddingRegistry,
+    EmbeddingService,
+    close_embedding_service,
+    get_embedding_registry,
+    get_embedding_service,
+)
+from app.services.es_client import close_es_client, get_es_client
+from app.services.search import SearchService, close_search_service, get_search_service
+from app.services.pipeline import IndexingPipeline
+from app.services.jobs import Job, JobRegistry, get_job_registry
+from app.services.cache import SearchCache, get_search_cache
+from app.services.rerank import RerankService, close_rerank_service, get_rerank_service
+from app.services.telemetry import IndexTelemetry, close_telemetry, get_telemetry
+from app.services.container import (
+    ServiceContainer,
+    close_service_container,
+    get_service_container,
+)
 
 __all__ = [
     "EmbeddingService",
+    "EmbeddingRegistry",
     "get_embedding_service",
+    "get_embedding_registry",
+    "close_embedding_service",
     "SearchService",
     "get_search_service",
+    "close_search_service",
+    "get_es_client",
+    "close_es_client",
+    "IndexingPipeline",
+    "Job",
+    "JobRegistry",
+    "get_job_registry",
+    "SearchCache",
+    "get_search_cache",
+    "RerankService",
+    "get_rerank_service",
+    "close_rerank_service",
+    "IndexTelemetry",
+    "get_telemetry",
+    "close_telemetry",
+    "ServiceContainer",
+    "get_service_container",
+    "close_service_container",
 ]
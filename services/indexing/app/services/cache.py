@@ -0,0 +1,194 @@
+"""Search result cache invalidated by index writes."""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+
+@dataclass
+class _Entry:
+    """Cached search results with bookkeeping."""
+
+    results: List[Dict[str, Any]]
+    size: int
+    expires_at: float
+    compute_ms: float
+
+
+class SearchCache:
+    """
+    LRU cache of search results with TTL and a memory budget.
+
+    Entries belong to an index *generation*: ``SearchService`` bumps its
+    generation on every write, and the first lookup that sees a newer
+    generation drops the whole cache. Results computed while a write
+    happened are never stored.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            enabled: Enable caching (default from settings)
+            ttl_seconds: Entry lifetime (default from settings)
+            max_bytes: Approximate memory budget for cached results
+        """
+        self.enabled = settings.search_cache_enabled if enabled is None else enabled
+        self.ttl_seconds = ttl_seconds or settings.search_cache_ttl_seconds
+        self.max_bytes = max_bytes or settings.search_cache_max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.saved_ms = 0.0
+        self.miss_ms = 0.0
+
+    @staticmethod
+    def make_key(
+        query: str,
+        search_type: str,
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None,
+        **options: Any,
+    ) -> str:
+        """
+        Build a cache key from the normalized query and search parameters.
+
+        Case and whitespace differences in the query map to the same key.
+        """
+        normalized = " ".join(query.lower().split())
+        return json.dumps(
+            [normalized, search_type, top_k, filters or {}, options],
+            sort_keys=True,
+            default=str,
+        )
+
+    def get(self, key: str, generation: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached results.
+
+        Args:
+            key: Cache key from ``make_key``
+            generation: Current index generation
+
+        Returns:
+            Cached results or None on a miss
+        """
+        if not self.enabled:
+            return None
+        self._sync_generation(generation)
+
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self.saved_ms += entry.compute_ms
+        return entry.results
+
+    def put(
+        self,
+        key: str,
+        results: List[Dict[str, Any]],
+        generation: int,
+        compute_ms: float,
+        cacheable: bool = True,
+    ) -> None:
+        """
+        Store results computed at ``generation``.
+
+        Args:
+            key: Cache key from ``make_key``
+            results: Search results
+            generation: Index generation observed before computing the results
+            compute_ms: Time it took to compute the results
+            cacheable: False to only record the miss latency
+        """
+        self.miss_ms += compute_ms
+        if not self.enabled or not cacheable or generation != self._generation:
+            return
+
+        size = len(json.dumps(results, default=str))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = _Entry(
+            results=results,
+            size=size,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            compute_ms=compute_ms,
+        )
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio, size and latency savings."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "avg_miss_ms": self.miss_ms / self.misses if self.misses else 0.0,
+            "saved_ms": self.saved_ms,
+        }
+
+    def _sync_generation(self, generation: int) -> None:
+        """Drop everything cached for an older index generation."""
+        if generation != self._generation:
+            if self._entries:
+                self.invalidations += 1
+            self.clear()
+            self._generation = generation
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+# Global search cache instance
+_search_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> SearchCache:
+    """
+    Get or create global search cache instance.
+
+    Returns:
+        Search cache instance
+    """
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchCache()
+    return _search_cache
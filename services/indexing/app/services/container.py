@@ -0,0 +1,139 @@
+"""Startup preloading of the indexing services and readiness tracking."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.services.embeddings import get_embedding_registry
+from app.services.rerank import aget_rerank_service, peek_rerank_service
+from app.services.search import get_search_service, peek_search_service
+
+
+class ServiceContainer:
+    """
+    The services a search needs, loaded once at startup, and their readiness.
+
+    ``start`` preloads in the background: the search service (Elasticsearch
+    connection and index), the serving index's embedding model and, with
+    reranking enabled, the cross-encoder. Each is created through its
+    global getter, which creates it once: requests arriving while it loads
+    wait for the same instance instead of loading another. Readiness is
+    tracked per component so ``/ready`` keeps traffic away until they are
+    loaded; a failed preload is retried on the next ``start``.
+    """
+
+    def __init__(self):
+        self.components: Dict[str, Dict[str, Any]] = {
+            name: {"status": "pending"} for name in self.required()
+        }
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def required() -> List[str]:
+        """Components that must be loaded before the service is ready."""
+        names = ["search_service", "embedding_model"]
+        if settings.rerank_enabled:
+            names.append("rerank_model")
+        return names
+
+    def start(self):
+        """Start preloading in the background, unless done or already running."""
+        if self.ready or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self.preload())
+
+    async def preload(self):
+        """Load every component that is not loaded yet, in dependency order."""
+        started = time.perf_counter()
+        search_service = await self._load("search_service", get_search_service)
+        if search_service is not None:
+            await self._load("embedding_model", search_service.aembedding_service)
+        if "rerank_model" in self.components:
+            await self._load("rerank_model", aget_rerank_service)
+        state = "ready" if self.ready else "not ready"
+        print(f"Preloaded services in {time.perf_counter() - started:.1f}s ({state})")
+
+    async def _load(self, name: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Load one component, recording its status, load time and any error."""
+        component = self.components[name]
+        if component["status"] == "ready":
+            return await loader()
+        component.update(status="loading", error=None)
+        started = time.perf_counter()
+        try:
+            service = await loader()
+        except Exception as e:
+            component.update(status="failed", error=str(e))
+            print(f"Failed to preload {name}: {e}")
+            return None
+        finally:
+            component["seconds"] = round(time.perf_counter() - started, 3)
+        component["status"] = "ready"
+        return service
+
+    def _refresh(self):
+        """Mark components loaded outside the preload (by a first request) as ready."""
+        search_service = peek_search_service()
+        embedding_service = None
+        if search_service is not None:
+            embedding_service = get_embedding_registry().peek(
+                search_service.embedding_model, search_service.embedding_backend
+            )
+        loaded = {
+            "search_service": search_service is not None,
+            "embedding_model": embedding_service is not None,
+            "rerank_model": peek_rerank_service() is not None,
+        }
+        for name, component in self.components.items():
+            if component["status"] in ("pending", "failed") and loaded[name]:
+                component.update(status="ready", error=None)
+
+    @property
+    def ready(self) -> bool:
+        """Whether every required component is loaded."""
+        self._refresh()
+        return all(c["status"] == "ready" for c in self.components.values())
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness and per-component status (pending, loading, ready or failed)."""
+        self._refresh()
+        return {
+            "ready": self.ready,
+            "preload": settings.preload_services,
+            "components": {name: dict(c) for name, c in self.components.items()},
+        }
+
+    async def close(self):
+        """Cancel a preload that is still running."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+# Global service container
+_service_container: Optional[ServiceContainer] = None
+
+
+def get_service_container() -> ServiceContainer:
+    """
+    Get or create the global service container.
+
+    Returns:
+        Service container
+    """
+    global _service_container
+    if _service_container is None:
+        _service_container = ServiceContainer()
+    return _service_container
+
+
+async def close_service_container():
+    """Cancel the global container's preload, if it was created."""
+    global _service_container
+    if _service_container is not None:
+        await _service_container.close()
+        _service_container = None
@@ -0,0 +1,269 @@
+"""Near-duplicate detection for ingest using SimHash fingerprints."""
+
+import hashlib
+import re
+from collections import Counter
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.services.tenants import tenant_filter, tenant_of
+
+if TYPE_CHECKING:
+    from app.services.search import SearchService
+
+
+SIMHASH_BITS = 64
+# The fingerprint is split into this many bands; two fingerprints within
+# ``SIMHASH_BANDS - 1`` bits of each other share at least one band exactly
+SIMHASH_BANDS = 4
+
+# Volatile tokens that differ between otherwise identical failure reports
+_VOLATILE = [
+    (re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"), " uuid "),
+    (re.compile(r"0x[0-9a-f]+"), " addr "),
+    (re.compile(r"\b[0-9a-f]{12,40}\b"), " sha "),
+    (re.compile(r"\d+"), "0"),
+]
+_TOKEN = re.compile(r"[a-z0-9_.:$]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and mask numbers, hex addresses, commit hashes and UUIDs."""
+    text = text.lower()
+    for pattern, replacement in _VOLATILE:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def simhash(text: str, shingle: int = 3) -> str:
+    """
+    64-bit SimHash of the normalized text's word shingles.
+
+    Args:
+        text: Text to fingerprint
+        shingle: Words per shingle
+
+    Returns:
+        Fingerprint as 16 hex characters
+    """
+    tokens = _TOKEN.findall(normalize(text))
+    shingles = Counter(
+        " ".join(tokens[i:i + shingle]) for i in range(max(1, len(tokens) - shingle + 1))
+    )
+    hashes = np.array(
+        [
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+            for s in shingles
+        ],
+        dtype=">u8",
+    )
+    weights = np.fromiter(shingles.values(), dtype=np.int64, count=len(shingles))
+    bits = np.unpackbits(hashes.view(np.uint8)).reshape(-1, SIMHASH_BITS).astype(np.int64)
+    # Each shingle votes for or against every bit, weighted by its count
+    votes = (bits * 2 - 1).T @ weights
+    value = 0
+    for vote in votes:
+        value = (value << 1) | int(vote > 0)
+    return format(value, "016x")
+
+
+def simhash_bands(fingerprint: str) -> List[str]:
+    """Band terms of a fingerprint, used to look up candidate near-duplicates."""
+    width = len(fingerprint) // SIMHASH_BANDS
+    return [f"{i}:{fingerprint[i * width:(i + 1) * width]}" for i in range(SIMHASH_BANDS)]
+
+
+def hamming(a: str, b: str) -> int:
+    """Number of differing bits between two hex fingerprints."""
+    return (int(a, 16) ^ int(b, 16)).bit_count()
+
+
+class DedupStats:
+    """Counts of documents checked and near-duplicates found at ingest."""
+
+    def __init__(self):
+        self.checked = 0
+        self.duplicates = 0
+        self.outcomes: Counter = Counter()
+        self.lookup_failures = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "policy": settings.dedup_policy,
+            "max_distance": settings.dedup_max_distance,
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            "duplicate_rate": self.duplicates / self.checked if self.checked else 0.0,
+            "linked": self.outcomes["link"],
+            "skipped": self.outcomes["skip"],
+            "merged": self.outcomes["merge"],
+            "lookup_failures": self.lookup_failures,
+        }
+
+
+# Counters across all pipelines
+dedup_stats = DedupStats()
+
+
+class NearDuplicateDetector:
+    """
+    Find near-duplicates of incoming documents and apply the dedup policy.
+
+    Each document's SimHash is compared with indexed documents of the same
+    tenant sharing a fingerprint band and with earlier documents of the
+    same micro-batch and tenant.
+    A document within ``max_distance`` bits of another is a near-duplicate
+    and, depending on the policy:
+
+    - ``link``: indexed, with the ``cluster_id`` of the document it duplicates
+    - ``skip``: not indexed
+    - ``merge``: not indexed; the original's ``occurrences``,
+      ``duplicate_ids`` and ``last_seen`` are updated instead
+
+    Other documents start a cluster of their own (``cluster_id`` = their ID).
+    Search collapses results by ``cluster_id``.
+    """
+
+    def __init__(
+        self,
+        search_service: "SearchService",
+        policy: Optional[str] = None,
+        max_distance: Optional[int] = None,
+    ):
+        self.search_service = search_service
+        self.policy = policy or settings.dedup_policy
+        self.max_distance = settings.dedup_max_distance if max_distance is None else max_distance
+        if not 0 <= self.max_distance < SIMHASH_BANDS:
+            raise ValueError(
+                f"max_distance must be between 0 and {SIMHASH_BANDS - 1}: band lookups "
+                f"only find fingerprints within {SIMHASH_BANDS - 1} bits"
+            )
+
+    async def resolve(
+        self,
+        docs: List[Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Apply the policy to documents about to be embedded and written.
+
+        Documents that already have a ``cluster_id`` (re-indexed ones) are
+        passed through unchanged.
+
+        Args:
+            docs: Documents with id, title and content
+
+        Returns:
+            Tuple of (documents to write, extra bulk actions for merges,
+            results for documents that are not written)
+        """
+        pending = [doc for doc in docs if not doc.get("cluster_id")]
+        for doc in pending:
+            doc["simhash"] = simhash(f"{doc['title']} {doc['content']}")
+        candidates = await self._candidates(pending)
+
+        keep = [doc for doc in docs if doc.get("cluster_id")]
+        merges: Dict[str, Dict[str, Any]] = {}
+        results: List[Dict[str, Any]] = []
+        # Accepted documents of this batch: id -> document
+        batch_originals: Dict[str, Dict[str, Any]] = {}
+
+        for doc, found in zip(pending, candidates):
+            dedup_stats.checked += 1
+            original = self._closest(doc, found + list(batch_originals.values()))
+            if original is None:
+                doc["cluster_id"] = doc["id"]
+                batch_originals[doc["id"]] = doc
+                keep.append(doc)
+                continue
+
+            dedup_stats.duplicates += 1
+            dedup_stats.outcomes[self.policy] += 1
+            if self.policy == "link":
+                doc["cluster_id"] = original.get("cluster_id") or original["id"]
+                keep.append(doc)
+                continue
+
+            results.append({
+                "id": doc["id"],
+                "status": 200,
+                "result": "duplicate",
+                "duplicate_of": original["id"],
+            })
+            if self.policy == "merge":
+                target = batch_originals.get(original["id"])
+                if target is None:
+                    target = merges.setdefault(original["id"], {
+                        "tenant": tenant_of(original),
+                        "occurrences": original.get("occurrences") or 1,
+                        "duplicate_ids": list(original.get("duplicate_ids") or []),
+                    })
+                target["occurrences"] = (target.get("occurrences") or 1) + 1
+                target["duplicate_ids"] = [*(target.get("duplicate_ids") or []), doc["id"]]
+                target["last_seen"] = datetime.utcnow().isoformat()
+
+        actions: List[Dict[str, Any]] = []
+        for doc_id, fields in merges.items():
+            tenant = fields.pop("tenant")
+            actions.extend(self.search_service.partial_update_actions(doc_id, fields, tenant))
+        return keep, actions, results
+
+    def _closest(
+        self,
+        doc: Dict[str, Any],
+        candidates: List[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+        """The nearest candidate within ``max_distance`` bits, if any."""
+        best, best_distance = None, self.max_distance + 1
+        tenant = tenant_of(doc)
+        for candidate in candidates:
+            if candidate["id"] == doc["id"] or not candidate.get("simhash"):
+                continue
+            if tenant_of(candidate) != tenant:
+                continue
+            distance = hamming(doc["simhash"], candidate["simhash"])
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+        return best
+
+    async def _candidates(self, docs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Indexed documents of the same tenant sharing a fingerprint band with each document."""
+        if not docs:
+            return []
+        searches: List[Dict[str, Any]] = []
+        for doc in docs:
+            tenant = tenant_of(doc)
+            header = {"index": self.search_service.index}
+            routing = self.search_service.shard_routing(tenant)
+            if routing:
+                header["routing"] = routing
+            searches.append(header)
+            searches.append({
+                "size": settings.dedup_candidates,
+                "query": {
+                    "bool": {
+                        # Documents sharing more bands score higher
+                        "should": [
+                            {"term": {"simhash_bands": band}}
+                            for band in simhash_bands(doc["simhash"])
+                        ],
+                        "minimum_should_match": 1,
+                        "filter": [tenant_filter([tenant])],
+                        "must_not": [{"ids": {"values": [doc["id"]]}}],
+                    }
+                },
+                "_source": ["simhash", "cluster_id", "occurrences", "duplicate_ids", "tenant"],
+            })
+        try:
+            response = await self.search_service.es.msearch(searches=searches)
+        except Exception as e:
+            # Index anyway; duplicates are caught on the next ingest or at query time
+            dedup_stats.lookup_failures += 1
+            print(f"Near-duplicate lookup failed, indexing without dedup: {e}")
+            return [[] for _ in docs]
+        return [
+            [{"id": hit["_id"], **hit["_source"]} for hit in item.get("hits", {}).get("hits", [])]
+            for item in response["responses"]
+        ]
@@ -1,35 +1,114 @@
-"""Embedding service using Sentence Transformers."""
+"""Embedding service using Sentence Transformers (PyTorch or ONNX Runtime)."""
 
-from typing import List
-import torch
-from sentence_transformers import SentenceTransformer
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
 
 from app.config import settings
 
 
+def model_version(model_name: str, backend: str) -> str:
+    """
+    Version string recorded with embeddings of a model on a backend.
+
+    The backend is part of it since quantized vectors differ slightly.
+    """
+    if backend == "onnx":
+        return model_name + ("+onnx-int8" if settings.onnx_quantize else "+onnx")
+    return model_name
+
+
 class EmbeddingService:
     """
     Service for generating text embeddings using Sentence Transformers.
     
-    Wraps sentence-transformers with batching and device management.
+    Wraps sentence-transformers with batching and device management. With
+    ``embedding_backend=onnx`` the model runs on ONNX Runtime instead
+    (int8-quantized by default, CPU only) behind the same API.
+
+    Embeddings are returned as contiguous float32 NumPy arrays and stay
+    arrays all the way to the Elasticsearch serializer, so bulk loads do
+    not allocate a Python float per dimension.
+
+    ``embed_text``/``embed_batch`` encode synchronously. Async callers use
+    ``aembed_text``/``aembed_batch``, which run ``encode`` on a dedicated
+    thread pool so the event loop stays responsive, and merge texts from
+    concurrent callers into a single ``encode`` call: a worker waits up to
+    ``embedding_coalesce_window_ms`` for more requests (or until
+    ``embedding_max_batch_size`` texts are queued) before encoding.
     """
 
-    def __init__(self):
-        """Initialize embedding model."""
-        self.model_name = settings.embedding_model
+    def __init__(self, backend: Optional[str] = None, model_name: Optional[str] = None):
+        """
+        Initialize embedding model.
+
+        Args:
+            backend: torch or onnx (default from settings)
+            model_name: Sentence Transformers model (default from settings)
+        """
+        self.model_name = model_name or settings.embedding_model
+        self.backend = backend or settings.embedding_backend
+        # Recorded on every indexed document to detect stale embeddings
+        self.model_version = model_version(self.model_name, self.backend)
         self.device = settings.device
         self.batch_size = settings.batch_size
+
+        self.workers = settings.embedding_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="embedding",
+        )
+        self._pending: Deque[Tuple[List[str], asyncio.Future]] = deque()
+        self._pending_texts = 0
+        self._batch_ready = asyncio.Event()
+        self._drainers: Set[asyncio.Task] = set()
+        self.coalesce_window = settings.embedding_coalesce_window_ms / 1000.0
+        self.max_batch_size = settings.embedding_max_batch_size
+        self.encode_calls = 0
+        self.encoded_texts = 0
+        self.encoded_requests = 0
         
+        if self.backend == "onnx":
+            self._load_onnx()
+        else:
+            self._load_torch()
+        print(f"Model loaded. Embedding dimension: {self.model.get_sentence_embedding_dimension()}")
+
+    def _load_torch(self):
+        """Load the PyTorch sentence-transformers model."""
+        import torch
+        from sentence_transformers import SentenceTransformer
+
         # Check device availability
         if self.device == "cuda" and not torch.cuda.is_available():
             print("CUDA not available, falling back to CPU")
             self.device = "cpu"
-        
+
+        # Keep torch's intra-op threads from oversubscribing the CPU across workers
+        if settings.torch_num_threads > 0:
+            torch.set_num_threads(settings.torch_num_threads)
+
         print(f"Loading embedding model: {self.model_name} on {self.device}")
         self.model = SentenceTransformer(self.model_name, device=self.device)
-        print(f"Model loaded. Embedding dimension: {self.model.get_sentence_embedding_dimension()}")
 
-    def embed_text(self, text: str) -> List[float]:
+    def _load_onnx(self):
+        """Load the ONNX Runtime encoder (exported on first use)."""
+        from app.services.onnx_encoder import OnnxEncoder
+
+        self.device = "cpu"
+        print(f"Loading embedding model: {self.model_name} on ONNX Runtime ({self.model_version})")
+        self.model = OnnxEncoder(
+            self.model_name,
+            settings.onnx_cache_dir,
+            quantize=settings.onnx_quantize,
+            num_threads=settings.torch_num_threads,
+        )
+
+    def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
         
@@ -37,16 +116,16 @@ class EmbeddingService:
             text: Input text
             
         Returns:
-            Embedding vector as list of floats
+            Embedding vector (float32 array of shape (dim,))
         """
         embedding = self.model.encode(
             text,
             convert_to_numpy=True,
             show_progress_bar=False,
         )
-        return embedding.tolist()
+        return np.ascontiguousarray(embedding, dtype=np.float32)
 
-    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts (batched).
         
@@ -54,7 +133,8 @@ class EmbeddingService:
             texts: List of input texts
             
         Returns:
-            List of embedding vectors
+            Embedding matrix (float32 array of shape (len(texts), dim));
+            each row is a contiguous vector
         """
         embeddings = self.model.encode(
             texts,
@@ -62,7 +142,117 @@ class EmbeddingService:
             convert_to_numpy=True,
             show_progress_bar=len(texts) > 100,  # Show progress for large batches
         )
-        return [emb.tolist() for emb in embeddings]
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    async def aembed_text(self, text: str) -> np.ndarray:
+        """
+        Generate embedding for a single text without blocking the event loop.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Embedding vector (float32 array of shape (dim,))
+        """
+        return (await self.aembed_batch([text]))[0]
+
+    async def aembed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings on the embedding thread pool.
+
+        Requests queue up for a short coalescing window (and while all
+        workers are busy); a free worker takes every queued request, up to
+        ``max_batch_size`` texts, and encodes them in one call.
+
+        Args:
+            texts: List of input texts
+
+        Returns:
+            Embedding matrix (float32 array of shape (len(texts), dim))
+        """
+        if not texts:
+            return np.empty((0, self.get_dimension()), dtype=np.float32)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((list(texts), future))
+        self._pending_texts += len(texts)
+        if self._pending_texts >= self.max_batch_size:
+            self._batch_ready.set()
+        if len(self._drainers) < self.workers:
+            self._drainers.add(asyncio.create_task(self._drain()))
+        return await future
+
+    async def _drain(self):
+        """Encode queued requests in merged batches until the queue is empty."""
+        try:
+            await self._drain_pending()
+        finally:
+            # Deregister as soon as the queue is seen empty, not in a done
+            # callback: a caller resumed by the last result may queue another
+            # request before the callback runs, and it would never be picked up
+            self._drainers.discard(asyncio.current_task())
+
+    async def _drain_pending(self):
+        """Encode merged batches of queued requests while there are any."""
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            if self.coalesce_window > 0 and self._pending_texts < self.max_batch_size:
+                # Give concurrent callers a moment to join this batch
+                self._batch_ready.clear()
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self.coalesce_window)
+                except asyncio.TimeoutError:
+                    pass
+                if not self._pending:
+                    break
+
+            batch = [self._pending.popleft()]
+            size = len(batch[0][0])
+            while self._pending and size + len(self._pending[0][0]) <= self.max_batch_size:
+                batch.append(self._pending.popleft())
+                size += len(batch[-1][0])
+            self._pending_texts -= size
+            self.encode_calls += 1
+            self.encoded_texts += size
+            self.encoded_requests += len(batch)
+
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                embeddings = await loop.run_in_executor(self._executor, self.embed_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for request_texts, future in batch:
+                if not future.done():
+                    future.set_result(embeddings[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+
+    def batching_stats(self) -> Dict[str, Any]:
+        """Encode calls issued by the async API and how well they were batched."""
+        return {
+            "coalesce_window_ms": self.coalesce_window * 1000.0,
+            "max_batch_size": self.max_batch_size,
+            "encode_calls": self.encode_calls,
+            "requests": self.encoded_requests,
+            "texts": self.encoded_texts,
+            "avg_batch_texts": (
+                self.encoded_texts / self.encode_calls if self.encode_calls else 0.0
+            ),
+        }
+
+    def close(self, cancel_pending: bool = True):
+        """
+        Stop the embedding thread pool.
+
+        Args:
+            cancel_pending: Cancel queued encode calls; otherwise they finish
+                and later calls fail (used when unloading a model that
+                requests may still hold)
+        """
+        self._executor.shutdown(wait=False, cancel_futures=cancel_pending)
 
     def get_dimension(self) -> int:
         """
@@ -74,18 +264,125 @@ class EmbeddingService:
         return self.model.get_sentence_embedding_dimension()
 
 
-# Global embedding service instance (lazy loaded)
-_embedding_service: EmbeddingService = None
+class EmbeddingRegistry:
+    """
+    Embedding models loaded side by side, keyed by model version.
+
+    Normally holds one model. During a model migration (``POST /migrate``)
+    the new model is loaded next to the one serving queries, so the index
+    can be re-embedded in the background; the old model is unloaded once
+    the alias has been cut over.
+    """
+
+    def __init__(self):
+        self._services: Dict[str, EmbeddingService] = {}
+        self._lock = threading.Lock()
 
+    def get(
+        self,
+        model_name: Optional[str] = None,
+        backend: Optional[str] = None,
+    ) -> EmbeddingService:
+        """
+        Get a model, loading it on first use (blocks while loading).
 
-def get_embedding_service() -> EmbeddingService:
+        Args:
+            model_name: Sentence Transformers model (default from settings)
+            backend: torch or onnx (default from settings)
+
+        Returns:
+            Embedding service for the model
+        """
+        model_name = model_name or settings.embedding_model
+        backend = backend or settings.embedding_backend
+        version = model_version(model_name, backend)
+        service = self._services.get(version)
+        if service is None:
+            with self._lock:
+                service = self._services.get(version)
+                if service is None:
+                    service = EmbeddingService(backend, model_name)
+                    self._services[version] = service
+        return service
+
+    async def aget(
+        self,
+        model_name: Optional[str] = None,
+        backend: Optional[str] = None,
+    ) -> EmbeddingService:
+        """Like ``get``, but loads the model on a thread so the event loop keeps serving."""
+        version = model_version(
+            model_name or settings.embedding_model, backend or settings.embedding_backend
+        )
+        if version in self._services:
+            return self._services[version]
+        return await asyncio.to_thread(self.get, model_name, backend)
+
+    def peek(
+        self,
+        model_name: Optional[str] = None,
+        backend: Optional[str] = None,
+    ) -> Optional[EmbeddingService]:
+        """A model if it is loaded, without loading it."""
+        return self._services.get(
+            model_version(
+                model_name or settings.embedding_model, backend or settings.embedding_backend
+            )
+        )
+
+    def unload(self, version: str):
+        """
+        Drop a model; requests still holding it fail and are retried by callers.
+
+        Args:
+            version: Model version to unload
+        """
+        service = self._services.pop(version, None)
+        if service is not None:
+            service.close(cancel_pending=False)
+            print(f"Unloaded embedding model {version}")
+
+    def loaded(self) -> List[str]:
+        """Versions of the loaded models."""
+        return list(self._services)
+
+    def close(self):
+        """Shut down every loaded model's thread pool."""
+        for service in self._services.values():
+            service.close()
+
+
+# Global embedding registry (models are lazy loaded)
+_embedding_registry = EmbeddingRegistry()
+
+
+def get_embedding_registry() -> EmbeddingRegistry:
+    """Get the global embedding registry."""
+    return _embedding_registry
+
+
+def get_embedding_service(
+    model_name: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> EmbeddingService:
     """
-    Get or create global embedding service instance.
-    
+    Get or load an embedding model from the global registry.
+
+    Without arguments this is the configured model. Callers embedding
+    queries or documents for the index pass the model recorded in the
+    serving index (see ``SearchService.embedding_model``), which differs
+    from the configured one after a migration.
+
+    Args:
+        model_name: Sentence Transformers model (default from settings)
+        backend: torch or onnx (default from settings)
+
     Returns:
         Embedding service instance
     """
-    global _embedding_service
-    if _embedding_service is None:
-        _embedding_service = EmbeddingService()
-    return _embedding_service
+    return _embedding_registry.get(model_name, backend)
+
+
+def close_embedding_service():
+    """Shut down the thread pools of all loaded embedding models."""
+    _embedding_registry.close()
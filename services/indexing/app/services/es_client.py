@@ -0,0 +1,124 @@
+"""Shared Elasticsearch client with a tuned connection pool and request metrics."""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from elastic_transport import AiohttpHttpNode
+from elasticsearch import AsyncElasticsearch
+
+from app.config import settings
+from app.services.serializer import es_serializers
+
+
+class ClientMetrics:
+    """Request counts and latencies of Elasticsearch HTTP requests."""
+
+    def __init__(self, window: int = 2048):
+        self.requests = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        # Most recent request latencies, for percentiles
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+    def record(self, elapsed_ms: float, failed: bool) -> None:
+        self.requests += 1
+        self.errors += failed
+        self.total_ms += elapsed_ms
+        self._latencies.append(elapsed_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counts and average/p50/p95/p99 latency in milliseconds."""
+        latencies = sorted(self._latencies)
+
+        def percentile(pct: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(len(latencies) * pct / 100))]
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": self.total_ms / self.requests if self.requests else 0.0,
+            "p50_ms": percentile(50),
+            "p95_ms": percentile(95),
+            "p99_ms": percentile(99),
+        }
+
+
+# Metrics of every client created by this module
+client_metrics = ClientMetrics()
+
+
+class InstrumentedNode(AiohttpHttpNode):
+    """aiohttp node that records the latency of every request."""
+
+    async def perform_request(self, *args: Any, **kwargs: Any):
+        started = time.perf_counter()
+        failed = True
+        try:
+            response = await super().perform_request(*args, **kwargs)
+            failed = response.meta.status >= 500
+            return response
+        finally:
+            client_metrics.record((time.perf_counter() - started) * 1000, failed)
+
+
+def create_es_client() -> AsyncElasticsearch:
+    """
+    Create an Elasticsearch client from the connection settings.
+
+    Each node keeps a pool of up to ``elasticsearch_connections_per_node``
+    keep-alive connections, so concurrent requests reuse open connections
+    instead of opening (and tearing down) new ones.
+    """
+    return AsyncElasticsearch(
+        [settings.elasticsearch_url],
+        node_class=InstrumentedNode,
+        connections_per_node=settings.elasticsearch_connections_per_node,
+        http_compress=settings.elasticsearch_http_compress,
+        request_timeout=settings.elasticsearch_request_timeout,
+        max_retries=settings.elasticsearch_max_retries,
+        retry_on_timeout=True,
+        serializers=es_serializers(),
+    )
+
+
+async def connection_stats(es: AsyncElasticsearch) -> Dict[str, Any]:
+    """
+    Server-side HTTP connection counts.
+
+    ``total_opened`` growing while ``current_open`` stays flat means
+    connections are being churned rather than reused.
+    """
+    response = await es.nodes.stats(metric="http")
+    http = [node.get("http", {}) for node in response["nodes"].values()]
+    return {
+        "current_open": sum(node.get("current_open", 0) for node in http),
+        "total_opened": sum(node.get("total_opened", 0) for node in http),
+    }
+
+
+# Global client instance (lazy created)
+_es_client: Optional[AsyncElasticsearch] = None
+
+
+def get_es_client() -> AsyncElasticsearch:
+    """
+    Get or create the shared Elasticsearch client.
+
+    Returns:
+        Elasticsearch client
+    """
+    global _es_client
+    if _es_client is None:
+        _es_client = create_es_client()
+    return _es_client
+
+
+async def close_es_client():
+    """Close the shared client's connections, if it was created."""
+    global _es_client
+    if _es_client is not None:
+        await _es_client.close()
+        _es_client = None
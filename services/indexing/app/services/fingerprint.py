@@ -0,0 +1,33 @@
+"""Content fingerprints used for change detection during ingest."""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+
+def content_hash(title: str, content: str) -> str:
+    """
+    Hash the text that is fed to the embedding model.
+
+    Args:
+        title: Document title
+        content: Document content
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(f"{title}\x00{content}".encode("utf-8")).hexdigest()
+
+
+def metadata_hash(metadata: Optional[Dict[str, Any]]) -> str:
+    """
+    Hash document metadata independently of key order.
+
+    Args:
+        metadata: Document metadata
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    canonical = json.dumps(metadata or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -0,0 +1,138 @@
+"""In-process registry for long-running background jobs (reindex, rebuild)."""
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+@dataclass
+class Job:
+    """State of a background job, updated in place while it runs."""
+
+    id: str
+    kind: str
+    status: str = "pending"
+    counts: Dict[str, int] = field(default_factory=dict)
+    details: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+    def increment(self, key: str, amount: int = 1) -> None:
+        """Increment a progress counter."""
+        self.counts[key] = self.counts.get(key, 0) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize job state."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "counts": dict(self.counts),
+            "details": dict(self.details),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobRegistry:
+    """
+    Runs jobs as asyncio tasks and keeps their state for polling.
+
+    Only the most recent ``max_jobs`` jobs are retained.
+    """
+
+    def __init__(self, max_jobs: int = 100):
+        """
+        Initialize registry.
+
+        Args:
+            max_jobs: Number of finished jobs to keep
+        """
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(self, kind: str, run: Callable[[Job], Awaitable[None]]) -> Job:
+        """
+        Start a job in the background.
+
+        Args:
+            kind: Job type (e.g. "reindex")
+            run: Coroutine function receiving the job to update
+
+        Returns:
+            The submitted job
+        """
+        job = Job(id=str(uuid.uuid4()), kind=kind)
+        self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.create_task(self._run(job, run))
+        self._evict()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID."""
+        return self._jobs.get(job_id)
+
+    def list(self, kind: Optional[str] = None) -> List[Job]:
+        """List retained jobs, newest last."""
+        return [job for job in self._jobs.values() if kind is None or job.kind == kind]
+
+    def running(self, kind: Optional[str] = None) -> List[Job]:
+        """List jobs that have not finished yet."""
+        return [job for job in self.list(kind) if job.status in ("pending", "running")]
+
+    async def shutdown(self) -> None:
+        """Cancel running jobs."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, job: Job, run: Callable[[Job], Awaitable[None]]) -> None:
+        job.status = "running"
+        job.started_at = datetime.utcnow().isoformat()
+        try:
+            await run(job)
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            print(f"Job {job.kind} {job.id} failed: {e}")
+        finally:
+            job.finished_at = datetime.utcnow().isoformat()
+            self._tasks.pop(job.id, None)
+
+    def _evict(self) -> None:
+        """Drop the oldest finished jobs beyond ``max_jobs``."""
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if job_id not in self._tasks:
+                del self._jobs[job_id]
+
+
+# Global job registry instance
+_job_registry: Optional[JobRegistry] = None
+
+
+def get_job_registry() -> JobRegistry:
+    """
+    Get or create global job registry.
+
+    Returns:
+        Job registry instance
+    """
+    global _job_registry
+    if _job_registry is None:
+        _job_registry = JobRegistry()
+    return _job_registry
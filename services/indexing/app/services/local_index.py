@@ -0,0 +1,431 @@
+"""Embedded in-process vector index used when Elasticsearch is unavailable."""
+
+import json
+import math
+import os
+import re
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.tenants import SHARED_TENANT
+
+
+_TOKEN = re.compile(r"[a-z0-9_]+")
+_DATE_MATH = re.compile(r"^now(?:-(\d+)([dhm]))?$")
+_RANGE_CHECKS = {
+    "gt": lambda value, bound: value > bound,
+    "gte": lambda value, bound: value >= bound,
+    "lt": lambda value, bound: value < bound,
+    "lte": lambda value, bound: value <= bound,
+}
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens."""
+    return _TOKEN.findall(text.lower())
+
+
+class LocalVectorIndex:
+    """
+    Flat (exact) vector index over a memory-mapped float32 matrix.
+
+    Layout under ``path``:
+    - ``embeddings.f32``: row-major float32 matrix of L2-normalized vectors,
+      memory-mapped and grown by doubling
+    - ``docs.jsonl``: append-only log of document puts and deletes, replayed
+      on startup
+
+    Rows are append-only: a document whose text changes gets a new row and
+    its old row is masked out. Keyword search uses an in-memory inverted
+    index of row ids per token, scored by summed IDF of matching query
+    terms. The index consumes the same bulk actions that are sent to
+    Elasticsearch (see ``apply``), so it stays in sync with the write path.
+
+    Once masked rows and superseded log entries outnumber the live
+    documents (and ``min_garbage``), both files are rewritten with the live
+    documents only (see ``compact``), so re-indexing and metadata updates
+    do not grow them without bound.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dimension: int,
+        initial_capacity: int = 1024,
+        min_garbage: int = 1024,
+    ):
+        """
+        Open (or create) a local index.
+
+        Args:
+            path: Directory holding the index files
+            dimension: Embedding dimension
+            initial_capacity: Rows to allocate for a new index
+            min_garbage: Superseded log entries tolerated before compacting,
+                however few documents are live
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dimension = dimension
+        self.initial_capacity = initial_capacity
+        self.min_garbage = min_garbage
+        self._vectors_file = self.path / "embeddings.f32"
+        self._log_file = self.path / "docs.jsonl"
+
+        self._rows: Dict[str, int] = {}
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self._postings: Dict[str, array] = {}
+        self._size = 0
+        self._log_entries = 0
+
+        capacity = initial_capacity
+        if self._vectors_file.exists():
+            capacity = max(capacity, self._vectors_file.stat().st_size // (4 * dimension))
+        self._open(capacity)
+        self._valid = np.zeros(self._capacity, dtype=bool)
+        self._replay()
+        self._log = open(self._log_file, "a", encoding="utf-8")
+        self._maybe_compact()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def apply(self, action: Dict[str, Any]) -> None:
+        """
+        Apply an Elasticsearch bulk action (index, update or delete).
+
+        Args:
+            action: Bulk action as built by ``SearchService``
+        """
+        op = action.get("_op_type", "index")
+        doc_id = action["_id"]
+        if op == "delete":
+            self.delete(doc_id)
+        elif op == "update":
+            self.update(doc_id, action.get("doc", {}))
+        else:
+            self.upsert(doc_id, action["_source"])
+
+    def upsert(self, doc_id: str, source: Dict[str, Any]) -> None:
+        """
+        Insert or replace a document.
+
+        Args:
+            doc_id: Document ID
+            source: Stored document including ``embedding``
+        """
+        vector = np.asarray(source["embedding"], dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector = vector / norm
+
+        old_row = self._rows.get(doc_id)
+        if old_row is not None:
+            self._valid[old_row] = False
+            self._docs.pop(old_row, None)
+
+        row = self._size
+        if row >= self._capacity:
+            self._grow(self._capacity * 2)
+        self._vectors[row] = vector
+        self._size += 1
+
+        doc = {k: v for k, v in source.items() if k not in ("embedding", "embedding_bits")}
+        self._add_row(doc_id, row, doc)
+        self._write_log({"op": "put", "id": doc_id, "row": row, "doc": doc})
+        self._maybe_compact()
+
+    def update(self, doc_id: str, fields: Dict[str, Any]) -> None:
+        """Merge fields into a stored document (text and vector unchanged)."""
+        row = self._rows.get(doc_id)
+        if row is None:
+            return
+        doc = {**self._docs[row], **fields}
+        self._docs[row] = doc
+        self._write_log({"op": "put", "id": doc_id, "row": row, "doc": _stored(doc)})
+        self._maybe_compact()
+
+    def delete(self, doc_id: str) -> None:
+        """Delete a document."""
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return
+        self._valid[row] = False
+        self._docs.pop(row, None)
+        self._write_log({"op": "del", "id": doc_id})
+        self._maybe_compact()
+
+    def semantic_search(
+        self,
+        query_embedding: Sequence[float],
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Exact cosine similarity search.
+
+        Scores are ``cosine + 1`` to match ``SearchService.semantic_search``.
+        """
+        if not self._rows:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm > 0:
+            query = query / norm
+
+        scores = self._vectors[: self._size] @ query + 1.0
+        scores[~self._valid[: self._size]] = -np.inf
+        return self._top(scores, top_k, filters)
+
+    def keyword_search(
+        self,
+        query: str,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Score documents by summed IDF of the query terms they contain."""
+        if not self._rows:
+            return []
+        scores = np.zeros(self._size, dtype=np.float32)
+        live = len(self._rows)
+        for token in set(_tokenize(query)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            rows = np.frombuffer(postings, dtype=np.uint32)
+            # Postings keep the rows of replaced and deleted documents
+            matches = int(self._valid[rows].sum())
+            if not matches:
+                continue
+            idf = math.log(1 + (live - matches + 0.5) / (matches + 0.5))
+            scores[rows] += idf
+
+        scores[~self._valid[: self._size]] = 0.0
+        scores[scores <= 0] = -np.inf
+        return self._top(scores, top_k, filters)
+
+    def clear(self, dimension: Optional[int] = None) -> None:
+        """
+        Drop all documents (the embeddings file keeps its size).
+
+        Args:
+            dimension: New embedding dimension, after the index was migrated
+                to another model
+        """
+        if dimension is not None and dimension != self.dimension:
+            self._vectors.flush()
+            del self._vectors
+            self._vectors_file.unlink()
+            self.dimension = dimension
+            self._open(self._capacity)
+        self._rows.clear()
+        self._docs.clear()
+        self._postings.clear()
+        self._valid[:] = False
+        self._size = 0
+        self._log_entries = 0
+        self._log.seek(0)
+        self._log.truncate()
+
+    def compact(self) -> None:
+        """
+        Rewrite the embeddings file and the document log with the live
+        documents only, renumbering their rows.
+        """
+        rows = sorted(self._rows.values())
+        docs = [self._docs[row] for row in rows]
+        vectors = np.zeros((max(self.initial_capacity, 2 * len(rows)), self.dimension), np.float32)
+        vectors[: len(rows)] = self._vectors[rows]
+
+        vectors_tmp = self._vectors_file.with_suffix(".tmp")
+        log_tmp = self._log_file.with_suffix(".tmp")
+        vectors.tofile(vectors_tmp)
+        with open(log_tmp, "w", encoding="utf-8") as f:
+            for row, doc in enumerate(docs):
+                entry = {"op": "put", "id": doc["_id"], "row": row, "doc": _stored(doc)}
+                f.write(json.dumps(entry, default=str) + "\n")
+
+        self._log.close()
+        self._vectors.flush()
+        del self._vectors
+        os.replace(vectors_tmp, self._vectors_file)
+        os.replace(log_tmp, self._log_file)
+        self._open(len(vectors))
+        self._rows.clear()
+        self._docs.clear()
+        self._postings.clear()
+        self._valid = np.zeros(self._capacity, dtype=bool)
+        for row, doc in enumerate(docs):
+            self._add_row(doc["_id"], row, _stored(doc))
+        self._size = len(docs)
+        self._log_entries = len(docs)
+        self._log = open(self._log_file, "a", encoding="utf-8")
+
+    def flush(self) -> None:
+        """Persist pending writes."""
+        self._vectors.flush()
+        self._log.flush()
+
+    def close(self) -> None:
+        """Flush and close files."""
+        self.flush()
+        self._log.close()
+
+    def _top(
+        self,
+        scores: np.ndarray,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Pick the best rows, applying filters to an oversampled candidate set."""
+        candidates = top_k * 10 if filters else top_k
+        while True:
+            candidates = min(candidates, len(scores))
+            top = np.argpartition(-scores, candidates - 1)[:candidates]
+            top = top[np.argsort(-scores[top])]
+            results = []
+            for row in top:
+                if not np.isfinite(scores[row]):
+                    return results
+                doc = self._docs[int(row)]
+                if filters and not _matches(doc, filters):
+                    continue
+                results.append(self._format(int(row), float(scores[row])))
+                if len(results) == top_k:
+                    return results
+            if candidates == len(scores):
+                return results
+            candidates *= 4
+
+    def _format(self, row: int, score: float) -> Dict[str, Any]:
+        doc = self._docs[row]
+        return {
+            "id": doc["_id"],
+            "title": doc.get("title", ""),
+            "content": doc.get("summary") or doc.get("content", "")[:500],
+            "score": score,
+            "source": doc.get("source"),
+            "url": doc.get("url"),
+            "metadata": doc.get("metadata", {}),
+            "cluster_id": doc.get("cluster_id"),
+        }
+
+    def _maybe_compact(self) -> None:
+        """Compact once superseded log entries outnumber the live documents."""
+        live = len(self._rows)
+        if self._log_entries - live > max(self.min_garbage, live):
+            self.compact()
+
+    def _add_row(self, doc_id: str, row: int, doc: Dict[str, Any]) -> None:
+        self._rows[doc_id] = row
+        self._docs[row] = {**doc, "_id": doc_id}
+        self._valid[row] = True
+        for token in set(_tokenize(f"{doc.get('title', '')} {doc.get('content', '')}")):
+            self._postings.setdefault(token, array("I")).append(row)
+
+    def _replay(self) -> None:
+        """Rebuild in-memory state from the document log."""
+        if not self._log_file.exists():
+            return
+        with open(self._log_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                self._log_entries += 1
+                entry = json.loads(line)
+                if entry["op"] == "del":
+                    row = self._rows.pop(entry["id"], None)
+                    if row is not None:
+                        self._valid[row] = False
+                        self._docs.pop(row, None)
+                    continue
+                row = entry["row"]
+                old_row = self._rows.get(entry["id"])
+                if old_row == row:
+                    self._docs[row] = {**entry["doc"], "_id": entry["id"]}
+                    continue
+                if old_row is not None:
+                    self._valid[old_row] = False
+                    self._docs.pop(old_row, None)
+                self._add_row(entry["id"], row, entry["doc"])
+                self._size = max(self._size, row + 1)
+
+    def _write_log(self, entry: Dict[str, Any]) -> None:
+        self._log.write(json.dumps(entry, default=str) + "\n")
+        self._log_entries += 1
+
+    def _open(self, capacity: int) -> None:
+        """Map the embeddings file with room for ``capacity`` rows."""
+        required = capacity * self.dimension * 4
+        with open(self._vectors_file, "ab") as f:
+            if f.tell() < required:
+                f.truncate(required)
+        self._capacity = capacity
+        self._vectors = np.memmap(
+            self._vectors_file, dtype=np.float32, mode="r+", shape=(capacity, self.dimension)
+        )
+
+    def _grow(self, capacity: int) -> None:
+        self._vectors.flush()
+        del self._vectors
+        self._open(capacity)
+        valid = np.zeros(capacity, dtype=bool)
+        valid[: len(self._valid)] = self._valid
+        self._valid = valid
+
+
+def _stored(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """A document as logged (without the ``_id`` kept in memory)."""
+    return {k: v for k, v in doc.items() if k != "_id"}
+
+
+def _matches(doc: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Evaluate ``SearchService`` term/terms/range filters against a stored document."""
+    for key, expected in filters.items():
+        value: Any = doc
+        for part in key.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        if key == "tenant" and value is None:
+            # Documents indexed before tenants were tracked are shared
+            value = SHARED_TENANT
+        values = value if isinstance(value, list) else [value]
+        if isinstance(expected, dict) and _RANGE_CHECKS.keys() & expected.keys():
+            if not any(_in_range(v, expected) for v in values if v is not None):
+                return False
+            continue
+        wanted = expected if isinstance(expected, list) else [expected]
+        if not any(v in wanted for v in values):
+            return False
+    return True
+
+
+def _in_range(value: Any, bounds: Dict[str, Any]) -> bool:
+    """Check a value against gt/gte/lt/lte bounds (ISO dates compare as strings)."""
+    for op, bound in bounds.items():
+        if op not in _RANGE_CHECKS:
+            continue
+        bound = _resolve_bound(bound)
+        try:
+            if not _RANGE_CHECKS[op](value, bound):
+                return False
+        except TypeError:
+            return False
+    return True
+
+
+def _resolve_bound(bound: Any) -> Any:
+    """Resolve simple date math (``now``, ``now-7d``, ``now-12h``) to an ISO timestamp."""
+    if not isinstance(bound, str):
+        return bound
+    match = _DATE_MATH.match(bound)
+    if not match:
+        return bound
+    amount, unit = match.groups()
+    delta = timedelta()
+    if amount:
+        delta = timedelta(**{{"d": "days", "h": "hours", "m": "minutes"}[unit]: int(amount)})
+    return (datetime.utcnow() - delta).isoformat()
@@ -0,0 +1,309 @@
+"""Log-aware analysis: Elasticsearch analyzers, error code / file path and signature extraction."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+# Index analysis settings for log text (applied by SearchService.create_index;
+# the fields using them are mapped in SearchService.index_mappings)
+LOG_ANALYSIS: Dict[str, Any] = {
+    "filter": {
+        # NullPointerException -> null, pointer, exception (+ nullpointerexception);
+        # com.acme.UserService -> com, acme, user, service (+ the full name)
+        "log_word_delimiter": {
+            "type": "word_delimiter_graph",
+            "preserve_original": True,
+            "split_on_case_change": True,
+            "split_on_numerics": False,
+            "stem_english_possessive": False,
+        },
+    },
+    "tokenizer": {
+        # src/main/App.java -> src, src/main, src/main/App.java
+        "log_path_prefixes": {"type": "path_hierarchy", "delimiter": "/"},
+        # src/main/App.java -> App.java, main/App.java, src/main/App.java
+        "log_path_suffixes": {"type": "path_hierarchy", "delimiter": "/", "reverse": True},
+    },
+    "analyzer": {
+        # Splits on whitespace only, so the delimiter filter sees whole class
+        # names, dotted identifiers and paths and can keep them as well; the
+        # token graph is flattened for indexing but kept for queries
+        "log_text": {
+            "type": "custom",
+            "tokenizer": "whitespace",
+            "filter": ["log_word_delimiter", "lowercase", "flatten_graph"],
+        },
+        "log_text_search": {
+            "type": "custom",
+            "tokenizer": "whitespace",
+            "filter": ["log_word_delimiter", "lowercase"],
+        },
+        "log_path": {"type": "custom", "tokenizer": "log_path_prefixes"},
+        "log_path_suffix": {"type": "custom", "tokenizer": "log_path_suffixes"},
+    },
+    "normalizer": {
+        "error_code": {"type": "custom", "filter": ["uppercase"]},
+    },
+}
+
+# Error codes of known tools only, so that algorithm and standard names
+# (SHA256, AES128, X509, ISO-8859) and ticket keys (PR1234, JIRA-42) are not
+# taken for codes: CVE-2021-44228, Oracle (ORA-00942, PLS-00201, TNS-12541,
+# SP2-0310), rustc (E0432), TypeScript (TS2307), MSVC (C2065, LNK2019), C#
+# (CS0246), MSBuild and .NET SDK (MSB3073, NETSDK1045), NuGet (NU1101),
+# ShellCheck (SC2086) and linters (E501, F401, W0611)
+_CODE = re.compile(
+    r"\b(?:CVE-\d{4}-\d{4,7}"
+    r"|(?:ORA|PLS|TNS|SP2|RMAN|IMP|EXP|KUP)-\d{4,5}"
+    r"|(?:TS|CS|LNK|MSB|NETSDK|NU|SC)\d{4}"
+    r"|C\d{4}|[EFW]\d{3,4})\b"
+)
+# POSIX errno names reported by system calls and Node.js
+_ERRNO = re.compile(
+    r"\b(E(?:ACCES|ADDRINUSE|AGAIN|CONNABORTED|CONNREFUSED|CONNRESET|EXIST|HOSTUNREACH"
+    r"|INVAL|ISDIR|MFILE|NETUNREACH|NOENT|NOMEM|NOSPC|NOTDIR|NOTEMPTY|NOTFOUND|PERM"
+    r"|PIPE|RESOLVE|ROFS|TIMEDOUT))\b"
+)
+# Numbered statuses that are only meaningful with their context
+_SQLSTATE = re.compile(r"\bSQLSTATE[ =:\[]*([0-9A-Z]{5})\b")
+_EXIT_CODE = re.compile(r"\bexit(?:ed)?(?: with)?(?: status| code)[ :]+(\d{1,3})\b", re.I)
+_HTTP_STATUS = re.compile(
+    r"\b(?:HTTP(?:/\d(?:\.\d)?)?|status(?: code)?)[ :]+([1-5]\d\d)\b", re.I
+)
+
+# Paths with a directory part, or file names with a source/config extension;
+# a trailing :line[:column] is dropped
+_PATH = re.compile(
+    r"(?<![\w/.-])((?:[A-Za-z]:)?/?(?:[\w.@-]+/)+[\w.@-]+"
+    r"|[\w-]+\.(?:py|java|kt|scala|go|rs|rb|js|jsx|ts|tsx|cs|cpp|cc|c|h|hpp|php|swift"
+    r"|sh|gradle|yml|yaml|json|toml|xml|properties|tf|sql))(?::\d+)*"
+)
+
+
+def error_codes(text: str) -> List[str]:
+    """
+    Extract error codes from log text.
+
+    Exit codes, HTTP statuses and SQLSTATEs are qualified (``EXIT_137``,
+    ``HTTP_503``, ``SQLSTATE_23505``) so they do not match unrelated numbers.
+
+    Args:
+        text: Log text
+
+    Returns:
+        Distinct upper-case codes in order of appearance
+    """
+    codes = [match.group(0) for match in _CODE.finditer(text)]
+    codes += [match.group(1) for match in _ERRNO.finditer(text)]
+    codes += [f"SQLSTATE_{match.group(1)}" for match in _SQLSTATE.finditer(text)]
+    codes += [f"EXIT_{match.group(1)}" for match in _EXIT_CODE.finditer(text)]
+    codes += [f"HTTP_{match.group(1)}" for match in _HTTP_STATUS.finditer(text)]
+    return list(dict.fromkeys(code.upper() for code in codes))
+
+
+def file_paths(text: str) -> List[str]:
+    """
+    Extract file paths and source file names from log text.
+
+    Args:
+        text: Log text (stack traces, compiler output, ...)
+
+    Returns:
+        Distinct paths without line numbers, in order of appearance
+    """
+    paths = []
+    for match in _PATH.finditer(text):
+        path = match.group(1).rstrip(".")
+        # Skip dotted numbers such as versions and IP addresses
+        if not path[0].isdigit():
+            paths.append(path)
+    return list(dict.fromkeys(paths))
+
+
+def log_fields(title: str, content: str) -> Dict[str, List[str]]:
+    """Stored fields extracted from a document's text (``error_codes``, ``log_paths``)."""
+    text = f"{title}\n{content}"
+    return {"error_codes": error_codes(text), "log_paths": file_paths(text)}
+
+
+# Volatile tokens dropped from query signatures: they never recur in another
+# report of the same failure
+_VOLATILE = [
+    # Timestamps (2024-05-01T12:30:45.123Z, 2024-05-01 12:30:45,123) and times
+    re.compile(
+        r"\b\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?)?\b"
+    ),
+    re.compile(r"\b\d{2}:\d{2}:\d{2}(?:[.,]\d+)?\b"),
+    re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"),
+    re.compile(r"\b0x[0-9a-fA-F]+\b"),
+    # Java identity hashes (Object@1b6d3586) and commit or build hashes
+    re.compile(r"@[0-9a-f]{6,8}\b"),
+    re.compile(r"\b(?=[0-9a-f]*\d)(?=[0-9a-f]*[a-f])[0-9a-f]{12,64}\b"),
+]
+
+# Exception types, optionally qualified, with the message that follows them
+_EXCEPTION = re.compile(
+    r"\b(?:[A-Za-z_$][\w$]*\.)*([A-Z][\w$]*(?:Exception|Error|Fault|Panic))\b(?::[ \t]*([^\n]*))?"
+)
+_GO_PANIC = re.compile(r"^panic: ([^\n]*)", re.M)
+# Stack frames: Java/Kotlin/JS ``at pkg.Class.method(File.java:12)``, Python
+# ``File "app/x.py", line 12, in method`` and Go ``pkg.(*Type).Method(...)``
+_AT_FRAME = re.compile(r"^\s*at\s+(?:async\s+)?([\w$.<>]+)\s*\(([^():\n]*)", re.M)
+_PY_FRAME = re.compile(r'^\s*File "([^"\n]+)", line \d+, in ([\w<>]+)', re.M)
+_GO_FRAME = re.compile(r"^\s*((?:[\w.-]+/)*[\w-]+\.(?:\(\*?\w+\)\.)?\w+)\([^)\n]*\)\s*$", re.M)
+# Frames of runtimes, frameworks and test harnesses: they say little about
+# which failure this is
+_LIBRARY_FRAME = re.compile(
+    r"^(?:java|javax|jdk|sun|com\.sun|kotlin|kotlinx|scala|org\.junit|org\.springframework"
+    r"|org\.apache|org\.hibernate|org\.postgresql|oracle\.jdbc|com\.mysql|com\.zaxxer|io\.netty"
+    r"|io\.grpc|reactor|node:|internal/|runtime\.|testing\.|reflect\.)"
+    r"|site-packages|dist-packages|node_modules|/usr/lib/|<frozen"
+)
+# Surface form of qualified error codes (see error_codes)
+_CODE_TEXT = {"EXIT": "exit code {}", "HTTP": "HTTP {}", "SQLSTATE": "SQLSTATE {}"}
+
+
+def mask_volatile(text: str) -> str:
+    """Drop timestamps, hex addresses, UUIDs and hashes, and collapse whitespace."""
+    for pattern in _VOLATILE:
+        text = pattern.sub(" ", text)
+    return " ".join(text.split())
+
+
+def stack_frames(text: str) -> List[Tuple[str, str]]:
+    """
+    Extract application stack frames from log text.
+
+    Args:
+        text: Log text with Java, Kotlin, JavaScript, Python or Go stack traces
+
+    Returns:
+        Distinct ``(function, file)`` pairs, innermost first; runtime,
+        framework and third-party frames are left out
+    """
+    frames = []
+    for match in _AT_FRAME.finditer(text):
+        name, file = match.group(1), match.group(2).strip()
+        if not _LIBRARY_FRAME.search(name) and not _LIBRARY_FRAME.search(file):
+            # com.acme.billing.PaymentGateway.charge -> PaymentGateway.charge
+            frames.append((".".join(name.split(".")[-2:]), file.split("/")[-1]))
+    # Python tracebacks list the innermost call last
+    python = []
+    for match in _PY_FRAME.finditer(text):
+        file, function = match.group(1), match.group(2)
+        if not _LIBRARY_FRAME.search(file):
+            python.append((function, re.split(r"[\\/]", file)[-1]))
+    frames += reversed(python)
+    for match in _GO_FRAME.finditer(text):
+        name = match.group(1)
+        if not _LIBRARY_FRAME.search(name):
+            frames.append((name.split("/")[-1], ""))
+    return list(dict.fromkeys(frames))
+
+
+@dataclass
+class FailureSignature:
+    """Compact description of a failure: what was thrown, where, and with which codes."""
+
+    exceptions: List[str] = field(default_factory=list)
+    message: str = ""
+    frames: List[Tuple[str, str]] = field(default_factory=list)
+    codes: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        """Whether nothing identifying was found."""
+        return not (self.exceptions or self.frames or self.codes)
+
+    def text(self) -> str:
+        """
+        The signature as query text, e.g.
+        ``NullPointerException: Cannot invoke ... at PaymentGateway.charge
+        PaymentGateway.java ORA-00942``.
+        """
+        parts = []
+        if self.exceptions:
+            head = self.exceptions[0] + (f": {self.message}" if self.message else "")
+            parts += [head] + self.exceptions[1:]
+        elif self.message:
+            parts.append(self.message)
+        for function, file in self.frames:
+            parts.append(f"at {function} {file}".rstrip())
+        for code in self.codes:
+            kind, _, number = code.partition("_")
+            code = _CODE_TEXT[kind].format(number) if kind in _CODE_TEXT else code
+            # Codes quoted in the message are already part of the signature
+            if code not in self.message:
+                parts.append(code)
+        return " ".join(parts)
+
+
+def failure_signature(
+    text: str, max_frames: int = 3, max_message_chars: int = 120
+) -> FailureSignature:
+    """
+    Extract the failure signature of a log excerpt or stack trace.
+
+    Args:
+        text: Log excerpt (console output, stack trace, error message)
+        max_frames: Application frames kept, innermost first
+        max_message_chars: Length the first exception's message is cut to
+
+    Returns:
+        Exception types (the thrown one first, then its causes), the thrown
+        exception's message with volatile tokens dropped, the top frames and
+        the error codes
+    """
+    signature = FailureSignature()
+    for match in _EXCEPTION.finditer(text):
+        if match.group(1) not in signature.exceptions:
+            signature.exceptions.append(match.group(1))
+        # Python names the exception in the raising line before the message line
+        if match.group(1) == signature.exceptions[0] and not signature.message:
+            signature.message = mask_volatile(match.group(2) or "")
+    panic = _GO_PANIC.search(text)
+    if panic and not signature.message:
+        signature.message = mask_volatile(panic.group(1))
+    if len(signature.message) > max_message_chars:
+        signature.message = signature.message[:max_message_chars].rsplit(" ", 1)[0]
+
+    signature.frames = stack_frames(text)[:max_frames]
+    signature.codes = error_codes(mask_volatile(text))
+    return signature
+
+
+def query_signature(query: str) -> Optional[str]:
+    """
+    Failure signature to search instead of a pasted log excerpt.
+
+    Queries shorter than ``query_signature_min_chars`` without stack frames
+    are left alone. Log excerpts (with stack frames, or several lines long)
+    become their signature: exception types, top frames and error codes.
+    Other long queries, such as prose mentioning an exception, keep their
+    words but lose timestamps, addresses and IDs. Prose without exception
+    types, frames or error codes is searched as is, as is a query its
+    signature would only change in whitespace.
+
+    Args:
+        query: Search query as written by the caller
+
+    Returns:
+        Text to search instead, or None to search the query as is
+    """
+    signature = failure_signature(query, settings.query_signature_max_frames)
+    if len(query) < settings.query_signature_min_chars and not signature.frames:
+        return None
+    log_excerpt = bool(signature.frames) or query.count("\n") >= 2
+    if signature.is_empty() and not log_excerpt:
+        # No log structure to reduce the query to
+        return None
+    if log_excerpt and not signature.is_empty():
+        text = signature.text()
+    else:
+        text = mask_volatile(query)
+    if len(text) > settings.query_signature_max_chars:
+        text = text[: settings.query_signature_max_chars].rsplit(" ", 1)[0]
+    if not text or text == " ".join(query.split()):
+        return None
+    return text
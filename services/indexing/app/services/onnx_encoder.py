@@ -0,0 +1,182 @@
+"""ONNX Runtime encoder with int8 dynamic quantization for CPU inference."""
+
+import inspect
+import json
+from pathlib import Path
+from typing import List, Union
+
+import numpy as np
+
+
+class OnnxEncoder:
+    """
+    Drop-in replacement for the parts of ``SentenceTransformer`` used by
+    ``EmbeddingService`` (``encode`` and ``get_sentence_embedding_dimension``).
+
+    On first use the sentence-transformers model is exported to ONNX under
+    ``cache_dir`` (transformer only; pooling and normalization are done in
+    NumPy) and, with ``quantize``, converted to int8 weights with ONNX
+    Runtime dynamic quantization. Later starts load the exported files and
+    never import torch.
+
+    Requires the ``onnx`` extra (``onnxruntime`` and ``onnx``).
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str,
+        quantize: bool = True,
+        num_threads: int = 0,
+    ):
+        """
+        Load (exporting first if needed) the ONNX model.
+
+        Args:
+            model_name: sentence-transformers model name
+            cache_dir: Directory for exported models
+            quantize: Use int8 dynamically quantized weights
+            num_threads: ONNX Runtime intra-op threads (0 = runtime default)
+        """
+        try:
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "The onnx embedding backend requires the 'onnx' extra: "
+                "pip install 'indexing[onnx]'"
+            ) from e
+
+        self.model_dir = Path(cache_dir) / model_name.replace("/", "__")
+        model_file = self.model_dir / ("model.int8.onnx" if quantize else "model.onnx")
+        if not model_file.exists():
+            self._export(model_name, quantize)
+
+        self.config = json.loads((self.model_dir / "encoder.json").read_text(encoding="utf-8"))
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir))
+
+        options = ort.SessionOptions()
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            str(model_file), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        show_progress_bar: bool = False,
+    ) -> np.ndarray:
+        """
+        Encode texts like ``SentenceTransformer.encode``.
+
+        Args:
+            sentences: Text or list of texts
+            batch_size: Texts per inference call
+            convert_to_numpy: Accepted for compatibility (always NumPy)
+            show_progress_bar: Accepted for compatibility (ignored)
+
+        Returns:
+            float32 array of shape (dim,) for a single text, else (n, dim)
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        # Sort by length so each batch pads to similar lengths
+        order = np.argsort([-len(t) for t in texts])
+        output = np.empty((len(texts), self.config["dimension"]), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            idx = order[start:start + batch_size]
+            output[idx] = self._encode_batch([texts[i] for i in idx])
+
+        return output[0] if single else output
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Embedding dimension."""
+        return self.config["dimension"]
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Run the transformer and pool token embeddings into sentence vectors."""
+        tokens = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.config["max_seq_length"],
+            return_tensors="np",
+        )
+        inputs = {k: v.astype(np.int64) for k, v in tokens.items() if k in self._input_names}
+        token_embeddings = self.session.run(None, inputs)[0]
+
+        mask = tokens["attention_mask"].astype(np.float32)[:, :, None]
+        if self.config["pooling"] == "cls":
+            embeddings = token_embeddings[:, 0]
+        elif self.config["pooling"] == "max":
+            embeddings = np.where(mask > 0, token_embeddings, -np.inf).max(axis=1)
+        else:
+            embeddings = (token_embeddings * mask).sum(axis=1) / np.clip(
+                mask.sum(axis=1), 1e-9, None
+            )
+
+        if self.config["normalize"]:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings.astype(np.float32)
+
+    def _export(self, model_name: str, quantize: bool) -> None:
+        """Export the sentence-transformers model to ONNX (and quantize it)."""
+        import torch
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        from sentence_transformers import SentenceTransformer
+        from sentence_transformers.models import Normalize, Pooling
+
+        print(f"Exporting {model_name} to ONNX in {self.model_dir}")
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        st_model = SentenceTransformer(model_name, device="cpu")
+        transformer = st_model[0]
+        pooling = next((m for m in st_model if isinstance(m, Pooling)), None)
+
+        pooling_mode = "mean"
+        if pooling is not None and pooling.pooling_mode_cls_token:
+            pooling_mode = "cls"
+        elif pooling is not None and pooling.pooling_mode_max_tokens:
+            pooling_mode = "max"
+
+        tokenizer = transformer.tokenizer
+        tokenizer.save_pretrained(str(self.model_dir))
+        model = transformer.auto_model.eval()
+        sample = tokenizer(["export sample"], return_tensors="pt")
+        # Graph inputs follow the forward() signature, not the tokenizer's key order
+        input_names = [
+            name for name in inspect.signature(model.forward).parameters if name in sample
+        ]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                ({name: sample[name] for name in input_names},),
+                str(self.model_dir / "model.onnx"),
+                input_names=input_names,
+                output_names=["token_embeddings"],
+                dynamic_axes=dynamic_axes,
+                opset_version=14,
+            )
+
+        if quantize:
+            quantize_dynamic(
+                str(self.model_dir / "model.onnx"),
+                str(self.model_dir / "model.int8.onnx"),
+                weight_type=QuantType.QInt8,
+            )
+
+        config = {
+            "model_name": model_name,
+            "dimension": st_model.get_sentence_embedding_dimension(),
+            "max_seq_length": st_model.max_seq_length,
+            "pooling": pooling_mode,
+            "normalize": any(isinstance(m, Normalize) for m in st_model),
+        }
+        (self.model_dir / "encoder.json").write_text(json.dumps(config, indent=2), encoding="utf-8")
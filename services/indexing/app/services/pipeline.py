@@ -0,0 +1,318 @@
+"""Pipelined embedding and bulk indexing."""
+
+import asyncio
+from collections import Counter
+from contextlib import suppress
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from app.config import settings
+from app.services.dedup import NearDuplicateDetector
+from app.services.embeddings import EmbeddingService
+from app.services.fingerprint import content_hash, metadata_hash
+from app.services.search import SearchService
+from app.services.tenants import tenant_of
+
+
+# Sentinel marking the end of a stage's output
+_DONE = object()
+
+
+class IndexingPipeline:
+    """
+    Producer-consumer ingest pipeline: embedding stage feeding bulk writers.
+
+    Stages are connected by bounded queues:
+
+        documents -> [embed micro-batches] -> batch queue -> [N bulk writers] -> results
+
+    With ``incremental`` enabled, each micro-batch is first checked against
+    the fingerprints stored in the index: unchanged documents are skipped,
+    documents whose metadata alone changed get a partial update, and only
+    documents whose text or embedding model changed are re-embedded.
+
+    The embedding stage encodes in an executor thread and stays at most
+    ``queue_size`` micro-batches ahead of the writers. Each writer streams
+    bulk requests of at most ``chunk_size`` documents / ``max_chunk_bytes``
+    bytes. When Elasticsearch (or the consumer of ``run``) slows down the
+    queues fill up and upstream stages pause, so memory stays flat no matter
+    how many documents pass through.
+
+    New documents are checked for near-duplicates before they are embedded
+    (see ``NearDuplicateDetector``); skipped or merged duplicates are
+    reported with the result ``duplicate``. The partial updates that merge
+    a duplicate into its original are not reported.
+
+    If the index is cut over to another embedding model while the pipeline
+    runs (``POST /migrate``), later micro-batches are embedded with the new
+    model.
+    """
+
+    def __init__(
+        self,
+        embedding_service: Optional[EmbeddingService],
+        search_service: SearchService,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        max_chunk_bytes: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        incremental: Optional[bool] = None,
+        dedup_policy: Optional[str] = None,
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            embedding_service: Service used to embed documents (may be None if
+                every document carries an embedding)
+            search_service: Service used to write documents
+            batch_size: Documents per embedding micro-batch
+            queue_size: Embedded micro-batches buffered ahead of the writers
+            chunk_size: Documents per bulk request
+            max_chunk_bytes: Bytes per bulk request
+            concurrency: Number of concurrent bulk writers
+            incremental: Skip documents whose stored fingerprint matches
+            dedup_policy: Near-duplicate policy: off, link, skip or merge
+                (default from settings)
+        """
+        self.embedding_service = embedding_service
+        self.search_service = search_service
+        self.batch_size = batch_size or settings.stream_batch_size
+        self.queue_size = queue_size or settings.stream_queue_size
+        self.chunk_size = chunk_size or settings.bulk_chunk_size
+        self.max_chunk_bytes = max_chunk_bytes or settings.bulk_max_chunk_bytes
+        self.concurrency = max(1, concurrency or settings.bulk_concurrency)
+        self.incremental = settings.incremental_indexing if incremental is None else incremental
+        dedup_policy = dedup_policy or settings.dedup_policy
+        self.dedup = (
+            NearDuplicateDetector(search_service, dedup_policy)
+            if dedup_policy != "off"
+            else None
+        )
+        # In-flight merge updates per original's ID, kept out of the results
+        self._merge_updates: Counter = Counter()
+
+    async def run(
+        self,
+        documents: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+    ) -> AsyncIterator[Tuple[bool, Dict[str, Any]]]:
+        """
+        Embed and index documents as they arrive.
+
+        Args:
+            documents: Iterable or async iterable of documents with id, title,
+                content, metadata and optionally a precomputed embedding
+
+        Yields:
+            Tuples of (ok, result) where result has the document id, the
+            outcome (created, updated, noop, skipped or duplicate) and, on
+            failure, an error message
+        """
+        batches: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.chunk_size * self.concurrency)
+
+        tasks = [asyncio.create_task(self._embed_stage(documents, batches, results))]
+        tasks += [
+            asyncio.create_task(self._write_stage(batches, results))
+            for _ in range(self.concurrency)
+        ]
+
+        try:
+            writers_left = self.concurrency
+            while writers_left:
+                item = await results.get()
+                if item is _DONE:
+                    writers_left -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            for task in tasks:
+                with suppress(asyncio.CancelledError):
+                    await task
+
+    async def _embed_stage(
+        self,
+        documents: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        batches: asyncio.Queue,
+        results: asyncio.Queue,
+    ) -> None:
+        """Group documents into micro-batches, turn them into bulk actions and enqueue."""
+        try:
+            batch: List[Dict[str, Any]] = []
+            async for doc in _iterate(documents):
+                batch.append(doc)
+                if len(batch) >= self.batch_size:
+                    await batches.put(await self._prepare(batch, results))
+                    batch = []
+            if batch:
+                await batches.put(await self._prepare(batch, results))
+            await batches.put(_DONE)
+        except Exception as e:
+            # Hand the failure to the writers so the caller sees it
+            await batches.put(e)
+
+    async def _prepare(
+        self,
+        batch: List[Dict[str, Any]],
+        results: asyncio.Queue,
+    ) -> List[Dict[str, Any]]:
+        """Classify a micro-batch against stored fingerprints and build its actions."""
+        existing: Dict[str, Dict[str, Any]] = {}
+        if self.incremental:
+            existing = await self.search_service.get_fingerprints(
+                [doc["id"] for doc in batch], [tenant_of(doc) for doc in batch]
+            )
+
+        embedding_service = self._embedding_service()
+        current_model = embedding_service.model_version if embedding_service else None
+        actions: List[Dict[str, Any]] = []
+        new: List[Dict[str, Any]] = []
+        changed: List[Dict[str, Any]] = []
+        for doc in batch:
+            stored = existing.get(doc["id"])
+            if stored is None:
+                new.append(doc)
+                continue
+            # Re-indexed documents stay in their near-duplicate cluster; those
+            # indexed before clustering become their own (see build_action)
+            if stored.get("cluster_id") and not doc.get("cluster_id"):
+                doc["cluster_id"] = stored["cluster_id"]
+
+            model = current_model
+            if doc.get("embedding") is not None:
+                model = doc.get("embedding_model")
+            if (
+                stored.get("content_hash") != content_hash(doc["title"], doc["content"])
+                or stored.get("embedding_model") != model
+            ):
+                changed.append(doc)
+            elif stored.get("metadata_hash") != metadata_hash(doc.get("metadata")):
+                actions.extend(self.search_service.update_actions(doc))
+            else:
+                await results.put((True, {"id": doc["id"], "status": 200, "result": "skipped"}))
+
+        if self.dedup is not None:
+            # Only new documents can be near-duplicates: an indexed document
+            # that changed is rewritten in place, whatever it resembles now
+            new, merges, duplicates = await self.dedup.resolve(new)
+            for action in merges:
+                if not self.search_service.is_mirror_result(action["_index"]):
+                    self._merge_updates[action["_id"]] += 1
+            actions.extend(merges)
+            for result in duplicates:
+                await results.put((True, result))
+
+        changed = new + changed
+        await self._embed(changed, embedding_service)
+        for doc in changed:
+            actions.extend(self.search_service.write_actions(doc))
+        return actions
+
+    def _embedding_service(self) -> Optional[EmbeddingService]:
+        """The pipeline's model, or the serving index's model after a cut-over."""
+        service = self.embedding_service
+        if service is not None and (
+            service.model_version != self.search_service.embedding_model_version
+        ):
+            service = self.search_service.embedding_service()
+        return service
+
+    async def _embed(
+        self,
+        batch: List[Dict[str, Any]],
+        embedding_service: Optional[EmbeddingService],
+    ) -> List[Dict[str, Any]]:
+        """Embed documents that do not carry an embedding yet."""
+        pending = [doc for doc in batch if doc.get("embedding") is None]
+        if pending:
+            if embedding_service is None:
+                raise ValueError("Documents without embeddings require an embedding service")
+            texts = [f"{doc['title']} {doc['content']}" for doc in pending]
+            # Encode in an executor so the writers keep flushing meanwhile
+            embeddings = await embedding_service.aembed_batch(texts)
+            for doc, embedding in zip(pending, embeddings):
+                doc["embedding"] = embedding
+                doc["embedding_model"] = embedding_service.model_version
+        return batch
+
+    async def _write_stage(self, batches: asyncio.Queue, results: asyncio.Queue) -> None:
+        """Stream embedded batches to Elasticsearch and publish per-document results."""
+        try:
+            async for ok, item in self.search_service.stream_bulk(
+                self._actions(batches),
+                chunk_size=self.chunk_size,
+                max_chunk_bytes=self.max_chunk_bytes,
+            ):
+                result = self._result(ok, item)
+                if self.search_service.is_mirror_result(result.pop("index")):
+                    # Dual write during a rebuild: reconcile failures, never report
+                    if not ok:
+                        self.search_service.mark_rebuild_dirty(result["id"])
+                    continue
+                if "update" in item and self._merge_updates[result["id"]]:
+                    # The duplicate was already reported; the original was not written
+                    self._merge_updates[result["id"]] -= 1
+                    if not ok:
+                        print(f"Failed to merge a duplicate into {result['id']}: {result['error']}")
+                    continue
+                await results.put((ok, result))
+            await results.put(_DONE)
+        except Exception as e:
+            await results.put(e)
+
+    async def _actions(self, batches: asyncio.Queue) -> AsyncIterator[Dict[str, Any]]:
+        """Flatten queued micro-batches of bulk actions."""
+        while True:
+            item = await batches.get()
+            if item is _DONE or isinstance(item, Exception):
+                # Leave the marker in place for the other writers
+                await batches.put(item)
+                if item is _DONE:
+                    return
+                raise item
+            for action in item:
+                yield action
+
+    @staticmethod
+    def _result(ok: bool, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten a bulk response item."""
+        info = next(iter(item.values()), {})
+        result = {
+            "index": info.get("_index"),
+            "id": info.get("_id"),
+            "status": info.get("status"),
+            "result": info.get("result"),
+        }
+        if not ok:
+            error = info.get("error") or info.get("exception") or "unknown error"
+            if isinstance(error, dict):
+                error = error.get("reason") or error.get("type") or str(error)
+            result["error"] = str(error)
+        return result
+
+
+async def _iterate(
+    documents: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+) -> AsyncIterator[Dict[str, Any]]:
+    """Iterate sync and async document sources uniformly."""
+    if hasattr(documents, "__aiter__"):
+        async for doc in documents:
+            yield doc
+    else:
+        for doc in documents:
+            yield doc
@@ -0,0 +1,22 @@
+"""Vector quantization helpers for the binary vector storage mode."""
+
+from typing import Sequence
+
+import numpy as np
+
+
+def binary_quantize(embedding: Sequence[float]) -> str:
+    """
+    Sign-quantize an embedding into a packed bit vector.
+
+    Each dimension becomes one bit (1 if the value is positive), packed
+    big-endian into bytes and hex-encoded, which is the format Elasticsearch
+    accepts for ``element_type: bit`` dense vectors.
+
+    Args:
+        embedding: Float embedding (dimension must be a multiple of 8)
+
+    Returns:
+        Hex string of ``len(embedding) / 8`` bytes
+    """
+    return np.packbits(np.asarray(embedding) > 0).tobytes().hex()
@@ -0,0 +1,258 @@
+"""Zero-downtime rebuild of the search index into a new versioned index."""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.services.embeddings import EmbeddingService, get_embedding_registry
+from app.services.jobs import Job
+from app.services.search import SearchService
+
+
+class _Throttle:
+    """Cap average throughput at ``rate`` items per second (0 = unlimited)."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.start = time.monotonic()
+        self.count = 0
+
+    async def wait(self, items: int) -> None:
+        self.count += items
+        if self.rate <= 0:
+            return
+        ahead = self.count / self.rate - (time.monotonic() - self.start)
+        if ahead > 0:
+            await asyncio.sleep(ahead)
+
+
+async def run_rebuild(
+    job: Job,
+    embedding_service: EmbeddingService,
+    search_service: SearchService,
+    reembed: bool = False,
+    delete_old: bool = False,
+    max_docs_per_second: Optional[float] = None,
+) -> None:
+    """
+    Rebuild the index behind the alias into a new versioned physical index.
+
+    Steps:
+    1. Create ``<alias>_v<n+1>`` with the current mappings and
+       ``embedding_service``'s model in its ``_meta`` (refresh disabled).
+    2. Mirror all live writes into it (dual write) while the rebuild runs.
+       Writes embedded with another model are re-embedded in step 4.
+    3. Copy a snapshot of the current index in throttled batches with
+       ``op_type=create``, so documents already written by the dual write
+       are never overwritten by older snapshot copies. Documents are
+       re-embedded when ``reembed`` is set or their stored embedding comes
+       from another model; otherwise the stored vector is reused.
+    4. Reconcile documents the dual write could not cover (partial updates
+       of documents not copied yet, deletes of documents copied later).
+    5. Hold alias writes (see ``SearchService.hold_writes``), reconcile
+       once more and atomically swap the alias, so no write lands in the
+       old index after its last reconcile. Held writes resume against the
+       new index and are re-embedded if they were built with the old
+       model. Optionally drop the old index.
+
+    Reads keep hitting the old index until the swap, so searches never see
+    a half-built index, and queries switch to the new index's model at the
+    swap.
+
+    Args:
+        job: Job to report progress on
+        embedding_service: Model of the new index, used to re-embed documents
+        search_service: Service owning the alias
+        reembed: Re-embed every document, even if its model is current
+        delete_old: Delete the previous physical index after the swap
+        max_docs_per_second: Throughput cap (default from settings)
+    """
+    if search_service.rebuild_target:
+        raise RuntimeError(f"Rebuild into {search_service.rebuild_target} already running")
+
+    for key in ("copied", "reembedded", "superseded", "reconciled", "failed"):
+        job.counts.setdefault(key, 0)
+
+    old_index = await search_service.current_index()
+    new_index = await search_service.next_index_name()
+    job.details.update({"old_index": old_index, "new_index": new_index})
+
+    await search_service.create_index(new_index, embedding_service=embedding_service)
+    await search_service.es.indices.put_settings(
+        index=new_index, settings={"index": {"refresh_interval": "-1"}}
+    )
+    search_service.start_dual_write(new_index, embedding_service.model_version)
+
+    try:
+        job.details["total"] = await search_service.count_documents()
+        throttle = _Throttle(
+            settings.rebuild_max_docs_per_second
+            if max_docs_per_second is None
+            else max_docs_per_second
+        )
+
+        batch: List[Dict[str, Any]] = []
+        async for hit in search_service.scan_documents(source=True, index=old_index):
+            batch.append({"id": hit["_id"], **hit["_source"]})
+            if len(batch) >= settings.rebuild_batch_size:
+                await _copy(job, embedding_service, search_service, new_index, batch, reembed)
+                await throttle.wait(len(batch))
+                batch = []
+        if batch:
+            await _copy(job, embedding_service, search_service, new_index, batch, reembed)
+
+        await _reconcile(job, embedding_service, search_service, old_index, new_index, reembed)
+        # Writers may still send old-model writes until the swap; hold alias
+        # writes so the last reconcile and the swap see all of them
+        async with search_service.hold_writes():
+            await _reconcile(
+                job, embedding_service, search_service, old_index, new_index, reembed
+            )
+            await search_service.es.indices.put_settings(
+                index=new_index, settings={"index": {"refresh_interval": None}}
+            )
+            await search_service.es.indices.refresh(index=new_index)
+            await search_service.swap_alias(new_index)
+            search_service.stop_dual_write()
+    except BaseException:
+        search_service.stop_dual_write()
+        await search_service.es.indices.delete(index=new_index, ignore_unavailable=True)
+        raise
+
+    if delete_old and old_index != search_service.index:
+        await search_service.es.indices.delete(index=old_index, ignore_unavailable=True)
+        job.details["old_index_deleted"] = True
+
+
+async def run_migration(
+    job: Job,
+    search_service: SearchService,
+    model_name: str,
+    backend: Optional[str] = None,
+    delete_old: bool = False,
+    max_docs_per_second: Optional[float] = None,
+    unload_old: bool = True,
+) -> None:
+    """
+    Migrate the index to another embedding model without a restart.
+
+    Loads the new model next to the serving one, then rebuilds the index
+    with it (see ``run_rebuild``). Until the alias swap, queries and writes
+    keep using the old model and index; from the swap on, both use the new
+    model. The old model is unloaded afterwards, unless ``unload_old`` is
+    unset.
+
+    Args:
+        job: Job to report progress on
+        search_service: Service owning the alias
+        model_name: Sentence Transformers model to migrate to
+        backend: torch or onnx (default from settings)
+        delete_old: Delete the previous physical index after the swap
+        max_docs_per_second: Throughput cap (default from settings)
+        unload_old: Unload the previous model after the swap
+    """
+    registry = get_embedding_registry()
+    old_model = search_service.embedding_model_version
+    new_service = await registry.aget(model_name, backend)
+    job.details.update({
+        "old_model": old_model,
+        "new_model": new_service.model_version,
+        "embedding_dimension": new_service.get_dimension(),
+    })
+    await run_rebuild(
+        job,
+        new_service,
+        search_service,
+        delete_old=delete_old,
+        max_docs_per_second=max_docs_per_second,
+    )
+    if unload_old and old_model != new_service.model_version:
+        registry.unload(old_model)
+
+
+async def _reconcile(
+    job: Job,
+    embedding_service: EmbeddingService,
+    search_service: SearchService,
+    old_index: str,
+    new_index: str,
+    reembed: bool,
+) -> None:
+    """Re-copy documents the dual write missed until no gaps remain."""
+    while True:
+        dirty, deleted = search_service.take_rebuild_changes()
+        if not dirty and not deleted:
+            return
+        # Documents are looked up by search, which needs their writes refreshed
+        await search_service.es.indices.refresh(index=old_index)
+        current = await search_service.get_documents(list(dirty), index=old_index)
+        docs = [{"id": doc_id, **source} for doc_id, source in current.items()]
+        await _copy(
+            job, embedding_service, search_service, new_index, docs, reembed,
+            op_type="index", counter="reconciled",
+        )
+        deleted |= dirty - set(current)
+        await _delete(search_service, new_index, deleted)
+        job.increment("reconciled", len(deleted))
+
+
+async def _copy(
+    job: Job,
+    embedding_service: EmbeddingService,
+    search_service: SearchService,
+    index: str,
+    docs: List[Dict[str, Any]],
+    reembed: bool,
+    op_type: str = "create",
+    counter: str = "copied",
+) -> None:
+    """Copy stored documents into ``index``, re-embedding where needed."""
+    stale = [
+        doc for doc in docs
+        if reembed
+        or doc.get("embedding") is None
+        or doc.get("embedding_model") != embedding_service.model_version
+    ]
+    if stale:
+        texts = [f"{doc.get('title', '')} {doc.get('content', '')}" for doc in stale]
+        embeddings = await embedding_service.aembed_batch(texts)
+        for doc, embedding in zip(stale, embeddings):
+            doc["embedding"] = embedding
+            doc["embedding_model"] = embedding_service.model_version
+        job.increment("reembedded", len(stale))
+
+    async def actions():
+        for doc in docs:
+            action = search_service.build_action(
+                {**doc, "title": doc.get("title", ""), "content": doc.get("content", "")},
+                index=index,
+            )
+            action["_op_type"] = op_type
+            yield action
+
+    # Rebuild writes go on while alias writes are held for the swap
+    async for ok, item in search_service.stream_bulk(actions(), bypass_hold=True):
+        info = next(iter(item.values()), {})
+        if ok:
+            job.increment(counter)
+        elif info.get("status") == 409:
+            # Written by the dual write after the snapshot was taken
+            job.increment("superseded")
+        else:
+            job.increment("failed")
+
+
+async def _delete(search_service: SearchService, index: str, doc_ids) -> None:
+    """
+    Delete documents from ``index`` (missing documents are ignored).
+
+    Deleted by query, since the tenant routing of a document that is gone
+    from the old index is no longer known.
+    """
+    if not doc_ids:
+        return
+    await search_service.es.indices.refresh(index=index)
+    await search_service.es.delete_by_query(
+        index=index, query={"ids": {"values": list(doc_ids)}}, conflicts="proceed"
+    )
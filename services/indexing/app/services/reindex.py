@@ -0,0 +1,125 @@
+"""Incremental re-indexing jobs."""
+
+from typing import Any, Dict, List, Optional
+
+from app.services.embeddings import EmbeddingService
+from app.services.jobs import Job
+from app.services.pipeline import IndexingPipeline
+from app.services.search import SearchService
+
+
+# Map pipeline outcomes onto reported job counters
+_OUTCOMES = {
+    "created": "created",
+    "updated": "updated",
+    "noop": "skipped",
+    "skipped": "skipped",
+    "duplicate": "duplicates",
+}
+
+
+async def run_reindex(
+    job: Job,
+    embedding_service: EmbeddingService,
+    search_service: SearchService,
+    documents: Optional[List[Dict[str, Any]]] = None,
+    source: Optional[str] = None,
+    prune: bool = False,
+) -> None:
+    """
+    Bring the index in line with a document set or the current model.
+
+    With ``documents``, they are ingested incrementally (unchanged documents
+    are skipped) and, if ``prune`` is set, indexed documents missing from the
+    set are deleted. ``source`` restricts pruning to documents with that
+    source. Without ``documents``, every stored document whose embedding was
+    produced by a different model, or that predates change tracking, is
+    re-embedded in place.
+
+    Progress is reported through ``job.counts``: created, updated, skipped,
+    deleted and failed.
+
+    Args:
+        job: Job to report progress on
+        embedding_service: Service used to embed changed documents
+        search_service: Service used to read and write the index
+        documents: Desired document set (each with an ``id``)
+        source: Restrict pruning to this source
+        prune: Delete indexed documents that are not in ``documents``
+    """
+    for key in ("created", "updated", "skipped", "deleted", "failed"):
+        job.counts.setdefault(key, 0)
+
+    pipeline = IndexingPipeline(embedding_service, search_service, incremental=True)
+
+    if documents is not None:
+        seen = set()
+        for doc in documents:
+            seen.add(doc["id"])
+        await _ingest(job, pipeline, documents)
+        if prune:
+            await _prune(job, search_service, seen, source)
+        return
+
+    # No document set: refresh documents embedded with another model
+    current_model = {"term": {"embedding_model": embedding_service.model_version}}
+    stale_query = {
+        "bool": {
+            "should": [
+                {"bool": {"must_not": current_model}},
+                {"bool": {"must_not": {"exists": {"field": "content_hash"}}}},
+            ],
+            "minimum_should_match": 1,
+        }
+    }
+    total = await search_service.count_documents()
+    stale = await search_service.count_documents(stale_query)
+    job.details["stale_documents"] = stale
+    job.increment("skipped", total - stale)
+
+    async def stale_documents():
+        async for hit in search_service.scan_documents(
+            stale_query, source=["title", "content", "metadata", "tenant"]
+        ):
+            source_doc = hit["_source"]
+            yield {
+                "id": hit["_id"],
+                "title": source_doc.get("title", ""),
+                "content": source_doc.get("content", ""),
+                "metadata": source_doc.get("metadata"),
+                "tenant": source_doc.get("tenant"),
+            }
+
+    await _ingest(job, pipeline, stale_documents())
+
+
+async def _ingest(job: Job, pipeline: IndexingPipeline, documents) -> None:
+    """Run documents through the pipeline and tally outcomes on the job."""
+    async for ok, result in pipeline.run(documents):
+        if ok:
+            job.increment(_OUTCOMES.get(result.get("result"), "updated"))
+        else:
+            job.increment("failed")
+
+
+async def _prune(
+    job: Job,
+    search_service: SearchService,
+    keep: set,
+    source: Optional[str],
+) -> None:
+    """Delete indexed documents (optionally of one source) not in ``keep``."""
+    query = {"term": {"source": source}} if source else None
+
+    async def deletions():
+        async for hit in search_service.scan_documents(query, source=["tenant"]):
+            if hit["_id"] not in keep:
+                tenant = hit.get("_source", {}).get("tenant")
+                for action in search_service.delete_actions(hit["_id"], tenant):
+                    yield action
+
+    async for ok, item in search_service.stream_bulk(deletions()):
+        info = item.get("delete", {})
+        if search_service.is_mirror_result(info.get("_index")):
+            continue
+        job.increment("deleted" if ok else "failed")
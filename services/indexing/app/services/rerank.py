@@ -0,0 +1,183 @@
+"""Cross-encoder reranking of search candidates."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+
+class RerankService:
+    """
+    Rerank the top retrieval candidates with a cross-encoder.
+
+    The cross-encoder scores each (query, document) pair jointly, which is
+    more accurate than the fused bi-encoder/BM25 scores but costs one model
+    pass per pair. Pairs are scored in batches on a dedicated CPU thread,
+    in retrieval order, until the latency budget is spent; candidates that
+    were not scored in time keep their retrieval order below the reranked
+    ones. Scores are cached per (query, document ID) until the index
+    changes.
+    """
+
+    def __init__(self):
+        """Load the cross-encoder."""
+        from sentence_transformers import CrossEncoder
+
+        self.model_name = settings.rerank_model
+        self.top_n = settings.rerank_top_n
+        self.batch_size = settings.rerank_batch_size
+        self.budget_ms = settings.rerank_budget_ms
+        self.cache_size = settings.rerank_cache_size
+
+        print(f"Loading rerank model: {self.model_name}")
+        self.model = CrossEncoder(self.model_name, device="cpu", max_length=256)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._generation = 0
+        self.requests = 0
+        self.pairs_scored = 0
+        self.cache_hits = 0
+        self.budget_exhausted = 0
+        self.total_ms = 0.0
+
+    async def rerank(
+        self,
+        query: str,
+        results: List[Dict[str, Any]],
+        top_k: int,
+        generation: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rerank the first ``top_n`` results.
+
+        Args:
+            query: Search query
+            results: Retrieval results, best first
+            top_k: Number of results to return
+            generation: Index generation (cached scores of older generations are dropped)
+
+        Returns:
+            Up to ``top_k`` results; reranked ones carry the cross-encoder
+            score in ``score`` and the original score in ``retrieval_score``
+        """
+        started = time.perf_counter()
+        deadline = started + self.budget_ms / 1000.0
+        if generation != self._generation:
+            self._cache.clear()
+            self._generation = generation
+
+        normalized = " ".join(query.lower().split())
+        candidates = results[: self.top_n]
+        scores: Dict[str, float] = {}
+        missing = []
+        for result in candidates:
+            cached = self._cache.get((normalized, result["id"]))
+            if cached is None:
+                missing.append(result)
+            else:
+                self._cache.move_to_end((normalized, result["id"]))
+                scores[result["id"]] = cached
+                self.cache_hits += 1
+
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(missing), self.batch_size):
+            if time.perf_counter() >= deadline:
+                self.budget_exhausted += 1
+                break
+            batch = missing[start:start + self.batch_size]
+            pairs = [(query, f"{r['title']}\n{r['content']}") for r in batch]
+            batch_scores = await loop.run_in_executor(self._executor, self._predict, pairs)
+            for result, score in zip(batch, batch_scores):
+                scores[result["id"]] = score
+                self._store((normalized, result["id"]), score)
+            self.pairs_scored += len(batch)
+
+        reranked = sorted(
+            (
+                {**r, "score": scores[r["id"]], "retrieval_score": r["score"]}
+                for r in candidates
+                if r["id"] in scores
+            ),
+            key=lambda r: r["score"],
+            reverse=True,
+        )
+        unscored = [r for r in results if r["id"] not in scores]
+
+        self.requests += 1
+        self.total_ms += (time.perf_counter() - started) * 1000
+        return (reranked + unscored)[:top_k]
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counts, cache hits and average rerank latency."""
+        return {
+            "model": self.model_name,
+            "top_n": self.top_n,
+            "budget_ms": self.budget_ms,
+            "requests": self.requests,
+            "pairs_scored": self.pairs_scored,
+            "cache_hits": self.cache_hits,
+            "cache_entries": len(self._cache),
+            "budget_exhausted": self.budget_exhausted,
+            "avg_ms": self.total_ms / self.requests if self.requests else 0.0,
+        }
+
+    def close(self):
+        """Stop the rerank thread."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _predict(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Score (query, document) pairs (runs on the rerank thread)."""
+        scores = self.model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+        return [float(score) for score in scores]
+
+    def _store(self, key: Tuple[str, str], score: float) -> None:
+        self._cache[key] = score
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+# Global rerank service instance (lazy loaded, or preloaded at startup)
+_rerank_service: Optional[RerankService] = None
+_rerank_service_lock = asyncio.Lock()
+
+
+def get_rerank_service() -> RerankService:
+    """
+    Get or create global rerank service instance.
+
+    Returns:
+        Rerank service instance
+    """
+    global _rerank_service
+    if _rerank_service is None:
+        _rerank_service = RerankService()
+    return _rerank_service
+
+
+async def aget_rerank_service() -> RerankService:
+    """
+    Like ``get_rerank_service``, but loads the cross-encoder on a thread.
+
+    The model is loaded once: callers arriving while it loads wait for it.
+    """
+    global _rerank_service
+    if _rerank_service is None:
+        async with _rerank_service_lock:
+            if _rerank_service is None:
+                _rerank_service = await asyncio.to_thread(RerankService)
+    return _rerank_service
+
+
+def peek_rerank_service() -> Optional[RerankService]:
+    """The global rerank service if it was loaded, without loading it."""
+    return _rerank_service
+
+
+def close_rerank_service():
+    """Shut down the global rerank service's thread, if it was loaded."""
+    if _rerank_service is not None:
+        _rerank_service.close()
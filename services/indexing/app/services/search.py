@@ -1,11 +1,177 @@
 """Elasticsearch client for indexing and search."""
 
-from typing import List, Dict, Any, Optional
-import uuid
-from elasticsearch import AsyncElasticsearch
-from elasticsearch.helpers import async_bulk
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime
+import re
+import time
+from typing import (
+    TYPE_CHECKING,
+    List,
+    Dict,
+    Any,
+    Optional,
+    Set,
+    Sequence,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Tuple,
+    Union,
+)
+
+from elasticsearch import ApiError, AsyncElasticsearch, TransportError
+from elasticsearch.helpers import async_scan, async_streaming_bulk
 
 from app.config import settings
+from app.services.dedup import simhash, simhash_bands
+from app.services.embeddings import get_embedding_registry, get_embedding_service, model_version
+from app.services.es_client import create_es_client, get_es_client
+from app.services.fingerprint import content_hash, metadata_hash
+from app.services.local_index import LocalVectorIndex
+from app.services.log_parsing import LOG_ANALYSIS, error_codes, file_paths, log_fields
+from app.services.quantization import binary_quantize
+from app.services.tenants import SHARED_TENANT, filter_tenants, tenant_filter, tenant_of
+
+if TYPE_CHECKING:
+    from app.services.embeddings import EmbeddingService
+
+
+# Metadata fields mapped as keywords for exact filters and facets
+METADATA_KEYWORD_FIELDS = [
+    "category",
+    "language",
+    "technology",
+    "severity",
+    "error_type",
+    "difficulty",
+]
+
+# Fields that can be requested as facets
+FACET_FIELDS = [
+    "source",
+    "tags",
+    "tenant",
+    "error_codes",
+    "embedding_model",
+    *(f"metadata.{name}" for name in METADATA_KEYWORD_FIELDS),
+]
+
+# Keys that turn a filter value into a range filter
+RANGE_OPERATORS = {"gt", "gte", "lt", "lte"}
+
+# Stored fields returned with search hits (full content stays on the server)
+RESULT_SOURCE_FIELDS = ["title", "summary", "source", "url", "metadata", "cluster_id"]
+
+# Fields maintained by the merge dedup policy, carried over on copies
+MERGE_FIELDS = ("occurrences", "duplicate_ids", "last_seen")
+
+# Oldest Elasticsearch version supporting each vector storage mode
+VECTOR_STORAGE_MIN_VERSION = {"float": (8, 0), "int8_hnsw": (8, 12), "binary": (8, 15)}
+
+
+def make_summary(content: str, length: Optional[int] = None) -> str:
+    """
+    Shorten content for search results.
+
+    Cuts at the last word boundary within ``length`` characters (default
+    ``settings.summary_length``) so results do not end mid-word.
+    """
+    length = length or settings.summary_length
+    if len(content) <= length:
+        return content
+    cut = content[:length]
+    boundary = cut.rfind(" ")
+    return cut[:boundary] if boundary > length // 2 else cut
+
+
+class SearchResults(list):
+    """Search results (a plain list of hits) with optional facet counts."""
+
+    def __init__(
+        self,
+        results: Iterable[Dict[str, Any]] = (),
+        facets: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    ):
+        super().__init__(results)
+        # Facet field -> [{"value": ..., "count": ...}], most frequent first
+        self.facets = facets or {}
+
+
+def collapse_duplicates(results: SearchResults, top_k: int) -> SearchResults:
+    """
+    Keep the best result of each near-duplicate cluster.
+
+    Results are expected best first; each kept result counts the collapsed
+    ones in ``duplicates``. Results without a ``cluster_id`` (indexed before
+    near-duplicate detection) are their own cluster.
+
+    Args:
+        results: Search results, best first
+        top_k: Number of results to return
+
+    Returns:
+        Up to ``top_k`` results from distinct clusters
+    """
+    kept: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        cluster = result.get("cluster_id") or result["id"]
+        if cluster in kept:
+            kept[cluster]["duplicates"] += 1
+        else:
+            kept[cluster] = {**result, "duplicates": 0}
+    return SearchResults(list(kept.values())[:top_k], results.facets)
+
+
+class _ActionReader:
+    """
+    Bulk actions pulled one ahead, so a bulk stream can be cut into segments.
+
+    A pull still waiting for its action when a segment ends carries over to
+    the next segment, as does an action pushed back.
+    """
+
+    def __init__(self, actions: AsyncIterable[Dict[str, Any]]):
+        self._actions = actions.__aiter__()
+        self._pull: Optional[asyncio.Future] = None
+        self._pushed_back: Optional[Dict[str, Any]] = None
+        self.exhausted = False
+
+    async def next(self, stop: Optional[asyncio.Event] = None) -> Optional[Dict[str, Any]]:
+        """
+        The next action; None when the actions are exhausted, or when
+        ``stop`` is set before the next action is available.
+        """
+        if self._pushed_back is not None:
+            action, self._pushed_back = self._pushed_back, None
+            return action
+        if self._pull is None:
+            self._pull = asyncio.ensure_future(self._actions.__anext__())
+        if stop is not None and not self._pull.done():
+            stopped = asyncio.ensure_future(stop.wait())
+            try:
+                await asyncio.wait({self._pull, stopped}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                stopped.cancel()
+            if not self._pull.done():
+                return None
+        pull, self._pull = self._pull, None
+        try:
+            return await pull
+        except StopAsyncIteration:
+            self.exhausted = True
+            return None
+
+    def push_back(self, action: Dict[str, Any]):
+        """Return an action to be read again first."""
+        self._pushed_back = action
+
+    async def close(self):
+        """Cancel a pull in progress."""
+        if self._pull is not None and not self._pull.done():
+            self._pull.cancel()
+            with suppress(asyncio.CancelledError, StopAsyncIteration):
+                await self._pull
 
 
 class SearchService:
@@ -15,52 +181,548 @@ class SearchService:
     Combines dense vector (semantic) and sparse (keyword) retrieval.
     """
 
-    def __init__(self):
-        """Initialize Elasticsearch client."""
-        self.es = AsyncElasticsearch([settings.elasticsearch_url])
+    def __init__(self, es: Optional[AsyncElasticsearch] = None):
+        """
+        Initialize the service.
+
+        Args:
+            es: Shared Elasticsearch client (default: a client owned and
+                closed by this service)
+        """
+        self._owns_client = es is None
+        self.es = es or create_es_client()
+        # Alias used for all reads and writes; physical indices are versioned
         self.index = settings.elasticsearch_index
+        # Embedding model of the index behind the alias (from its _meta);
+        # queries and writes are embedded with it
+        self.embedding_model = settings.embedding_model
+        self.embedding_backend = settings.embedding_backend
+        self.embedding_dimension = settings.embedding_dimension
+        # Whether documents of the index behind the alias are routed to a
+        # shard by tenant (from its _meta)
+        self.tenant_routing = settings.tenant_routing
+        # Whether the index has the log-aware analyzers (from its _meta);
+        # keyword queries use the log fields only then
+        self.log_analysis = True
+        # Physical index receiving dual writes while a rebuild is running,
+        # and the model version its embeddings come from
+        self.rebuild_target: Optional[str] = None
+        self.rebuild_model: Optional[str] = None
+        self.rebuild_routing = settings.tenant_routing
+        self._rebuild_dirty: Set[str] = set()
+        self._rebuild_deleted: Set[str] = set()
+        # Rebuild target whose dual write ended; late mirror writes into it are dropped
+        self._ended_target: Optional[str] = None
+        # Alias writes are held while a rebuild cuts over (see hold_writes);
+        # bulk actions count as in flight until their result comes back
+        self._writes_held = asyncio.Event()
+        self._writes_released = asyncio.Event()
+        self._writes_released.set()
+        self._writes_in_flight = 0
+        self._writes_drained = asyncio.Event()
+        self._writes_drained.set()
+        # Bumped on every write so result caches can invalidate
+        self.generation = 0
+        self._last_write = 0.0
+        # Embedded replica fed by the same write path, used when ES is unavailable
+        self.local_index: Optional[LocalVectorIndex] = None
+        self._local_backfill: Optional[asyncio.Task] = None
+        if settings.local_index_enabled:
+            self.local_index = LocalVectorIndex(
+                settings.local_index_path, settings.embedding_dimension
+            )
+
+    @property
+    def embedding_model_version(self) -> str:
+        """Version of the serving index's embedding model (see ``model_version``)."""
+        return model_version(self.embedding_model, self.embedding_backend)
+
+    def embedding_service(self) -> "EmbeddingService":
+        """The serving index's embedding model (loaded on first use)."""
+        return get_embedding_service(self.embedding_model, self.embedding_backend)
+
+    async def aembedding_service(self) -> "EmbeddingService":
+        """Like ``embedding_service``, but loads the model on a thread, once."""
+        return await get_embedding_registry().aget(self.embedding_model, self.embedding_backend)
+
+    def _bump_generation(self):
+        """Record that the index content (or the alias target) changed."""
+        self.generation += 1
+        self._last_write = time.monotonic()
+
+    def writes_settled(self) -> bool:
+        """
+        Whether the last write is old enough to be visible to searches.
+
+        Elasticsearch exposes writes only after a refresh, so results
+        computed right after a write may still be stale.
+        """
+        return time.monotonic() - self._last_write >= settings.search_cache_write_grace_seconds
 
     async def ensure_index(self):
         """
         Ensure index exists with proper mappings.
         
-        Creates index with dense_vector field for semantic search
-        and text fields for keyword search.
+        Creates a versioned physical index (``<alias>_v1``) with dense_vector
+        field for semantic search and text fields for keyword search, and
+        points the alias at it. For an existing index, fields added to the
+        mapping since it was created are put additively; anything else
+        (vector dimensions, analyzers) needs a rebuild.
         """
+        if await self.es.indices.exists_alias(name=self.index):
+            await self._load_index_meta()
+            await self._update_mapping()
+            if self.local_index is not None and (
+                not len(self.local_index) or self.local_index.dimension != self.embedding_dimension
+            ):
+                self.start_local_backfill()
+            return
+
         if await self.es.indices.exists(index=self.index):
+            # Legacy unversioned index: keep serving it until a rebuild migrates it
+            print(f"Index {self.index} is not versioned; POST /rebuild to migrate it")
+            await self._load_index_meta()
+            await self._update_mapping()
+            if self.local_index is not None and (
+                not len(self.local_index) or self.local_index.dimension != self.embedding_dimension
+            ):
+                self.start_local_backfill()
             return
 
+        await self.create_index(self.versioned_name(1), with_alias=True)
+
+    async def create_index(
+        self,
+        name: str,
+        with_alias: bool = False,
+        embedding_service: Optional["EmbeddingService"] = None,
+    ):
+        """
+        Create a physical index with the current mappings.
+
+        Args:
+            name: Physical index name
+            with_alias: Make it the alias' write index right away
+            embedding_service: Model the index will hold embeddings of
+                (default: the configured model)
+
+        Raises:
+            RuntimeError: If the cluster is too old for ``settings.vector_storage``
+        """
+        await self._check_vector_storage()
         # Index mapping with dense vector
-        mapping = {
-            "mappings": {
-                "properties": {
-                    "title": {"type": "text", "analyzer": "standard"},
-                    "content": {"type": "text", "analyzer": "standard"},
-                    "embedding": {
-                        "type": "dense_vector",
-                        "dims": settings.embedding_dimension,
-                        "index": True,
-                        "similarity": "cosine",
+        mapping: Dict[str, Any] = {
+            "settings": {
+                "number_of_shards": settings.elasticsearch_shards,
+                "analysis": LOG_ANALYSIS,
+            },
+            "mappings": self.index_mappings(embedding_service),
+        }
+        if with_alias:
+            mapping["aliases"] = {self.index: {"is_write_index": True}}
+
+        await self.es.indices.create(index=name, body=mapping)
+        print(f"Created index: {name}")
+
+    async def _check_vector_storage(self):
+        """Fail clearly if the cluster cannot map ``settings.vector_storage``."""
+        required = VECTOR_STORAGE_MIN_VERSION[settings.vector_storage]
+        number = (await self.es.info())["version"]["number"]
+        version = tuple(int(part) for part in re.findall(r"\d+", number)[:2])
+        if version < required:
+            raise RuntimeError(
+                f"VECTOR_STORAGE={settings.vector_storage} needs Elasticsearch >= "
+                f"{'.'.join(map(str, required))}, but the cluster runs {number}"
+            )
+
+    def versioned_name(self, version: int) -> str:
+        """Physical index name for a version."""
+        return f"{self.index}_v{version}"
+
+    async def current_index(self) -> str:
+        """
+        Resolve the physical index currently behind the alias.
+
+        Returns:
+            Physical index name (the alias name itself for a legacy index)
+        """
+        if not await self.es.indices.exists_alias(name=self.index):
+            return self.index
+        aliases = await self.es.indices.get_alias(name=self.index)
+        for name, info in aliases.items():
+            if info["aliases"][self.index].get("is_write_index", True):
+                return name
+        return next(iter(aliases))
+
+    async def next_index_name(self) -> str:
+        """Name for the next physical index version."""
+        existing = await self.es.indices.get(index=f"{self.index}_v*", allow_no_indices=True)
+        pattern = re.compile(rf"^{re.escape(self.index)}_v(\d+)$")
+        versions = [int(m.group(1)) for m in map(pattern.match, existing) if m]
+        return self.versioned_name(max(versions, default=0) + 1)
+
+    async def swap_alias(self, new_index: str) -> str:
+        """
+        Atomically point the alias at a new physical index.
+
+        A legacy unversioned index that has the alias' name is removed in
+        the same request, since an alias cannot share a name with an index.
+
+        Queries are embedded with the new index's model (from its
+        ``_meta``) as soon as the alias points at it.
+
+        Args:
+            new_index: Physical index to serve from now on
+
+        Returns:
+            Previous physical index
+        """
+        old_index = await self.current_index()
+        meta = await self._index_meta(new_index)
+        if old_index == self.index:
+            actions = [{"remove_index": {"index": old_index}}]
+        else:
+            actions = [{"remove": {"index": old_index, "alias": self.index}}]
+        actions.append({"add": {"index": new_index, "alias": self.index, "is_write_index": True}})
+        await self.es.indices.update_aliases(actions=actions)
+        previous_model = self.embedding_model_version
+        self._apply_index_meta(meta)
+        self._bump_generation()
+        print(f"Alias {self.index}: {old_index} -> {new_index}")
+        if self.embedding_model_version != previous_model:
+            print(f"Queries now use {self.embedding_model_version} (was {previous_model})")
+        if self.local_index is not None:
+            # The new index may carry re-embedded vectors; reload the replica from it
+            self.start_local_backfill(reset=True)
+        return old_index
+
+    def start_local_backfill(self, reset: bool = False):
+        """
+        Load the local index from Elasticsearch in the background.
+
+        Args:
+            reset: Drop the local index contents first
+        """
+        if self._local_backfill and not self._local_backfill.done():
+            self._local_backfill.cancel()
+        if reset or self.local_index.dimension != self.embedding_dimension:
+            self.local_index.clear(self.embedding_dimension)
+        self._local_backfill = asyncio.create_task(self._backfill_local_index())
+
+    async def _backfill_local_index(self):
+        """Copy every document (with its embedding) into the local index."""
+        count = 0
+        try:
+            async for hit in self.scan_documents(source=True):
+                source = hit["_source"]
+                if source.get("embedding") is None:
+                    continue
+                self.local_index.upsert(hit["_id"], source)
+                count += 1
+            self.local_index.flush()
+            print(f"Local index loaded {count} documents from {self.index}")
+        except (TransportError, ApiError) as e:
+            print(f"Local index backfill stopped after {count} documents: {e}")
+
+    def start_dual_write(self, target: str, embedding_model: Optional[str] = None):
+        """
+        Mirror every write into ``target`` until ``stop_dual_write``.
+
+        Args:
+            target: Physical index being rebuilt
+            embedding_model: Model version the target holds embeddings of
+                (default: the serving model)
+        """
+        self.rebuild_target = target
+        self.rebuild_model = embedding_model or self.embedding_model_version
+        # The target was created with the configured routing (see index_mappings)
+        self.rebuild_routing = settings.tenant_routing
+        self._rebuild_dirty = set()
+        self._rebuild_deleted = set()
+        self._ended_target = None
+
+    def stop_dual_write(self):
+        """
+        Stop mirroring writes.
+
+        Mirror writes built before this point and not sent yet are dropped:
+        after a swap they duplicate the alias write, after a failed rebuild
+        their target is gone.
+        """
+        self._ended_target = self.rebuild_target
+        self.rebuild_target = None
+        self.rebuild_model = None
+
+    @asynccontextmanager
+    async def hold_writes(self) -> AsyncIterator[None]:
+        """
+        Hold writes to the alias and wait until none is in flight.
+
+        Bulk streams send the actions they have buffered and pause before
+        their next alias write until the block exits, so nothing written
+        through the alias reaches Elasticsearch in the meantime. Writes
+        streamed with ``bypass_hold`` (the rebuild's own) go on. Used to
+        reconcile and swap a rebuild without losing writes.
+        """
+        self._writes_held.set()
+        self._writes_released.clear()
+        try:
+            await self._writes_drained.wait()
+            yield
+        finally:
+            self._writes_held.clear()
+            self._writes_released.set()
+
+    def _mirrors(self, doc_id: str, embedding_model: Optional[str]) -> bool:
+        """
+        Whether a write is mirrored into the rebuild target as is.
+
+        When the rebuild re-embeds with another model, vectors of the
+        serving model do not belong in the target; the document is flagged
+        instead and re-embedded when the rebuild reconciles.
+        """
+        if not self.rebuild_target:
+            return False
+        if (embedding_model or self.embedding_model_version) != self.rebuild_model:
+            self._rebuild_dirty.add(doc_id)
+            return False
+        return True
+
+    def mark_rebuild_dirty(self, doc_id: str):
+        """Flag a document whose dual write must be reconciled before the swap."""
+        if self.rebuild_target:
+            self._rebuild_dirty.add(doc_id)
+
+    def take_rebuild_changes(self) -> Tuple[Set[str], Set[str]]:
+        """
+        Return and reset IDs touched during a rebuild that need reconciling.
+
+        Returns:
+            Tuple of (partially updated IDs, deleted IDs)
+        """
+        dirty, deleted = self._rebuild_dirty, self._rebuild_deleted
+        self._rebuild_dirty, self._rebuild_deleted = set(), set()
+        return dirty, deleted
+
+    def is_mirror_result(self, index_name: Optional[str]) -> bool:
+        """Whether a bulk result belongs to a dual write (not reported to callers)."""
+        return self.rebuild_target is not None and index_name == self.rebuild_target
+
+    def index_mappings(
+        self,
+        embedding_service: Optional["EmbeddingService"] = None,
+        log_analysis: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Build the index mappings.
+
+        The ``_meta`` records the embedding model, which is what queries
+        against the index are embedded with, whether documents are routed by
+        tenant and whether the log-aware analyzers are set up.
+
+        With ``log_analysis``, ``title`` and ``content`` get a ``log``
+        subfield split on case changes, dots and other delimiters (see
+        ``app.services.log_parsing``), ``error_codes`` are normalized
+        keywords and ``log_paths`` match by directory prefix and by file name
+        suffix. Those need the analyzers of ``LOG_ANALYSIS`` in the index
+        settings, which can only be set when an index is created.
+
+        Args:
+            embedding_service: Model the index holds embeddings of (default:
+                the configured model)
+            log_analysis: Map the log-aware fields
+        """
+        if embedding_service is not None:
+            model, backend = embedding_service.model_name, embedding_service.backend
+            dimension = embedding_service.get_dimension()
+        else:
+            model, backend = settings.embedding_model, settings.embedding_backend
+            dimension = settings.embedding_dimension
+        return {
+            "_meta": {
+                "embedding_model": model,
+                "embedding_backend": backend,
+                "embedding_model_version": model_version(model, backend),
+                "embedding_dimension": dimension,
+                "vector_storage": settings.vector_storage,
+                "tenant_routing": settings.tenant_routing,
+                "log_analysis": log_analysis,
+            },
+            "properties": {
+                **self._text_mappings(log_analysis),
+                # Shortened content returned with results (not searchable)
+                "summary": {"type": "text", "index": False},
+                **self._vector_mappings(dimension),
+                "metadata": {
+                    "type": "object",
+                    "properties": {
+                        name: {"type": "keyword", "ignore_above": 256}
+                        for name in METADATA_KEYWORD_FIELDS
                     },
-                    "metadata": {"type": "object", "enabled": True},
-                    "source": {"type": "keyword"},
-                    "url": {"type": "keyword"},
-                    "tags": {"type": "keyword"},
-                    "indexed_at": {"type": "date"},
-                }
+                },
+                "source": {"type": "keyword"},
+                "url": {"type": "keyword"},
+                "tags": {"type": "keyword"},
+                # Repository or team owning the document (see app.services.tenants)
+                "tenant": {"type": "keyword"},
+                "indexed_at": {"type": "date"},
+                # Change detection
+                "content_hash": {"type": "keyword"},
+                "metadata_hash": {"type": "keyword"},
+                "embedding_model": {"type": "keyword"},
+                # Near-duplicate detection (see app.services.dedup)
+                "simhash": {"type": "keyword", "index": False},
+                "simhash_bands": {"type": "keyword"},
+                "cluster_id": {"type": "keyword"},
+                "occurrences": {"type": "integer"},
+                "duplicate_ids": {"type": "keyword"},
+                "last_seen": {"type": "date"},
             }
         }
 
-        await self.es.indices.create(index=self.index, body=mapping)
-        print(f"Created index: {self.index}")
+    def _text_mappings(self, log_analysis: bool) -> Dict[str, Any]:
+        """Build the mappings of the keyword-searched fields."""
+        if not log_analysis:
+            return {
+                "title": {"type": "text", "analyzer": "standard"},
+                "content": {"type": "text", "analyzer": "standard"},
+                "error_codes": {"type": "keyword"},
+                "log_paths": {"type": "keyword"},
+            }
+        log_subfield = {
+            "log": {"type": "text", "analyzer": "log_text", "search_analyzer": "log_text_search"}
+        }
+        return {
+            "title": {"type": "text", "analyzer": "standard", "fields": log_subfield},
+            "content": {"type": "text", "analyzer": "standard", "fields": log_subfield},
+            "error_codes": {"type": "keyword", "normalizer": "error_code"},
+            "log_paths": {
+                "type": "text",
+                "analyzer": "log_path",
+                "search_analyzer": "keyword",
+                "fields": {
+                    "suffix": {
+                        "type": "text",
+                        "analyzer": "log_path_suffix",
+                        "search_analyzer": "keyword",
+                    },
+                },
+            },
+        }
+
+    def _vector_mappings(self, dimension: int) -> Dict[str, Any]:
+        """
+        Build the vector field mappings for ``settings.vector_storage``.
+
+        - float: float32 HNSW vectors (queried with exact script_score);
+          the HNSW type is explicit, since Elasticsearch >= 8.14 otherwise
+          defaults to int8_hnsw
+        - int8_hnsw: HNSW graph over int8-quantized vectors; the float
+          vectors stay on disk for rescoring
+        - binary: 1 bit per dimension in ``embedding_bits`` for candidate
+          generation, float vectors kept unindexed for rescoring
+        """
+        embedding = {
+            "type": "dense_vector",
+            "dims": dimension,
+            "index": True,
+            "similarity": "cosine",
+            "index_options": {"type": "hnsw"},
+        }
+        if settings.vector_storage == "int8_hnsw":
+            embedding["index_options"] = {"type": "int8_hnsw"}
+        elif settings.vector_storage == "binary":
+            return {
+                "embedding": {
+                    "type": "dense_vector",
+                    "dims": dimension,
+                    "index": False,
+                },
+                "embedding_bits": {
+                    "type": "dense_vector",
+                    "element_type": "bit",
+                    "dims": dimension,
+                    "index": True,
+                    "similarity": "l2_norm",
+                },
+            }
+        return {"embedding": embedding}
+
+    async def _update_mapping(self):
+        """Add new non-vector fields to an existing index mapping."""
+        properties = {
+            name: field
+            for name, field in self.index_mappings(
+                log_analysis=self.log_analysis
+            )["properties"].items()
+            if field.get("type") != "dense_vector"
+        }
+        try:
+            await self.es.indices.put_mapping(index=self.index, body={"properties": properties})
+            return
+        except ApiError:
+            pass
+
+        # Some field conflicts with the existing mapping (e.g. a metadata field
+        # that was mapped dynamically as text); apply the others one by one
+        for name, field in properties.items():
+            body = {"properties": {name: field}}
+            try:
+                await self.es.indices.put_mapping(index=self.index, body=body)
+            except ApiError as e:
+                print(f"Could not update mapping of {self.index}.{name} (rebuild to apply): {e}")
+
+    async def _index_meta(self, name: str) -> Dict[str, Any]:
+        """The ``_meta`` of a physical index (empty for indices created without one)."""
+        mapping = await self.es.indices.get_mapping(index=name)
+        return next(iter(mapping.values()))["mappings"].get("_meta", {})
+
+    def _apply_index_meta(self, meta: Dict[str, Any]):
+        """Serve with the embedding model and routing recorded in an index's ``_meta``."""
+        self.embedding_model = meta.get("embedding_model", settings.embedding_model)
+        self.embedding_backend = meta.get("embedding_backend", settings.embedding_backend)
+        self.embedding_dimension = meta.get("embedding_dimension", settings.embedding_dimension)
+        # Indices created before tenant routing route by document ID
+        self.tenant_routing = meta.get("tenant_routing", False)
+        self.log_analysis = meta.get("log_analysis", False)
+
+    async def _load_index_meta(self):
+        """Adopt the live index's embedding model and warn about configuration drift."""
+        name = await self.current_index()
+        meta = await self._index_meta(name)
+        self._apply_index_meta(meta)
+        configured = model_version(settings.embedding_model, settings.embedding_backend)
+        if self.embedding_model_version != configured:
+            print(
+                f"Index {name} holds {self.embedding_model_version} embeddings but "
+                f"{configured} is configured; queries use {self.embedding_model_version} "
+                f"until POST /migrate"
+            )
+        if meta.get("vector_storage", "float") != settings.vector_storage:
+            print(
+                f"Index {name} uses {meta.get('vector_storage', 'float')} vector storage but "
+                f"{settings.vector_storage} is configured; POST /rebuild to migrate"
+            )
+        if self.tenant_routing != settings.tenant_routing:
+            print(
+                f"Index {name} is {'' if self.tenant_routing else 'not '}routed by tenant but "
+                f"tenant_routing={settings.tenant_routing} is configured; POST /rebuild to migrate"
+            )
+        if not self.log_analysis:
+            print(
+                f"Index {name} has no log-aware analyzers; keyword search uses the standard "
+                f"analyzer until POST /rebuild"
+            )
 
     async def index_document(
         self,
         doc_id: str,
         title: str,
         content: str,
-        embedding: List[float],
+        embedding: Sequence[float],
         metadata: Optional[Dict[str, Any]] = None,
+        embedding_model: Optional[str] = None,
+        tenant: Optional[str] = None,
     ) -> bool:
         """
         Index a single document.
@@ -71,149 +733,626 @@ class SearchService:
             content: Document content
             embedding: Embedding vector
             metadata: Optional metadata
+            embedding_model: Model version that produced the embedding
+            tenant: Repository or team owning the document (default: shared)
             
         Returns:
             True if indexed successfully
         """
-        from datetime import datetime
-
-        doc = {
-            "title": title,
-            "content": content,
-            "embedding": embedding,
-            "metadata": metadata or {},
-            "source": metadata.get("source", "unknown") if metadata else "unknown",
-            "url": metadata.get("url", "") if metadata else "",
-            "tags": metadata.get("tags", []) if metadata else [],
-            "indexed_at": datetime.utcnow().isoformat(),
-        }
+        doc = self.build_source(
+            title, content, embedding, metadata, embedding_model, cluster_id=doc_id,
+            tenant=tenant,
+        )
 
-        result = await self.es.index(index=self.index, id=doc_id, document=doc)
+        if self.local_index is not None:
+            self.local_index.upsert(doc_id, doc)
+        result = await self.es.index(
+            index=self.index, id=doc_id, document=doc, routing=self.shard_routing(doc["tenant"])
+        )
+        self._bump_generation()
+        if self._mirrors(doc_id, doc["embedding_model"]):
+            await self.es.index(
+                index=self.rebuild_target,
+                id=doc_id,
+                document=doc,
+                routing=self.shard_routing(doc["tenant"], self.rebuild_target),
+            )
         return result["result"] in ["created", "updated"]
 
     async def index_batch(
         self,
-        documents: List[Dict[str, Any]],
+        documents: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        embedding_service: Optional["EmbeddingService"] = None,
     ) -> tuple[int, int]:
         """
         Index multiple documents in bulk.
-        
+
+        Documents flow through an ``IndexingPipeline``: documents without an
+        ``embedding`` are embedded in micro-batches while earlier batches are
+        being written, so memory stays bounded by the pipeline queues rather
+        than the size of ``documents``.
+
         Args:
-            documents: List of documents with id, title, content, embedding, metadata
-            
+            documents: Documents with id, title, content, metadata and
+                optionally a precomputed embedding
+            embedding_service: Service used to embed documents that have no
+                embedding (required if any document lacks one)
+
+        Returns:
+            Tuple of (success_count, error_count); unchanged documents that
+            were skipped count as successes
+        """
+        from app.services.pipeline import IndexingPipeline
+
+        success, errors = 0, 0
+        async for ok, _ in IndexingPipeline(embedding_service, self).run(documents):
+            if ok:
+                success += 1
+            else:
+                errors += 1
+        return success, errors
+
+    async def stream_bulk(
+        self,
+        actions: AsyncIterable[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        max_chunk_bytes: Optional[int] = None,
+        bypass_hold: bool = False,
+    ) -> AsyncIterator[Tuple[bool, Dict[str, Any]]]:
+        """
+        Stream bulk actions to Elasticsearch, yielding one result per action.
+
+        Actions are pulled lazily, one bulk request at a time, so the
+        producer is only drained as fast as Elasticsearch accepts writes.
+        Actions targeting the alias are also applied to the local index.
+
+        Index actions targeting the alias are checked against the serving
+        model as they are sent rather than when they were built: a document
+        embedded before a cut-over to another model is re-embedded with the
+        new one. While writes are held (see ``hold_writes``) the stream
+        pauses before its next alias write.
+
+        Args:
+            actions: Async iterable of bulk actions (see ``build_action``)
+            chunk_size: Documents per bulk request (default from settings)
+            max_chunk_bytes: Bytes per bulk request (default from settings)
+            bypass_hold: Keep writing while writes are held (only for
+                writes to a rebuild target)
+
+        Yields:
+            Tuples of (ok, item) as returned by ``async_streaming_bulk``
+        """
+        reader = _ActionReader(actions)
+        counter = {"sent": 0, "done": 0}
+        try:
+            while not reader.exhausted:
+                segment = self._bulk_segment(reader, counter, bypass_hold)
+                async for ok, item in self._bulk(segment, chunk_size, max_chunk_bytes):
+                    counter["done"] += 1
+                    if not bypass_hold:
+                        self._write_done()
+                    self._bump_generation()
+                    yield ok, item
+                if not reader.exhausted:
+                    await self._writes_released.wait()
+        finally:
+            await reader.close()
+            if not bypass_hold:
+                # Actions whose results will never be read
+                for _ in range(counter["sent"] - counter["done"]):
+                    self._write_done()
+
+    async def _bulk_segment(
+        self,
+        reader: _ActionReader,
+        counter: Dict[str, int],
+        bypass_hold: bool,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Actions for one ``async_streaming_bulk`` call, up to the next hold.
+
+        Ending the segment makes the bulk helper send what it has buffered,
+        so held writes never wait on a half-filled request.
+        """
+        stop = None if bypass_hold else self._writes_held
+        while True:
+            action = await reader.next(stop)
+            if action is None:
+                return
+            index = action.get("_index")
+            if index is not None and index == self._ended_target:
+                continue
+            if index == self.index and not bypass_hold and self._writes_held.is_set():
+                reader.push_back(action)
+                return
+            if not bypass_hold:
+                self._writes_in_flight += 1
+                self._writes_drained.clear()
+            counter["sent"] += 1
+            if index == self.index:
+                action = await self._with_serving_model(action)
+                if self.local_index is not None:
+                    self.local_index.apply(action)
+            yield action
+
+    def _bulk(
+        self,
+        actions: AsyncIterable[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        max_chunk_bytes: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[bool, Dict[str, Any]]]:
+        """Send actions with ``async_streaming_bulk``, reporting errors per action."""
+        return async_streaming_bulk(
+            self.es,
+            actions,
+            chunk_size=chunk_size or settings.bulk_chunk_size,
+            max_chunk_bytes=max_chunk_bytes or settings.bulk_max_chunk_bytes,
+            raise_on_error=False,
+            raise_on_exception=False,
+        )
+
+    def _write_done(self):
+        """Record the result of a bulk action counted as in flight."""
+        self._writes_in_flight -= 1
+        if self._writes_in_flight <= 0:
+            self._writes_in_flight = 0
+            self._writes_drained.set()
+
+    async def _with_serving_model(self, action: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Re-embed an alias write built with a model the alias no longer serves.
+
+        Writers embed documents before they are sent; if the index was cut
+        over to another model in between, the vector would not match the
+        new index.
+        """
+        source = action.get("_source")
+        if source is None or source.get("embedding_model") in (
+            None, self.embedding_model_version
+        ):
+            return action
+        embedding_service = await self.aembedding_service()
+        doc = {"id": action["_id"], **source}
+        doc["embedding"] = await embedding_service.aembed_text(
+            f"{source.get('title', '')} {source.get('content', '')}"
+        )
+        doc["embedding_model"] = embedding_service.model_version
+        rebuilt = self.build_action(doc)
+        if "_op_type" in action:
+            rebuilt["_op_type"] = action["_op_type"]
+        return rebuilt
+
+    async def get_fingerprints(
+        self,
+        doc_ids: List[str],
+        tenants: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch change-detection fields for existing documents.
+
+        Args:
+            doc_ids: Document IDs to look up
+            tenants: Tenant of each document, needed to find documents of an
+                index routed by tenant (default: shared)
+
+        Returns:
+            Mapping of document ID to its content_hash, metadata_hash,
+            embedding_model and cluster_id (missing documents are omitted)
+        """
+        if not doc_ids:
+            return {}
+        tenants = tenants or [SHARED_TENANT] * len(doc_ids)
+        docs = []
+        for doc_id, tenant in zip(doc_ids, tenants):
+            routing = self.shard_routing(tenant)
+            docs.append({"_id": doc_id, **({"routing": routing} if routing else {})})
+        result = await self.es.mget(
+            index=self.index,
+            docs=docs,
+            _source=["content_hash", "metadata_hash", "embedding_model", "cluster_id"],
+        )
+        return {
+            doc["_id"]: doc.get("_source", {})
+            for doc in result["docs"]
+            if doc.get("found")
+        }
+
+    async def get_documents(
+        self,
+        doc_ids: List[str],
+        index: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch full stored documents by ID.
+
+        Looked up with an ``ids`` query rather than ``mget``, so documents
+        are found whichever shard their tenant routes them to. Like any
+        search, it only sees writes after a refresh.
+
+        Args:
+            doc_ids: Document IDs
+            index: Index to read (default: the alias)
+
         Returns:
-            Tuple of (success_count, error_count)
+            Mapping of document ID to ``_source`` (missing documents are omitted)
         """
-        from datetime import datetime
+        if not doc_ids:
+            return {}
+        return {
+            hit["_id"]: hit["_source"]
+            async for hit in self.scan_documents(
+                {"ids": {"values": doc_ids}}, source=True, index=index
+            )
+        }
 
+    async def scan_documents(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        source: Union[None, bool, List[str], Dict[str, Any]] = None,
+        index: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all documents matching a query.
+
+        Args:
+            query: Elasticsearch query (default: match_all)
+            source: ``_source`` filter (default: everything but the embedding)
+            index: Index to scan (default: the alias)
+
+        Yields:
+            Raw Elasticsearch hits
+        """
+        async for hit in async_scan(
+            self.es,
+            index=index or self.index,
+            query={"query": query or {"match_all": {}}},
+            _source=source if source is not None else {"excludes": ["embedding"]},
+        ):
+            yield hit
+
+    async def count_documents(self, query: Optional[Dict[str, Any]] = None) -> int:
+        """Count documents matching a query."""
+        result = await self.es.count(index=self.index, query=query or {"match_all": {}})
+        return result["count"]
+
+    def write_actions(self, doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Build bulk index actions for a document, including dual writes.
+
+        Args:
+            doc: Document with id, title, content, embedding, metadata and
+                optionally embedding_model
+
+        Returns:
+            Bulk actions (one per write target)
+        """
+        actions = [self.build_action(doc)]
+        if self._mirrors(doc["id"], doc.get("embedding_model")):
+            actions.append(self.build_action(doc, index=self.rebuild_target))
+        return actions
+
+    def update_actions(self, doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build metadata-only update actions for a document, including dual writes."""
+        actions = [self.build_update_action(doc)]
+        if self.rebuild_target:
+            # The rebuild may not have copied this document yet; reconciled at the end
+            self._rebuild_dirty.add(doc["id"])
+            actions.append(self.build_update_action(doc, index=self.rebuild_target))
+        return actions
+
+    def partial_update_actions(
+        self,
+        doc_id: str,
+        fields: Dict[str, Any],
+        tenant: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Build partial-update actions setting ``fields``, including dual writes."""
         actions = []
-        for doc in documents:
-            action = {
-                "_index": self.index,
-                "_id": doc["id"],
-                "_source": {
-                    "title": doc["title"],
-                    "content": doc["content"],
-                    "embedding": doc["embedding"],
-                    "metadata": doc.get("metadata", {}),
-                    "source": doc.get("metadata", {}).get("source", "unknown"),
-                    "url": doc.get("metadata", {}).get("url", ""),
-                    "tags": doc.get("metadata", {}).get("tags", []),
-                    "indexed_at": datetime.utcnow().isoformat(),
-                },
-            }
-            actions.append(action)
+        for index in filter(None, [self.index, self.rebuild_target]):
+            action = {"_op_type": "update", "_index": index, "_id": doc_id, "doc": fields}
+            actions.append(self._with_routing(action, tenant or SHARED_TENANT, index))
+        if self.rebuild_target:
+            self._rebuild_dirty.add(doc_id)
+        return actions
+
+    def delete_actions(self, doc_id: str, tenant: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Build delete actions for a document, including dual writes."""
+        actions = [self.build_delete_action(doc_id, tenant=tenant)]
+        if self.rebuild_target:
+            self._rebuild_deleted.add(doc_id)
+            actions.append(
+                self.build_delete_action(doc_id, index=self.rebuild_target, tenant=tenant)
+            )
+        return actions
+
+    def build_action(self, doc: Dict[str, Any], index: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build a bulk index action for a document.
+
+        Args:
+            doc: Document with id, title, content, embedding, metadata and
+                optionally embedding_model, simhash, cluster_id and merge counts
+            index: Target index (default: the alias)
+
+        Returns:
+            Bulk index action
+        """
+        source = self.build_source(
+            doc["title"],
+            doc["content"],
+            doc["embedding"],
+            doc.get("metadata"),
+            doc.get("embedding_model"),
+            doc.get("indexed_at"),
+            cluster_id=doc.get("cluster_id") or doc["id"],
+            fingerprint=doc.get("simhash"),
+            tenant=tenant_of(doc),
+        )
+        source.update({field: doc[field] for field in MERGE_FIELDS if doc.get(field)})
+        action = {"_index": index or self.index, "_id": doc["id"], "_source": source}
+        return self._with_routing(action, source["tenant"], index)
+
+    def build_update_action(
+        self,
+        doc: Dict[str, Any],
+        index: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build a bulk partial-update action that refreshes metadata only.
+
+        Used when the embedded text is unchanged, so the stored embedding
+        can be kept.
+
+        Args:
+            doc: Document with id and metadata
+            index: Target index (default: the alias)
+
+        Returns:
+            Bulk update action
+        """
+        metadata = doc.get("metadata") or {}
+        action = {
+            "_op_type": "update",
+            "_index": index or self.index,
+            "_id": doc["id"],
+            "doc": {
+                "metadata": metadata,
+                "source": metadata.get("source", "unknown"),
+                "url": metadata.get("url", ""),
+                "tags": metadata.get("tags", []),
+                "metadata_hash": metadata_hash(metadata),
+                "indexed_at": datetime.utcnow().isoformat(),
+            },
+        }
+        return self._with_routing(action, tenant_of(doc), index)
+
+    def build_delete_action(
+        self,
+        doc_id: str,
+        index: Optional[str] = None,
+        tenant: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build a bulk delete action (``tenant`` locates the document's shard)."""
+        action = {"_op_type": "delete", "_index": index or self.index, "_id": doc_id}
+        return self._with_routing(action, tenant or SHARED_TENANT, index)
+
+    def shard_routing(self, tenant: str, index: Optional[str] = None) -> Optional[str]:
+        """
+        Routing key of a tenant's documents in ``index`` (default: the alias).
+
+        None for indices that route by document ID.
+        """
+        if index is not None and index == self.rebuild_target:
+            routed = self.rebuild_routing
+        else:
+            routed = self.tenant_routing
+        return tenant if routed else None
+
+    def _with_routing(
+        self,
+        action: Dict[str, Any],
+        tenant: str,
+        index: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Add the tenant's routing key to a bulk action, if ``index`` is routed."""
+        routing = self.shard_routing(tenant, index)
+        if routing:
+            action["_routing"] = routing
+        return action
+
+    def _search_routing(self, filters: Optional[Dict[str, Any]]) -> Optional[str]:
+        """
+        Shards a search needs to query: those of the tenants it is scoped to.
 
-        success, errors = await async_bulk(self.es, actions, raise_on_error=False)
-        return success, len(errors)
+        Searches without a tenant filter (or against an index that is not
+        routed by tenant) query every shard.
+        """
+        tenants = filter_tenants(filters)
+        if not tenants or not self.tenant_routing:
+            return None
+        return ",".join(tenants)
+
+    def build_source(
+        self,
+        title: str,
+        content: str,
+        embedding: Sequence[float],
+        metadata: Optional[Dict[str, Any]] = None,
+        embedding_model: Optional[str] = None,
+        indexed_at: Optional[str] = None,
+        cluster_id: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+        tenant: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build the stored ``_source`` for a document."""
+        metadata = metadata or {}
+        fingerprint = fingerprint or simhash(f"{title} {content}")
+        source = {
+            "title": title,
+            "content": content,
+            "summary": make_summary(content),
+            "embedding": embedding,
+            "metadata": metadata,
+            "source": metadata.get("source", "unknown"),
+            "url": metadata.get("url", ""),
+            "tags": metadata.get("tags", []),
+            "tenant": tenant or SHARED_TENANT,
+            "indexed_at": indexed_at or datetime.utcnow().isoformat(),
+            "content_hash": content_hash(title, content),
+            "metadata_hash": metadata_hash(metadata),
+            "embedding_model": embedding_model or self.embedding_model_version,
+            "simhash": fingerprint,
+            "simhash_bands": simhash_bands(fingerprint),
+            **log_fields(title, content),
+        }
+        if cluster_id:
+            source["cluster_id"] = cluster_id
+        if settings.vector_storage == "binary":
+            source["embedding_bits"] = binary_quantize(embedding)
+        return source
 
     async def semantic_search(
         self,
-        query_embedding: List[float],
+        query_embedding: Sequence[float],
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
-    ) -> List[Dict[str, Any]]:
+        facets: Optional[List[str]] = None,
+        facet_size: int = 10,
+    ) -> SearchResults:
         """
         Perform semantic search using vector similarity.
         
         Args:
             query_embedding: Query embedding vector
             top_k: Number of results
-            filters: Optional metadata filters
+            filters: Optional metadata filters (see ``_build_filters``)
+            facets: Fields to count values of (see ``FACET_FIELDS``) over
+                the filtered candidates
+            facet_size: Values returned per facet
             
         Returns:
             List of search results
         """
-        # Build query
-        query = {
-            "script_score": {
-                "query": self._build_filter_query(filters) if filters else {"match_all": {}},
-                "script": {
-                    "source": "cosineSimilarity(params.query_vector, 'embedding') + 1.0",
-                    "params": {"query_vector": query_embedding},
-                },
-            }
+        if self._prefer_local():
+            return SearchResults(self.local_index.semantic_search(query_embedding, top_k, filters))
+        try:
+            result = await self.es.search(
+                index=self.index,
+                query=self._vector_query(query_embedding, top_k, filters),
+                size=top_k,
+                routing=self._search_routing(filters),
+                _source=RESULT_SOURCE_FIELDS,
+                aggs=self._build_aggs(facets, facet_size),
+            )
+        except (TransportError, ApiError) as e:
+            if not self._can_fall_back(e):
+                raise
+            return SearchResults(self.local_index.semantic_search(query_embedding, top_k, filters))
+
+        return await self._fill_summaries(self._format_results(result))
+
+    def _vector_query(
+        self,
+        query_embedding: Sequence[float],
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the semantic query for ``settings.vector_storage``.
+
+        Every mode scores with exact cosine similarity on the float vectors
+        (``cosine + 1``), so scores stay comparable across modes. Quantized
+        modes first narrow the candidates with an approximate kNN query on
+        the quantized field and only rescore those.
+        """
+        script = {
+            "source": "cosineSimilarity(params.query_vector, 'embedding') + 1.0",
+            "params": {"query_vector": query_embedding},
         }
 
-        result = await self.es.search(
-            index=self.index,
-            query=query,
-            size=top_k,
-            _source=["title", "content", "source", "url", "metadata"],
-        )
+        if settings.vector_storage == "float":
+            candidates = self._build_filter_query(filters) if filters else {"match_all": {}}
+        else:
+            num_candidates = top_k * settings.knn_candidates_factor
+            if settings.vector_storage == "binary":
+                field, vector = "embedding_bits", binary_quantize(query_embedding)
+                num_candidates *= settings.binary_rescore_oversample
+            else:
+                field, vector = "embedding", query_embedding
+
+            candidates = {
+                "knn": {
+                    "field": field,
+                    "query_vector": vector,
+                    "num_candidates": min(num_candidates, 10000),
+                }
+            }
+            if filters:
+                candidates["knn"]["filter"] = self._build_filters(filters)
 
-        return self._format_results(result)
+        return {"script_score": {"query": candidates, "script": script}}
 
     async def keyword_search(
         self,
         query: str,
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
-    ) -> List[Dict[str, Any]]:
+        facets: Optional[List[str]] = None,
+        facet_size: int = 10,
+        highlight: bool = False,
+    ) -> SearchResults:
         """
         Perform keyword search using BM25.
         
         Args:
             query: Search query
             top_k: Number of results
-            filters: Optional metadata filters
+            filters: Optional metadata filters (see ``_build_filters``)
+            facets: Fields to count values of over all keyword matches
+            facet_size: Values returned per facet
+            highlight: Return fragments of the content around matched terms
+                in each result's ``highlights``
             
         Returns:
             List of search results
         """
-        # Multi-match query
         query_body = {
             "bool": {
-                "must": [
-                    {
-                        "multi_match": {
-                            "query": query,
-                            "fields": ["title^2", "content"],
-                            "type": "best_fields",
-                        }
-                    }
-                ],
+                **self._keyword_query(query),
                 "filter": self._build_filters(filters) if filters else [],
             }
         }
 
-        result = await self.es.search(
-            index=self.index,
-            query=query_body,
-            size=top_k,
-            _source=["title", "content", "source", "url", "metadata"],
-        )
+        if self._prefer_local():
+            return SearchResults(self.local_index.keyword_search(query, top_k, filters))
+        try:
+            result = await self.es.search(
+                index=self.index,
+                query=query_body,
+                size=top_k,
+                routing=self._search_routing(filters),
+                _source=RESULT_SOURCE_FIELDS,
+                aggs=self._build_aggs(facets, facet_size),
+                highlight=self._build_highlight() if highlight else None,
+            )
+        except (TransportError, ApiError) as e:
+            if not self._can_fall_back(e):
+                raise
+            return SearchResults(self.local_index.keyword_search(query, top_k, filters))
 
-        return self._format_results(result)
+        return await self._fill_summaries(self._format_results(result))
 
     async def hybrid_search(
         self,
         query: str,
-        query_embedding: List[float],
+        query_embedding: Sequence[float],
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
         semantic_weight: float = 0.6,
-    ) -> List[Dict[str, Any]]:
+        facets: Optional[List[str]] = None,
+        facet_size: int = 10,
+        highlight: bool = False,
+    ) -> SearchResults:
         """
         Perform hybrid search combining semantic and keyword search.
         
@@ -223,15 +1362,20 @@ class SearchService:
             query: Search query
             query_embedding: Query embedding vector
             top_k: Number of results
-            filters: Optional metadata filters
+            filters: Optional metadata filters (see ``_build_filters``)
             semantic_weight: Weight for semantic search (0-1)
+            facets: Fields to count values of over all keyword matches
+            facet_size: Values returned per facet
+            highlight: Return matched-term fragments (from the keyword leg)
             
         Returns:
             List of search results ranked by combined score
         """
         # Get both result sets
         semantic_results = await self.semantic_search(query_embedding, top_k * 2, filters)
-        keyword_results = await self.keyword_search(query, top_k * 2, filters)
+        keyword_results = await self.keyword_search(
+            query, top_k * 2, filters, facets=facets, facet_size=facet_size, highlight=highlight
+        )
 
         # Merge and re-rank
         combined = {}
@@ -248,6 +1392,8 @@ class SearchService:
             doc_id = result["id"]
             if doc_id in combined:
                 combined[doc_id]["score"] += result["score"] * keyword_weight
+                if result.get("highlights"):
+                    combined[doc_id]["highlights"] = result["highlights"]
             else:
                 combined[doc_id] = {
                     **result,
@@ -256,56 +1402,222 @@ class SearchService:
 
         # Sort by combined score
         sorted_results = sorted(combined.values(), key=lambda x: x["score"], reverse=True)
-        return sorted_results[:top_k]
+        return SearchResults(sorted_results[:top_k], keyword_results.facets)
+
+    def _keyword_query(self, query: str) -> Dict[str, Any]:
+        """
+        Build the scoring clauses of a keyword query.
+
+        Without the log-aware analyzers: a multi-match on ``title`` and
+        ``content``. With them, the ``log`` subfields are matched as well
+        (so ``UserService`` finds ``com.acme.UserService.process``), and
+        error codes and file paths found in the query boost documents that
+        mention the same ones; any of the clauses may match.
+        """
+        match = {
+            "multi_match": {
+                "query": query,
+                "fields": ["title^2", "content"],
+                "type": "best_fields",
+            }
+        }
+        if not self.log_analysis:
+            return {"must": [match]}
+
+        match["multi_match"]["fields"] += ["title.log^2", "content.log"]
+        match["multi_match"]["tie_breaker"] = settings.log_match_tie_breaker
+        should: List[Dict[str, Any]] = [match]
+        codes = error_codes(query)
+        if codes:
+            should.append(
+                {"terms": {"error_codes": codes, "boost": settings.log_error_code_boost}}
+            )
+        paths = file_paths(query)
+        if paths:
+            should.append({
+                "bool": {
+                    "should": [
+                        {"terms": {"log_paths": paths}},
+                        {"terms": {"log_paths.suffix": paths}},
+                    ],
+                    "boost": settings.log_path_boost,
+                }
+            })
+        return {"should": should, "minimum_should_match": 1}
+
+    def _prefer_local(self) -> bool:
+        """Whether searches are always served by the local index."""
+        return self.local_index is not None and settings.local_index_policy == "prefer"
+
+    def _can_fall_back(self, error: Exception) -> bool:
+        """
+        Whether a failed Elasticsearch search should be served locally.
+
+        Connection errors, timeouts and server-side (5xx) errors fall back;
+        client errors (bad queries) are raised as usual.
+        """
+        if self.local_index is None:
+            return False
+        if isinstance(error, ApiError) and error.meta.status < 500:
+            return False
+        print(f"Elasticsearch unavailable, serving search from local index: {error}")
+        return True
 
     def _build_filter_query(self, filters: Dict[str, Any]) -> Dict:
         """Build Elasticsearch filter query from filters dict."""
         return {"bool": {"filter": self._build_filters(filters)}}
 
     def _build_filters(self, filters: Dict[str, Any]) -> List[Dict]:
-        """Build list of filter clauses."""
+        """
+        Build list of filter clauses.
+
+        - list value: any of the values (``terms``)
+        - dict with gt/gte/lt/lte: range, e.g. ``{"indexed_at": {"gte": "now-7d"}}``
+          (date math and an optional ``format`` are passed through)
+        - anything else: exact value (``term``)
+
+        ``tenant`` values select tenants, where ``SHARED_TENANT`` also
+        matches documents indexed without a tenant.
+        """
         filter_clauses = []
         for key, value in filters.items():
-            if isinstance(value, list):
+            if key == "tenant" and filter_tenants(filters):
+                filter_clauses.append(tenant_filter(filter_tenants(filters)))
+            elif isinstance(value, list):
                 filter_clauses.append({"terms": {key: value}})
+            elif isinstance(value, dict) and RANGE_OPERATORS & value.keys():
+                filter_clauses.append({"range": {key: value}})
             else:
                 filter_clauses.append({"term": {key: value}})
         return filter_clauses
 
-    def _format_results(self, es_result: Dict) -> List[Dict[str, Any]]:
+    def _build_aggs(
+        self,
+        facets: Optional[List[str]],
+        facet_size: int,
+    ) -> Optional[Dict[str, Any]]:
+        """Build terms aggregations for the requested facet fields."""
+        if not facets:
+            return None
+        return {field: {"terms": {"field": field, "size": facet_size}} for field in facets}
+
+    def _build_highlight(self) -> Dict[str, Any]:
+        """Build the highlight request for matched terms in the content."""
+        field = {
+            "fragment_size": settings.highlight_fragment_size,
+            "number_of_fragments": settings.highlight_fragments,
+            "no_match_size": 0,
+        }
+        fields = {"content": field}
+        if self.log_analysis:
+            # Terms only the log analyzer matched (e.g. parts of class names)
+            fields["content.log"] = field
+        return {
+            "fields": fields,
+            "pre_tags": ["<em>"],
+            "post_tags": ["</em>"],
+        }
+
+    def _format_results(self, es_result: Dict) -> SearchResults:
         """Format Elasticsearch results to standard format."""
-        results = []
+        results = SearchResults(facets={
+            field: [
+                {"value": bucket["key"], "count": bucket["doc_count"]}
+                for bucket in agg["buckets"]
+            ]
+            for field, agg in es_result.get("aggregations", {}).items()
+        })
         for hit in es_result["hits"]["hits"]:
             source = hit["_source"]
-            results.append({
+            result = {
                 "id": hit["_id"],
                 "title": source.get("title", ""),
-                "content": source.get("content", "")[:500],  # Truncate
+                # None marks documents indexed before summaries were stored
+                "content": source.get("summary"),
                 "score": hit["_score"],
                 "source": source.get("source"),
                 "url": source.get("url"),
                 "metadata": source.get("metadata", {}),
-            })
+                "cluster_id": source.get("cluster_id"),
+            }
+            if "highlight" in hit:
+                highlight = hit["highlight"]
+                result["highlights"] = highlight.get("content") or highlight.get("content.log", [])
+            results.append(result)
+        return results
+
+    async def _fill_summaries(self, results: SearchResults) -> SearchResults:
+        """
+        Summarize results of documents that have no stored summary.
+
+        Only those documents' content is fetched (by an ``ids`` query, which
+        finds them whatever their tenant routing); the summary is added to
+        the index on the next write or rebuild.
+        """
+        missing = [result["id"] for result in results if result["content"] is None]
+        if missing:
+            response = await self.es.search(
+                index=self.index,
+                query={"ids": {"values": missing}},
+                size=len(missing),
+                _source=["content"],
+            )
+            contents = {
+                hit["_id"]: hit["_source"].get("content", "")
+                for hit in response["hits"]["hits"]
+            }
+            for result in results:
+                if result["content"] is None:
+                    result["content"] = make_summary(contents.get(result["id"], ""))
         return results
 
     async def close(self):
-        """Close Elasticsearch connection."""
-        await self.es.close()
+        """Flush the local index and close the Elasticsearch client if owned."""
+        if self._local_backfill and not self._local_backfill.done():
+            self._local_backfill.cancel()
+        if self.local_index is not None:
+            self.local_index.close()
+        if self._owns_client:
+            await self.es.close()
 
 
-# Global search service instance (lazy loaded)
-_search_service: SearchService = None
+# Global search service instance (lazy loaded, or preloaded at startup)
+_search_service: Optional[SearchService] = None
+_search_service_lock = asyncio.Lock()
 
 
 async def get_search_service() -> SearchService:
     """
     Get or create global search service instance.
+
+    The service is created once: callers arriving while it is created (and
+    its index ensured) wait for that instance rather than creating their own.
     
     Returns:
         Search service instance
     """
     global _search_service
     if _search_service is None:
-        _search_service = SearchService()
-        await _search_service.ensure_index()
+        async with _search_service_lock:
+            if _search_service is None:
+                search_service = SearchService(get_es_client())
+                try:
+                    await search_service.ensure_index()
+                except Exception:
+                    await search_service.close()
+                    raise
+                _search_service = search_service
     return _search_service
+
+
+def peek_search_service() -> Optional[SearchService]:
+    """The global search service if it was created, without creating it."""
+    return _search_service
+
+
+async def close_search_service():
+    """Stop background work of the global search service, if it was created."""
+    global _search_service
+    if _search_service is not None:
+        await _search_service.close()
+        _search_service = None
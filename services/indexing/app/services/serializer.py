@@ -0,0 +1,43 @@
+"""orjson-based serializers for the Elasticsearch client."""
+
+from typing import Any, ClassVar, Dict
+
+import orjson
+from elasticsearch.serializer import JSONSerializer, NdjsonSerializer
+from elastic_transport import Serializer
+
+# Contiguous float32/float64 arrays are written straight from their buffer
+_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+
+class OrjsonSerializer(JSONSerializer):
+    """
+    JSON serializer backed by orjson with native NumPy support.
+
+    Embeddings can be passed as NumPy arrays: orjson encodes them without
+    converting to Python lists first. Anything orjson cannot handle
+    (non-contiguous arrays, Decimal, pandas types) falls back to the
+    client's default conversions.
+    """
+
+    mimetype: ClassVar[str] = "application/json"
+
+    def json_dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data, default=self.default, option=_OPTIONS)
+
+    def json_loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class OrjsonNdjsonSerializer(OrjsonSerializer, NdjsonSerializer):
+    """Newline-delimited variant used for bulk and msearch bodies."""
+
+    mimetype: ClassVar[str] = "application/x-ndjson"
+
+
+def es_serializers() -> Dict[str, Serializer]:
+    """Serializers to pass to ``AsyncElasticsearch(serializers=...)``."""
+    return {
+        OrjsonSerializer.mimetype: OrjsonSerializer(),
+        OrjsonNdjsonSerializer.mimetype: OrjsonNdjsonSerializer(),
+    }
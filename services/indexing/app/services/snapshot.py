@@ -0,0 +1,257 @@
+"""Backup and restore of the knowledge base as Parquet or Arrow snapshots."""
+
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+from app.config import settings
+from app.services.embeddings import EmbeddingService
+from app.services.search import SearchService
+
+SNAPSHOT_VERSION = "1"
+# Stored fields a snapshot keeps besides ``id``, ``metadata`` and the
+# embedding; the rest of ``_source`` (summary, hashes, error codes, paths,
+# bit vectors, ...) is derived from them again on import
+_STRING_FIELDS = [
+    "title",
+    "content",
+    "tenant",
+    "indexed_at",
+    "embedding_model",
+    "cluster_id",
+    "simhash",
+    "last_seen",
+]
+
+
+def _arrow():
+    """Import pyarrow, which only snapshots need."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Knowledge base snapshots require the 'snapshot' extra: "
+            "pip install 'indexing[snapshot]'"
+        ) from e
+    return pa, pq
+
+
+def snapshot_format(path: Path) -> str:
+    """``parquet`` for ``.parquet`` files, ``arrow`` (Arrow IPC) for ``.arrow``/``.feather``."""
+    suffix = Path(path).suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    if suffix in (".arrow", ".feather", ".ipc"):
+        return "arrow"
+    raise ValueError(f"Unknown snapshot format {suffix!r}; use .parquet or .arrow")
+
+
+def snapshot_schema(dimension: int, meta: Dict[str, str]):
+    """
+    Arrow schema of a snapshot.
+
+    Embeddings are a ``fixed_size_list<float32>[dimension]`` column, so a
+    batch of them is one contiguous buffer that converts to a NumPy matrix
+    without copying. Metadata dicts differ per document and are stored as
+    JSON.
+
+    Args:
+        dimension: Embedding dimension
+        meta: Schema metadata (model, dimension, source index, ...)
+    """
+    pa, _ = _arrow()
+    fields = [pa.field("id", pa.string(), nullable=False)]
+    fields += [pa.field(name, pa.string()) for name in _STRING_FIELDS]
+    fields += [
+        pa.field("metadata", pa.string()),
+        pa.field("occurrences", pa.int64()),
+        pa.field("duplicate_ids", pa.list_(pa.string())),
+        pa.field("embedding", pa.list_(pa.float32(), dimension), nullable=False),
+    ]
+    return pa.schema(fields, metadata=meta)
+
+
+def _record_batch(schema, docs: List[Dict[str, Any]], dimension: int):
+    """Convert stored documents (``id`` plus ``_source``) to a record batch."""
+    pa, _ = _arrow()
+    vectors = np.asarray([doc["embedding"] for doc in docs], dtype=np.float32)
+    if vectors.shape[1:] != (dimension,):
+        raise ValueError(f"Expected {dimension}-dimensional embeddings, got {vectors.shape}")
+    columns = {"id": [doc["id"] for doc in docs]}
+    for name in _STRING_FIELDS:
+        columns[name] = [doc.get(name) for doc in docs]
+    columns["metadata"] = [orjson.dumps(doc.get("metadata") or {}).decode() for doc in docs]
+    columns["occurrences"] = [doc.get("occurrences") for doc in docs]
+    columns["duplicate_ids"] = [doc.get("duplicate_ids") for doc in docs]
+    arrays = [pa.array(columns[field.name], type=field.type) for field in list(schema)[:-1]]
+    arrays.append(pa.FixedSizeListArray.from_arrays(pa.array(vectors.ravel()), dimension))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+async def export_snapshot(
+    search_service: SearchService,
+    path: Path,
+    query: Optional[Dict[str, Any]] = None,
+    batch_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Write the documents behind the alias, with their embeddings, to a snapshot.
+
+    Args:
+        search_service: Service owning the alias
+        path: Output file; ``.parquet`` or ``.arrow`` (see ``snapshot_format``)
+        query: Only export documents matching this query (default: all)
+        batch_size: Documents per record batch (default from settings)
+
+    Returns:
+        Document count, file size and the snapshot's schema metadata
+    """
+    pa, pq = _arrow()
+    path = Path(path)
+    batch_size = batch_size or settings.snapshot_batch_size
+    dimension = search_service.embedding_dimension
+    meta = {
+        "snapshot_version": SNAPSHOT_VERSION,
+        "index": await search_service.current_index(),
+        "embedding_model": search_service.embedding_model,
+        "embedding_backend": search_service.embedding_backend,
+        "embedding_model_version": search_service.embedding_model_version,
+        "embedding_dimension": str(dimension),
+        "exported_at": datetime.utcnow().isoformat(),
+    }
+    schema = snapshot_schema(dimension, meta)
+    compression = settings.snapshot_compression
+    if snapshot_format(path) == "parquet":
+        writer = pq.ParquetWriter(path, schema, compression=compression)
+    else:
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        writer = pa.ipc.new_file(str(path), schema, options=options)
+
+    count = 0
+    try:
+        batch: List[Dict[str, Any]] = []
+        async for hit in search_service.scan_documents(query, source=True):
+            batch.append({"id": hit["_id"], **hit["_source"]})
+            if len(batch) >= batch_size:
+                writer.write_batch(_record_batch(schema, batch, dimension))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_batch(_record_batch(schema, batch, dimension))
+            count += len(batch)
+    finally:
+        writer.close()
+    return {"documents": count, "bytes": path.stat().st_size, **meta}
+
+
+def read_snapshot_meta(path: Path) -> Dict[str, str]:
+    """Schema metadata of a snapshot (model, dimension, source index, ...)."""
+    return _open_snapshot(Path(path), settings.snapshot_batch_size)[0]
+
+
+def _open_snapshot(path: Path, batch_size: int) -> Tuple[Dict[str, str], int, Iterator[Any]]:
+    """
+    Schema metadata, row count and record batches of a snapshot.
+
+    Arrow files are memory-mapped, so their embeddings are read straight
+    from the page cache.
+    """
+    pa, pq = _arrow()
+    if snapshot_format(path) == "parquet":
+        parquet = pq.ParquetFile(path)
+        rows, schema = parquet.metadata.num_rows, parquet.schema_arrow
+        batches = parquet.iter_batches(batch_size=batch_size)
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(str(path)))
+        schema = reader.schema
+        rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    meta = {key.decode(): value.decode() for key, value in (schema.metadata or {}).items()}
+    return meta, rows, batches
+
+
+def _documents(batch) -> List[Dict[str, Any]]:
+    """Documents of a record batch, with the embeddings as rows of one float32 matrix."""
+    pa, _ = _arrow()
+    embedding = batch.column(batch.schema.get_field_index("embedding"))
+    vectors = embedding.flatten().to_numpy().reshape(len(batch), embedding.type.list_size)
+    names = [name for name in batch.schema.names if name != "embedding"]
+    docs = pa.Table.from_batches([batch]).select(names).to_pylist()
+    for doc, vector in zip(docs, vectors):
+        doc["title"], doc["content"] = doc["title"] or "", doc["content"] or ""
+        doc["metadata"] = orjson.loads(doc["metadata"]) if doc["metadata"] else {}
+        doc["embedding"] = vector
+    return docs
+
+
+async def import_snapshot(
+    search_service: SearchService,
+    path: Path,
+    embedding_service: Optional[EmbeddingService] = None,
+    reembed: bool = False,
+    batch_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Bulk-load a snapshot into the index behind the alias.
+
+    Stored embeddings are reused, so nothing is embedded unless ``reembed``
+    is set or a document's embeddings come from another model than the
+    serving index's (those are re-embedded, as in a rebuild). Documents
+    keep their IDs, tenants, near-duplicate clusters and merge counts;
+    existing documents with the same IDs are overwritten, others are kept.
+    Refresh is paused on the serving index while loading.
+
+    Args:
+        search_service: Service owning the alias
+        path: Snapshot written by ``export_snapshot``
+        embedding_service: Serving index's model, for re-embedding (loaded
+            only if needed)
+        reembed: Re-embed every document instead of using the stored embeddings
+        batch_size: Documents per record batch (default from settings)
+
+    Returns:
+        Counts (imported, reembedded, failed), the snapshot's metadata and timing
+    """
+    path = Path(path)
+    meta, rows, batches = _open_snapshot(path, batch_size or settings.snapshot_batch_size)
+    counts = {"documents": rows, "imported": 0, "reembedded": 0, "failed": 0}
+    serving = search_service.embedding_model_version
+
+    async def actions() -> AsyncIterator[Dict[str, Any]]:
+        nonlocal embedding_service
+        for batch in batches:
+            docs = _documents(batch)
+            stale = [doc for doc in docs if reembed or doc["embedding_model"] != serving]
+            if stale:
+                embedding_service = embedding_service or await search_service.aembedding_service()
+                texts = [f"{doc['title']} {doc['content']}" for doc in stale]
+                embeddings = await embedding_service.aembed_batch(texts)
+                for doc, vector in zip(stale, embeddings):
+                    doc["embedding"] = vector
+                    doc["embedding_model"] = serving
+                counts["reembedded"] += len(stale)
+            for doc in docs:
+                for action in search_service.write_actions(doc):
+                    yield action
+
+    index = await search_service.current_index()
+    started = time.perf_counter()
+    await search_service.es.indices.put_settings(
+        index=index, settings={"index": {"refresh_interval": "-1"}}
+    )
+    try:
+        async for ok, item in search_service.stream_bulk(actions()):
+            if next(iter(item.values()), {}).get("_index", index) != index:
+                continue  # dual write into a rebuild target
+            counts["imported" if ok else "failed"] += 1
+    finally:
+        await search_service.es.indices.put_settings(
+            index=index, settings={"index": {"refresh_interval": None}}
+        )
+        await search_service.es.indices.refresh(index=index)
+    return {**counts, "seconds": time.perf_counter() - started, "snapshot": meta}
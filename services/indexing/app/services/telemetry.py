@@ -0,0 +1,289 @@
+"""Background index telemetry served from memory and exported to Prometheus."""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from prometheus_client import CollectorRegistry, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from app.config import settings
+from app.services.es_client import client_metrics, connection_stats
+from app.services.search import get_search_service
+
+# Elasticsearch's default HNSW graph degree (``m``), for the memory estimate
+HNSW_M = 16
+
+
+def vector_memory_estimate(num_vectors: int, dims: int, vector_storage: str) -> int:
+    """
+    Off-heap memory Elasticsearch needs to keep the vector index in the page cache.
+
+    Follows the Elasticsearch tuning guide: the searched vectors (float32,
+    int8 or 1 bit per dimension) plus the HNSW graph (``4 * m`` bytes per
+    vector). Float storage is scored by brute force here, but is estimated
+    like an HNSW index, as that is how the field is mapped.
+
+    Args:
+        num_vectors: Indexed vectors (primary documents)
+        dims: Vector dimension
+        vector_storage: float, int8_hnsw or binary
+
+    Returns:
+        Estimated bytes per copy of the index (replicas need the same again)
+    """
+    if vector_storage == "binary":
+        per_vector = (dims + 7) // 8
+    elif vector_storage == "int8_hnsw":
+        per_vector = dims + 4
+    else:
+        per_vector = dims * 4
+    return num_vectors * (per_vector + 4 * HNSW_M)
+
+
+class IndexTelemetry:
+    """
+    Index statistics collected periodically in the background.
+
+    Every ``telemetry_interval_seconds`` one ``indices.stats`` and one
+    ``nodes.stats`` request refresh a snapshot of the serving index: document
+    count, store size, segment count, an estimate of the memory its vectors
+    need, and ingest and query rates over the last interval. ``/stats`` and
+    ``/metrics`` read the snapshot, so polling them costs Elasticsearch
+    nothing.
+    """
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = settings.telemetry_interval_seconds if interval is None else interval
+        self.snapshot: Dict[str, Any] = {}
+        self.collections = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        # Searches served by the API (including cache hits)
+        self.searches = 0
+        self._task: Optional[asyncio.Task] = None
+        self._previous: Optional[Dict[str, float]] = None
+
+    def record_search(self) -> None:
+        """Count a search request for the query rate."""
+        self.searches += 1
+
+    def start(self) -> None:
+        """Start collecting in the background."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background collection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.collect()
+            await asyncio.sleep(self.interval)
+
+    async def collect(self) -> Dict[str, Any]:
+        """Refresh the snapshot now; failures keep the previous snapshot."""
+        try:
+            search_service = await get_search_service()
+            physical_index = await search_service.current_index()
+            stats = await search_service.es.indices.stats(
+                index=physical_index, metric=["docs", "store", "segments", "indexing"]
+            )
+            connections = await connection_stats(search_service.es)
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            print(f"Index telemetry collection failed: {e}")
+            return self.snapshot
+
+        index_stats = stats["indices"].get(physical_index, {})
+        primaries = index_stats.get("primaries", {})
+        total = index_stats.get("total", {})
+        documents = primaries.get("docs", {}).get("count", 0)
+        now = time.monotonic()
+        counters = {
+            "time": now,
+            "indexed": primaries.get("indexing", {}).get("index_total", 0),
+            "searches": self.searches,
+        }
+
+        self.snapshot = {
+            "collected_at": datetime.utcnow().isoformat(),
+            "index": search_service.index,
+            "physical_index": physical_index,
+            "rebuild_target": search_service.rebuild_target,
+            "document_count": documents,
+            "size_bytes": total.get("store", {}).get("size_in_bytes", 0),
+            "segment_count": total.get("segments", {}).get("count", 0),
+            "embedding_model": search_service.embedding_model_version,
+            "embedding_dimension": search_service.embedding_dimension,
+            "vector_storage": settings.vector_storage,
+            "vector_memory_bytes": vector_memory_estimate(
+                documents, search_service.embedding_dimension, settings.vector_storage
+            ),
+            "indexing_total": counters["indexed"],
+            "searches_total": self.searches,
+            "ingest_docs_per_second": self._rate(counters, "indexed"),
+            "queries_per_second": self._rate(counters, "searches"),
+            "connections": connections,
+        }
+        self._previous = counters
+        self.collections += 1
+        self.last_error = None
+        return self.snapshot
+
+    def _rate(self, counters: Dict[str, float], key: str) -> Optional[float]:
+        """Per-second increase of a counter since the previous collection."""
+        if self._previous is None:
+            return None
+        elapsed = counters["time"] - self._previous["time"]
+        delta = counters[key] - self._previous[key]
+        if elapsed <= 0:
+            return None
+        # Counters of a new physical index start over after an alias swap
+        return (delta if delta >= 0 else counters[key]) / elapsed
+
+    def stats(self) -> Dict[str, Any]:
+        """The latest snapshot with its age and collection health."""
+        age = None
+        if self.snapshot:
+            collected = datetime.fromisoformat(self.snapshot["collected_at"])
+            age = (datetime.utcnow() - collected).total_seconds()
+        return {
+            **self.snapshot,
+            "age_seconds": age,
+            "interval_seconds": self.interval,
+            "collections": self.collections,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class TelemetryCollector(Collector):
+    """Prometheus collector exposing the telemetry snapshot and client metrics."""
+
+    def __init__(self, telemetry: IndexTelemetry):
+        self.telemetry = telemetry
+
+    def collect(self) -> Iterator[Any]:
+        snapshot = self.telemetry.snapshot
+        labels = ["index"]
+        index = [snapshot.get("index", settings.elasticsearch_index)]
+
+        gauges = [
+            ("document_count", "indexing_documents", "Documents in the serving index"),
+            ("size_bytes", "indexing_index_size_bytes", "Store size of the serving index"),
+            ("segment_count", "indexing_segments", "Lucene segments of the serving index"),
+            (
+                "vector_memory_bytes",
+                "indexing_vector_memory_estimate_bytes",
+                "Estimated memory needed by the vector index (per copy)",
+            ),
+            (
+                "ingest_docs_per_second",
+                "indexing_ingest_docs_per_second",
+                "Documents indexed per second over the last interval",
+            ),
+            (
+                "queries_per_second",
+                "indexing_queries_per_second",
+                "Searches served per second over the last interval",
+            ),
+        ]
+        for key, name, documentation in gauges:
+            if snapshot.get(key) is None:
+                continue
+            gauge = GaugeMetricFamily(name, documentation, labels=labels)
+            gauge.add_metric(index, snapshot[key])
+            yield gauge
+
+        connections = snapshot.get("connections", {})
+        if connections:
+            gauge = GaugeMetricFamily(
+                "indexing_es_http_connections_open",
+                "Open HTTP connections on the Elasticsearch nodes",
+            )
+            gauge.add_metric([], connections["current_open"])
+            yield gauge
+
+        counters = [
+            ("indexing_documents_indexed", "Index operations on primaries", "indexing_total"),
+            ("indexing_searches", "Searches served by the API", "searches_total"),
+        ]
+        for name, documentation, key in counters:
+            if snapshot.get(key) is None:
+                continue
+            counter = CounterMetricFamily(name, documentation, labels=labels)
+            counter.add_metric(index, snapshot[key])
+            yield counter
+
+        age = self.telemetry.stats()["age_seconds"]
+        if age is not None:
+            gauge = GaugeMetricFamily(
+                "indexing_telemetry_age_seconds", "Age of the index telemetry snapshot"
+            )
+            gauge.add_metric([], age)
+            yield gauge
+        failures = CounterMetricFamily(
+            "indexing_telemetry_failures", "Failed index telemetry collections"
+        )
+        failures.add_metric([], self.telemetry.failures)
+        yield failures
+
+        es = client_metrics.stats()
+        requests = CounterMetricFamily(
+            "indexing_es_requests", "Elasticsearch HTTP requests", labels=["outcome"]
+        )
+        requests.add_metric(["ok"], es["requests"] - es["errors"])
+        requests.add_metric(["error"], es["errors"])
+        yield requests
+        latency = GaugeMetricFamily(
+            "indexing_es_request_latency_ms",
+            "Elasticsearch request latency over recent requests",
+            labels=["quantile"],
+        )
+        for quantile in ("p50", "p95", "p99"):
+            latency.add_metric([quantile], es[f"{quantile}_ms"])
+        yield latency
+
+
+# Global telemetry instance and its Prometheus registry
+_telemetry: Optional[IndexTelemetry] = None
+_metrics_registry: Optional[CollectorRegistry] = None
+
+
+def get_telemetry() -> IndexTelemetry:
+    """
+    Get or create global telemetry instance.
+
+    Returns:
+        Telemetry instance
+    """
+    global _telemetry
+    if _telemetry is None:
+        _telemetry = IndexTelemetry()
+    return _telemetry
+
+
+async def close_telemetry():
+    """Stop the background collection, if it was started."""
+    if _telemetry is not None:
+        await _telemetry.stop()
+
+
+def prometheus_metrics() -> bytes:
+    """Render the telemetry snapshot in the Prometheus text format."""
+    global _metrics_registry
+    if _metrics_registry is None:
+        _metrics_registry = CollectorRegistry()
+        _metrics_registry.register(TelemetryCollector(get_telemetry()))
+    return generate_latest(_metrics_registry)
@@ -0,0 +1,61 @@
+"""Tenant (repository or team) partitioning helpers."""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+# Tenant of documents indexed without one; visible from every tenant scope
+SHARED_TENANT = "_shared"
+
+
+def tenant_of(doc: Dict[str, Any]) -> str:
+    """
+    Tenant a document belongs to.
+
+    Args:
+        doc: Document with an optional ``tenant`` (or ``metadata.tenant``)
+
+    Returns:
+        The tenant, or ``SHARED_TENANT`` for documents without one
+    """
+    return doc.get("tenant") or (doc.get("metadata") or {}).get("tenant") or SHARED_TENANT
+
+
+def tenant_scope(tenant: str, include_shared: bool = True) -> List[str]:
+    """
+    Tenants a search scoped to ``tenant`` may return documents of.
+
+    Args:
+        tenant: Repository or team searching
+        include_shared: Also return shared documents (runbooks, docs)
+
+    Returns:
+        Tenant values for the ``tenant`` filter
+    """
+    if include_shared and tenant != SHARED_TENANT:
+        return [tenant, SHARED_TENANT]
+    return [tenant]
+
+
+def tenant_filter(tenants: Sequence[str]) -> Dict[str, Any]:
+    """
+    Filter clause restricting results to ``tenants``.
+
+    Documents indexed before tenants were tracked have no ``tenant`` field;
+    they count as shared.
+    """
+    terms = {"terms": {"tenant": list(tenants)}}
+    if SHARED_TENANT not in tenants:
+        return terms
+    return {
+        "bool": {
+            "should": [terms, {"bool": {"must_not": {"exists": {"field": "tenant"}}}}],
+            "minimum_should_match": 1,
+        }
+    }
+
+
+def filter_tenants(filters: Optional[Dict[str, Any]]) -> Optional[List[str]]:
+    """Tenants named by the ``tenant`` entry of search filters, if any."""
+    value = (filters or {}).get("tenant")
+    if value is None or isinstance(value, dict):
+        return None
+    return value if isinstance(value, list) else [value]
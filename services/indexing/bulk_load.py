@@ -0,0 +1,412 @@
+"""
+Bulk load documents into the knowledge base through the Indexing Service.
+
+Streams documents from a JSON array or NDJSON file, sends them in batches
+to the streaming ingest endpoint (or ``/index/batch``) with bounded
+concurrency, and retries failed requests with exponential backoff. A
+checkpoint file records how far the source has been loaded so an
+interrupted run resumes where it stopped; documents get stable IDs, so
+re-sending a partly loaded batch only skips the unchanged documents.
+
+Usage:
+    python bulk_load.py sample_data.json
+    python bulk_load.py runbooks.ndjson --batch-size 200 --concurrency 8 \\
+        --checkpoint runbooks.checkpoint.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+
+INDEXING_SERVICE_URL = "http://localhost:8003"
+
+# Responses worth retrying: rate limiting and server-side errors
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class _RetryableStatus(Exception):
+    """A response that should be retried (rate limited, server error, aborted ingest)."""
+
+
+def _check_status(response: httpx.Response) -> None:
+    if response.status_code in RETRY_STATUS:
+        raise _RetryableStatus(f"HTTP {response.status_code}")
+    response.raise_for_status()
+
+
+def stable_id(document: dict) -> str:
+    """
+    Derive a stable document ID so re-runs update instead of duplicating.
+
+    The Indexing Service skips documents whose content and embedding model
+    are unchanged, so re-running a load is close to free.
+    """
+    if document.get("id"):
+        return document["id"]
+    return "kb-" + hashlib.sha1(document["title"].encode("utf-8")).hexdigest()[:16]
+
+
+def iter_documents(path: Path, chunk_size: int = 1 << 20) -> Iterator[Dict[str, Any]]:
+    """
+    Stream documents from a JSON array or NDJSON file.
+
+    The format is detected from the first non-blank character (``[`` for a
+    JSON array). Neither format is read into memory as a whole.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(chunk_size)
+        if head.lstrip().startswith("["):
+            yield from _iter_json_array(f, head, chunk_size)
+            return
+
+        buffer = head
+        while True:
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buffer += chunk
+        if buffer.strip():
+            yield json.loads(buffer)
+
+
+def _iter_json_array(f, buffer: str, chunk_size: int) -> Iterator[Dict[str, Any]]:
+    """Decode the elements of a JSON array one at a time."""
+    decoder = json.JSONDecoder()
+    buffer = buffer.lstrip()[1:]
+    eof = False
+    while True:
+        buffer = buffer.lstrip().lstrip(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            document, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield document
+        buffer = buffer[end:]
+
+
+def iter_batches(
+    documents: Iterator[Dict[str, Any]],
+    batch_size: int,
+    skip: int = 0,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Group documents into batches, skipping the first ``skip`` documents."""
+    batch: List[Dict[str, Any]] = []
+    for position, document in enumerate(documents):
+        if position < skip:
+            continue
+        batch.append({**document, "id": stable_id(document)})
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Checkpoint:
+    """
+    Position in the source up to which every document has been loaded.
+
+    Batches finish out of order under concurrency, so the position only
+    advances over a contiguous run of finished batches.
+    """
+
+    def __init__(self, path: Optional[Path], source: Path):
+        self.path = path
+        self.source = str(source)
+        self.position = 0
+        # Batch start -> size, for batches finished ahead of the position
+        self._done: Dict[int, int] = {}
+        if path and path.exists():
+            saved = json.loads(path.read_text(encoding="utf-8"))
+            if saved.get("source") == self.source:
+                self.position = saved["position"]
+
+    def finish(self, start: int, size: int) -> None:
+        """Record a loaded batch and save the checkpoint if it advanced."""
+        self._done[start] = size
+        advanced = False
+        while self.position in self._done:
+            self.position += self._done.pop(self.position)
+            advanced = True
+        if advanced and self.path:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps({"source": self.source, "position": self.position}),
+                encoding="utf-8",
+            )
+            os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        """Remove the checkpoint after a complete load."""
+        if self.path and self.path.exists():
+            self.path.unlink()
+
+
+class BulkLoader:
+    """Send document batches with bounded concurrency, retries and counters."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str = "stream",
+        concurrency: int = 4,
+        max_retries: int = 5,
+        backoff_seconds: float = 1.0,
+    ):
+        self.client = client
+        self.endpoint = endpoint
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.counts: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.error_samples: List[Dict[str, Any]] = []
+        self.retries = 0
+
+    async def run(self, batches: Iterator[List[Dict[str, Any]]], checkpoint: Checkpoint) -> None:
+        """Load all batches; failed batches hold the checkpoint back."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        started = last_report = time.perf_counter()
+
+        async def produce():
+            start = checkpoint.position
+            for batch in batches:
+                await queue.put((start, batch))
+                start += len(batch)
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def consume():
+            nonlocal last_report
+            while (item := await queue.get()) is not None:
+                start, batch = item
+                if await self._send(batch):
+                    checkpoint.finish(start, len(batch))
+                else:
+                    self.counts["failed_batches"] += 1
+
+                now = time.perf_counter()
+                if now - last_report >= 5.0:
+                    last_report = now
+                    done = self.counts["indexed"] + self.counts["skipped"] + self.counts["failed"]
+                    print(
+                        f"  {done} documents ({done / (now - started):.0f} docs/sec), "
+                        f"{self.counts['failed']} failed"
+                    )
+
+        await asyncio.gather(produce(), *(consume() for _ in range(self.concurrency)))
+
+    async def _send(self, batch: List[Dict[str, Any]]) -> bool:
+        """Send one batch, retrying transient failures. Returns whether it was accepted."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self.endpoint == "stream":
+                    counts, errors = await self._post_stream(batch)
+                else:
+                    counts, errors = await self._post_batch(batch)
+            except (httpx.TransportError, _RetryableStatus) as e:
+                if attempt == self.max_retries:
+                    self._record_error("request", str(e), [doc["id"] for doc in batch])
+                    self.counts["failed"] += len(batch)
+                    return False
+                self.retries += 1
+                delay = self.backoff_seconds * 2 ** attempt
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+                continue
+            except httpx.HTTPStatusError as e:
+                # Client errors are not retried
+                self._record_error("request", str(e), [doc["id"] for doc in batch])
+                self.counts["failed"] += len(batch)
+                return False
+
+            self.counts.update(counts)
+            for error in errors:
+                self._record_error("document", error.get("error") or "unknown", [error.get("id")])
+            return True
+        return False
+
+    async def _post_stream(self, batch: List[Dict[str, Any]]):
+        """Send a batch as NDJSON to ``/index/stream`` and read the events."""
+        body = "".join(json.dumps(doc) + "\n" for doc in batch).encode("utf-8")
+        counts: Dict[str, int] = {}
+        errors: List[Dict[str, Any]] = []
+        async with self.client.stream(
+            "POST",
+            "/index/stream",
+            content=body,
+            headers={"content-type": "application/x-ndjson"},
+        ) as response:
+            _check_status(response)
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event["event"] == "error":
+                    errors.append(event)
+                elif event["event"] == "summary":
+                    counts = {k: event[k] for k in ("indexed", "skipped", "failed")}
+                elif event["event"] == "aborted":
+                    raise _RetryableStatus(f"Ingest aborted: {event['error']}")
+        if not counts:
+            raise _RetryableStatus("Stream ended without a summary")
+        return counts, errors
+
+    async def _post_batch(self, batch: List[Dict[str, Any]]):
+        """Send a batch to ``/index/batch``."""
+        response = await self.client.post("/index/batch", json={"documents": batch})
+        _check_status(response)
+        result = response.json()
+        counts = {
+            "indexed": result["indexed_count"],
+            "skipped": result.get("skipped_count", 0),
+            "failed": result["failed_count"],
+        }
+        # The batch endpoint reports failure counts only, not which documents
+        errors = [{"error": "failed in batch"}] * result["failed_count"]
+        return counts, errors
+
+    def _record_error(self, kind: str, message: str, ids: List[Optional[str]]) -> None:
+        self.errors[f"{kind}: {message[:200]}"] += len(ids)
+        if len(self.error_samples) < 20:
+            self.error_samples.append({"kind": kind, "error": message, "ids": ids[:5]})
+
+
+async def bulk_load(
+    source: Path,
+    url: str = INDEXING_SERVICE_URL,
+    endpoint: str = "stream",
+    batch_size: int = 100,
+    concurrency: int = 4,
+    max_retries: int = 5,
+    checkpoint_path: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Load a JSON or NDJSON file into the knowledge base.
+
+    Args:
+        source: JSON array or NDJSON file of documents (title, content, metadata)
+        url: Indexing Service base URL
+        endpoint: ``stream`` (``/index/stream``) or ``batch`` (``/index/batch``)
+        batch_size: Documents per request
+        concurrency: Requests in flight
+        max_retries: Retries per request for transient failures
+        checkpoint_path: Resume from and record progress in this file
+
+    Returns:
+        Summary with counts, elapsed time, docs/sec and errors
+    """
+    checkpoint = Checkpoint(checkpoint_path, source)
+    if checkpoint.position:
+        print(f"Resuming {source} after {checkpoint.position} documents")
+
+    timeout = httpx.Timeout(300.0, connect=10.0)
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        loader = BulkLoader(client, endpoint, concurrency, max_retries)
+        started = time.perf_counter()
+        await loader.run(
+            iter_batches(iter_documents(source), batch_size, skip=checkpoint.position),
+            checkpoint,
+        )
+        elapsed = time.perf_counter() - started
+
+    if not loader.counts["failed_batches"]:
+        checkpoint.clear()
+    loaded = loader.counts["indexed"] + loader.counts["skipped"] + loader.counts["failed"]
+    return {
+        "source": str(source),
+        "indexed": loader.counts["indexed"],
+        "skipped": loader.counts["skipped"],
+        "failed": loader.counts["failed"],
+        "failed_batches": loader.counts["failed_batches"],
+        "retries": loader.retries,
+        "elapsed_seconds": elapsed,
+        "docs_per_second": loaded / elapsed if elapsed else 0.0,
+        "resume_position": checkpoint.position,
+        "errors": dict(loader.errors.most_common()),
+        "error_samples": loader.error_samples,
+    }
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    """Print load counts, throughput and the error summary."""
+    print()
+    print(f"Indexed:  {summary['indexed']}")
+    print(f"Skipped:  {summary['skipped']} (unchanged)")
+    print(f"Failed:   {summary['failed']}")
+    print(f"Retries:  {summary['retries']}")
+    print(
+        f"Elapsed:  {summary['elapsed_seconds']:.1f}s "
+        f"({summary['docs_per_second']:.1f} docs/sec)"
+    )
+    if summary["errors"]:
+        print("Errors:")
+        for message, count in summary["errors"].items():
+            print(f"  {count:>6}  {message}")
+    if summary["failed_batches"]:
+        print(
+            f"{summary['failed_batches']} batches failed; re-run to resume "
+            f"after document {summary['resume_position']}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", type=Path, help="JSON array or NDJSON file")
+    parser.add_argument("--url", default=INDEXING_SERVICE_URL, help="Indexing Service URL")
+    parser.add_argument("--endpoint", choices=["stream", "batch"], default="stream")
+    parser.add_argument("--batch-size", type=int, default=100, help="Documents per request")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries per request")
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="Checkpoint file (default: <source>.checkpoint.json)",
+    )
+    parser.add_argument("--no-checkpoint", action="store_true", help="Always start from the top")
+    parser.add_argument("--report", type=Path, help="Write the summary as JSON to this path")
+    args = parser.parse_args()
+
+    checkpoint = None
+    if not args.no_checkpoint:
+        checkpoint = args.checkpoint or args.source.with_name(args.source.name + ".checkpoint.json")
+
+    summary = asyncio.run(
+        bulk_load(
+            args.source,
+            url=args.url,
+            endpoint=args.endpoint,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            max_retries=args.max_retries,
+            checkpoint_path=checkpoint,
+        )
+    )
+    print_summary(summary)
+    if args.report:
+        args.report.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark query-embedding micro-batching: throughput vs added latency.
+
+Runs in-process against ``EmbeddingService.aembed_text``. For every
+coalescing window and client count, each client embeds ``--requests``
+distinct queries back to back. Window 0 disables the wait, so requests are
+only merged while every worker is busy.
+
+Reports per (window, clients):
+- throughput (queries/second)
+- p50/p95/p99 latency per query
+- average texts per encode call
+
+Usage:
+    python scripts/bench_coalescing.py --clients 1 10 100 --windows 0 2 5 --output coalesce.json
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.embeddings import EmbeddingService
+from benchlib import latency_summary, synthetic_documents, write_report
+
+
+async def run_level(service, queries, clients, requests_per_client):
+    """Embed queries from ``clients`` concurrent callers."""
+    latencies = []
+    calls_before = service.encode_calls
+    texts_before = service.encoded_texts
+
+    async def client(offset):
+        for i in range(requests_per_client):
+            text = queries[(offset * requests_per_client + i) % len(queries)]
+            started = time.perf_counter()
+            await service.aembed_text(text)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[client(c) for c in range(clients)])
+    elapsed = time.perf_counter() - started
+
+    calls = service.encode_calls - calls_before
+    return {
+        "clients": clients,
+        "queries": len(latencies),
+        "throughput_qps": len(latencies) / elapsed,
+        "latency": latency_summary(latencies),
+        "encode_calls": calls,
+        "avg_batch_texts": (service.encoded_texts - texts_before) / calls if calls else 0.0,
+    }
+
+
+async def main(args):
+    service = EmbeddingService()
+    total = max(args.clients) * args.requests
+    queries = [doc["content"][:200] for doc in synthetic_documents(total, seed=args.seed)]
+
+    # Warm up the model
+    await service.aembed_batch(queries[:32])
+
+    runs = []
+    for window in args.windows:
+        service.coalesce_window = window / 1000.0
+        for clients in args.clients:
+            print(f"window={window}ms clients={clients}...")
+            result = await run_level(service, queries, clients, args.requests)
+            runs.append({"window_ms": window, **result})
+
+    service.close()
+    write_report(
+        "coalescing",
+        {
+            "max_batch_size": service.max_batch_size,
+            "workers": service.workers,
+            "requests_per_client": args.requests,
+            "runs": runs,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 2, 5],
+                        help="Coalescing windows in milliseconds")
+    parser.add_argument("--requests", type=int, default=50, help="Queries per client")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
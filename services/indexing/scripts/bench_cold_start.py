@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark the search latency spike of a freshly started Indexing Service.
+
+For each mode, starts the service (``uvicorn app.main:app``) on ``--port``
+against the configured Elasticsearch, waits until it answers /live, and
+fires ``--clients`` concurrent /search requests as traffic would arrive:
+as soon as /ready returns 200 (``--at live`` fires at /live instead, as
+without a readiness probe). /ready is polled throughout.
+
+Modes:
+- lazy: ``PRELOAD_SERVICES=false``; the search service and model load on
+  the first requests
+- preload: ``PRELOAD_SERVICES=true``; they load in the background at
+  startup and /ready waits for them
+
+Reports per mode: seconds to /live and to /ready, p50/p95/p99/max latency
+and errors of the first wave, and how often the server logged loading the
+embedding model (more than once means concurrent first requests each
+loaded it). Run the lazy mode on a checkout before the service container
+was added for the previous behaviour.
+
+Usage:
+    python scripts/bench_cold_start.py --clients 50 --output cold_start.json
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from bench_concurrency import queries
+from benchlib import latency_summary, write_report
+
+ROOT = Path(__file__).parent.parent
+MODES = {"lazy": "false", "preload": "true"}
+
+
+async def wait_for(client, path, started, timeout, ok=200):
+    """Poll ``path`` until it returns ``ok``; seconds since ``started``."""
+    while time.perf_counter() - started < timeout:
+        try:
+            if (await client.get(path)).status_code == ok:
+                return time.perf_counter() - started
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.05)
+    raise TimeoutError(f"{path} not ready after {timeout}s")
+
+
+async def search(client, query, search_type, latencies, errors):
+    """One /search request of the first wave."""
+    started = time.perf_counter()
+    try:
+        response = await client.post(
+            "/search", json={"query": query, "top_k": 5, "search_type": search_type}
+        )
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    except httpx.HTTPError as e:
+        errors.append(str(e))
+
+
+async def run_mode(args, preload):
+    """Start the service in one mode and measure its first wave of searches."""
+    env = {**os.environ, "PRELOAD_SERVICES": preload, "PORT": str(args.port)}
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port)]
+    with tempfile.TemporaryFile(mode="w+") as log:
+        started = time.perf_counter()
+        server = subprocess.Popen(command, cwd=ROOT, env=env, stdout=log, stderr=log)
+        try:
+            url = f"http://127.0.0.1:{args.port}"
+            limits = httpx.Limits(max_connections=args.clients + 2)
+            async with httpx.AsyncClient(base_url=url, timeout=300.0, limits=limits) as client:
+                live = await wait_for(client, "/live", started, args.timeout)
+                ready_task = asyncio.create_task(
+                    wait_for(client, "/ready", started, args.timeout)
+                )
+                if args.at == "ready":
+                    await ready_task
+                fired = time.perf_counter() - started
+                query_iter = queries()
+                latencies, errors = [], []
+                wave_started = time.perf_counter()
+                await asyncio.gather(
+                    *(
+                        search(client, next(query_iter), args.search_type, latencies, errors)
+                        for _ in range(args.clients)
+                    )
+                )
+                wave = time.perf_counter() - wave_started
+                ready = await ready_task
+                stats = (await client.get("/stats")).json()
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        log.seek(0)
+        output = log.read()
+
+    return {
+        "seconds_to_live": live,
+        "seconds_to_ready": ready,
+        "fired_at_seconds": fired,
+        "wave_seconds": wave,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_examples": errors[:5],
+        "search": {**latency_summary(latencies), "max": max(latencies, default=0.0)},
+        "embedding_model_loads": output.count("Loading embedding model"),
+        "index_creations": output.count("Created index"),
+        "services": stats.get("services"),
+    }
+
+
+async def main(args):
+    results = {}
+    for mode in args.modes:
+        print(f"Cold start ({mode})...")
+        results[mode] = await run_mode(args, MODES[mode])
+
+    write_report(
+        "cold_start",
+        {
+            "clients": args.clients,
+            "search_type": args.search_type,
+            "fired_at": args.at,
+            "modes": results,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8013, help="Port to start the service on")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent first requests")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument(
+        "--at", choices=["ready", "live"], default="ready", help="When the first wave fires"
+    )
+    parser.add_argument(
+        "--search-type", default="hybrid", choices=["semantic", "keyword", "hybrid"]
+    )
+    parser.add_argument("--timeout", type=float, default=300.0, help="Startup timeout")
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
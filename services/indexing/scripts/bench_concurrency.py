@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent /search throughput and health-probe latency under load.
+
+Runs against a live Indexing Service. For each client count, ``N`` clients
+send /search requests back to back for ``--duration`` seconds while a
+separate prober calls /live every ``--probe-interval`` seconds. A blocked
+event loop shows up as /live latency tracking /search latency; an
+unblocked one keeps /live in the low milliseconds.
+
+Reports per client count:
+- /search throughput (requests/second) and p50/p95/p99 latency
+- /live p50/p95/p99 latency
+- error count
+
+Usage:
+    python scripts/bench_concurrency.py --url http://localhost:8003 --clients 1 10 50 \\
+        --duration 30 --output concurrency.json
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from benchlib import COMPONENTS, EXCEPTIONS, latency_summary, write_report
+
+
+def queries():
+    """Cycle through distinct queries so the search cache does not answer them."""
+    i = 0
+    while True:
+        _, name, message = EXCEPTIONS[i % len(EXCEPTIONS)]
+        component = COMPONENTS[(i // len(EXCEPTIONS)) % len(COMPONENTS)]
+        yield f"{message} in {component} request {i}"
+        i += 1
+
+
+async def search_client(client, query_iter, search_type, deadline, latencies, errors):
+    """Send /search requests back to back until ``deadline``."""
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.post(
+                "/search",
+                json={"query": next(query_iter), "top_k": 5, "search_type": search_type},
+            )
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+        except httpx.HTTPError:
+            errors.append(1)
+
+
+async def prober(client, interval, deadline, latencies):
+    """Call /live at a fixed interval until ``deadline``."""
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            await client.get("/live")
+            latencies.append((time.perf_counter() - started) * 1000)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(interval)
+
+
+async def run_level(args, clients: int):
+    """Measure one concurrency level."""
+    search_latencies, probe_latencies, errors = [], [], []
+    query_iter = queries()
+    limits = httpx.Limits(max_connections=clients + 1)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60.0, limits=limits) as client:
+        # Warm up: load the model and open connections
+        await client.post("/search", json={"query": "warm up", "top_k": 1})
+
+        deadline = time.monotonic() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            prober(client, args.probe_interval, deadline, probe_latencies),
+            *[
+                search_client(
+                    client, query_iter, args.search_type, deadline, search_latencies, errors
+                )
+                for _ in range(clients)
+            ],
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        "clients": clients,
+        "requests": len(search_latencies),
+        "errors": len(errors),
+        "throughput_rps": len(search_latencies) / elapsed,
+        "search": latency_summary(search_latencies),
+        "live_probe": latency_summary(probe_latencies),
+    }
+
+
+async def main(args):
+    runs = []
+    for clients in args.clients:
+        print(f"Running {clients} concurrent clients for {args.duration}s...")
+        runs.append(await run_level(args, clients))
+    write_report(
+        "concurrency",
+        {"url": args.url, "search_type": args.search_type, "runs": runs},
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:8003", help="Indexing Service URL")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per level")
+    parser.add_argument("--probe-interval", type=float, default=0.1, help="Seconds between probes")
+    parser.add_argument(
+        "--search-type", default="semantic", choices=["semantic", "keyword", "hybrid"]
+    )
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark near-duplicate detection: index size and result diversity.
+
+Builds a corpus of failure families: each synthetic failure is repeated
+``--copies`` times with different line numbers, build IDs, timestamps and
+commit hashes, the way CI re-reports the same stack trace. The corpus is
+ingested once per dedup policy (off, link, skip, merge) into a scratch
+index, with precomputed vectors (family vector plus small noise) so no
+model is needed.
+
+Reports per policy:
+- indexed documents, store size and ingest time
+- duplicates detected, and how many were true family duplicates
+- for semantic, keyword and hybrid search at ``--top-k``: result diversity
+  (distinct families among the results) with and without collapsing
+
+Usage:
+    python scripts/bench_dedup.py --families 2000 --copies 5 --top-k 5 --output dedup.json
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.config import settings
+from app.services.pipeline import IndexingPipeline
+from app.services.search import SearchService, collapse_duplicates
+from benchlib import Timer, latency_summary, synthetic_documents, write_report
+
+POLICIES = ["off", "link", "skip", "merge"]
+
+
+def corpus(families, copies, dims, seed):
+    """Failure families re-reported with volatile details; yields (family, document)."""
+    rng = random.Random(seed)
+    vectors = np.random.default_rng(seed)
+    for base in synthetic_documents(families, seed=seed):
+        family = base["id"]
+        center = vectors.standard_normal(dims, dtype=np.float32)
+        for copy in range(copies):
+            build = rng.randrange(10000, 99999)
+            commit = "%040x" % rng.getrandbits(160)
+            content = (
+                f"Build #{build} at 2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T"
+                f"{rng.randint(10, 23)}:{rng.randint(10, 59)}:00Z (commit {commit}). "
+                + base["content"].replace("line", f"line {rng.randint(10, 900)} /", 1)
+            )
+            vector = center + vectors.standard_normal(dims, dtype=np.float32) * 0.05
+            yield family, {
+                **base,
+                "id": f"{family}-{copy}",
+                "content": content,
+                "embedding": vector / np.linalg.norm(vector),
+                "metadata": {**base["metadata"], "family": family},
+            }
+
+
+async def ingest(search_service, docs, policy):
+    """Index the corpus under ``policy``; returns outcome counts."""
+    counts = {"indexed": 0, "duplicate": 0, "failed": 0}
+    pipeline = IndexingPipeline(None, search_service, incremental=False, dedup_policy=policy)
+    async for ok, result in pipeline.run(docs):
+        if not ok:
+            counts["failed"] += 1
+        elif result.get("result") == "duplicate":
+            counts["duplicate"] += 1
+        else:
+            counts["indexed"] += 1
+    await search_service.es.indices.refresh(index=search_service.index)
+    return counts
+
+
+async def diversity(search_service, queries, top_k, oversample):
+    """Distinct families among the top results, without and with collapsing."""
+    report = {}
+    for search_type in ["semantic", "keyword", "hybrid"]:
+        plain, collapsed, latencies = [], [], []
+        for text, vector in queries:
+            started = time.perf_counter()
+            if search_type == "semantic":
+                hits = await search_service.semantic_search(vector, top_k * oversample)
+            elif search_type == "keyword":
+                hits = await search_service.keyword_search(text, top_k * oversample)
+            else:
+                hits = await search_service.hybrid_search(text, vector, top_k * oversample)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+            def families(results):
+                return len({r["metadata"].get("family") for r in results}) / top_k
+
+            plain.append(families(hits[:top_k]))
+            collapsed.append(families(collapse_duplicates(hits, top_k)))
+        report[search_type] = {
+            "diversity": sum(plain) / len(plain),
+            "diversity_collapsed": sum(collapsed) / len(collapsed),
+            "latency": latency_summary(latencies),
+        }
+    return report
+
+
+async def main(args):
+    dims = settings.embedding_dimension
+    docs = list(corpus(args.families, args.copies, dims, args.seed))
+    family_of = {doc["id"]: family for family, doc in docs}
+    rng = random.Random(args.seed + 1)
+    picks = [doc for _, doc in rng.sample(docs, min(args.queries, len(docs)))]
+    queries = [(doc["title"], doc["embedding"]) for doc in picks]
+
+    runs = {}
+    for policy in POLICIES:
+        print(f"Policy {policy}...")
+        search_service = SearchService()
+        search_service.index = f"{settings.elasticsearch_index}_bench_dedup"
+        try:
+            await search_service.es.indices.delete(
+                index=search_service.index, ignore_unavailable=True
+            )
+            await search_service.create_index(search_service.index)
+            with Timer() as load:
+                counts = await ingest(search_service, [dict(doc) for _, doc in docs], policy)
+            stats = await search_service.es.indices.stats(index=search_service.index)
+            total = next(iter(stats["indices"].values()))["total"]
+
+            # Documents whose cluster root is from the same family were linked correctly
+            clusters = {}
+            async for hit in search_service.scan_documents(source=["cluster_id"]):
+                clusters[hit["_id"]] = hit["_source"].get("cluster_id") or hit["_id"]
+            linked = [(i, root) for i, root in clusters.items() if root != i]
+            correct = sum(family_of[i] == family_of.get(root) for i, root in linked)
+
+            runs[policy] = {
+                **counts,
+                "documents": total["docs"]["count"],
+                "store_bytes": total["store"]["size_in_bytes"],
+                "ingest_seconds": load.elapsed,
+                "clusters": len(set(clusters.values())),
+                "linked": len(linked),
+                "linked_same_family": correct,
+                **await diversity(
+                    search_service, queries, args.top_k, settings.dedup_collapse_oversample
+                ),
+            }
+        finally:
+            await search_service.es.indices.delete(
+                index=search_service.index, ignore_unavailable=True
+            )
+            await search_service.close()
+
+    baseline = runs["off"]["store_bytes"] or 1
+    for run in runs.values():
+        run["store_reduction"] = 1 - run["store_bytes"] / baseline
+
+    write_report(
+        "dedup",
+        {
+            "families": args.families,
+            "copies": args.copies,
+            "documents": len(docs),
+            "max_distance": settings.dedup_max_distance,
+            "top_k": args.top_k,
+            "runs": runs,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--families", type=int, default=2000, help="Distinct failures")
+    parser.add_argument("--copies", type=int, default=5, help="Reports per failure")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per search type")
+    parser.add_argument("--top-k", type=int, default=5, help="Results the agent reads")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark Elasticsearch connection reuse under concurrent search load.
+
+Loads a synthetic corpus into a scratch index, then runs keyword searches
+from ``--concurrency`` concurrent workers for ``--duration`` seconds with:
+- per_call: a new client per request, closed afterwards (the previous
+  knowledge base fallback behaviour)
+- pool_<n>: one shared client with ``n`` pooled connections per node
+- pool_<n>_gzip: the largest pool with HTTP compression
+
+Reports per configuration: throughput, p50/p95/p99 latency, errors, and
+connection churn (connections the server opened during the run, from
+``_nodes/stats/http``).
+
+Usage:
+    python scripts/bench_es_pool.py --docs 20000 --concurrency 50 --pool-sizes 10 25 50 \\
+        --output es_pool.json
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from elasticsearch import AsyncElasticsearch
+
+from app.config import settings
+from app.services.es_client import InstrumentedNode, connection_stats
+from app.services.search import RESULT_SOURCE_FIELDS, SearchService
+from app.services.serializer import es_serializers
+from benchlib import latency_summary, synthetic_documents, write_report
+
+
+def make_client(connections_per_node: int, http_compress: bool) -> AsyncElasticsearch:
+    """Client with the given pool size and compression."""
+    return AsyncElasticsearch(
+        [settings.elasticsearch_url],
+        node_class=InstrumentedNode,
+        connections_per_node=connections_per_node,
+        http_compress=http_compress,
+        serializers=es_serializers(),
+    )
+
+
+async def load(search_service, docs, dims, seed):
+    """Bulk load the corpus with random vectors."""
+    rng = np.random.default_rng(seed)
+
+    async def actions():
+        for doc in docs:
+            vector = rng.standard_normal(dims, dtype=np.float32)
+            yield search_service.build_action({**doc, "embedding": vector / np.linalg.norm(vector)})
+
+    async for _ in search_service.stream_bulk(actions()):
+        pass
+    await search_service.es.indices.refresh(index=search_service.index)
+
+
+async def run(args, index, texts, shared):
+    """Run concurrent searches with a shared client, or one client per call."""
+    latencies, errors = [], []
+    deadline = time.monotonic() + args.duration
+
+    async def search(es, text):
+        await es.search(
+            index=index,
+            query={"multi_match": {"query": text, "fields": ["title^2", "content"]}},
+            size=args.top_k,
+            _source=RESULT_SOURCE_FIELDS,
+        )
+
+    async def worker(offset):
+        i = offset
+        while time.monotonic() < deadline:
+            text = texts[i % len(texts)]
+            i += args.concurrency
+            started = time.perf_counter()
+            try:
+                if shared is not None:
+                    await search(shared, text)
+                else:
+                    es = make_client(1, False)
+                    try:
+                        await search(es, text)
+                    finally:
+                        await es.close()
+                latencies.append((time.perf_counter() - started) * 1000)
+            except Exception:
+                errors.append(1)
+
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    return {
+        "requests_per_second": len(latencies) / args.duration,
+        "latency": latency_summary(latencies),
+        "errors": len(errors),
+    }
+
+
+async def main(args):
+    search_service = SearchService()
+    search_service.index = f"{settings.elasticsearch_index}_bench_es_pool"
+    docs = list(synthetic_documents(args.docs, seed=args.seed))
+    rng = np.random.default_rng(args.seed + 1)
+    texts = [docs[i]["title"] for i in rng.integers(0, len(docs), 1000)]
+
+    configs = {"per_call": (None, False)}
+    configs.update({f"pool_{n}": (n, False) for n in args.pool_sizes})
+    configs[f"pool_{max(args.pool_sizes)}_gzip"] = (max(args.pool_sizes), True)
+
+    runs = {}
+    try:
+        await search_service.es.indices.delete(index=search_service.index, ignore_unavailable=True)
+        await search_service.create_index(search_service.index)
+        await load(search_service, docs, settings.embedding_dimension, args.seed)
+
+        for name, (pool, compress) in configs.items():
+            print(f"{name}...")
+            shared = make_client(pool, compress) if pool else None
+            before = await connection_stats(search_service.es)
+            try:
+                result = await run(args, search_service.index, texts, shared)
+            finally:
+                if shared is not None:
+                    await shared.close()
+            after = await connection_stats(search_service.es)
+            result["connections_opened"] = after["total_opened"] - before["total_opened"]
+            runs[name] = result
+    finally:
+        await search_service.es.indices.delete(index=search_service.index, ignore_unavailable=True)
+        await search_service.close()
+
+    write_report(
+        "es_pool",
+        {
+            "docs": args.docs,
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration,
+            "runs": runs,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=20000, help="Corpus size")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent workers")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per configuration")
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[10, 25, 50])
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
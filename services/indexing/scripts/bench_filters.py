@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark filtered and faceted search latency.
+
+Loads a synthetic corpus (random unit vectors, ``indexed_at`` spread over
+the last 90 days) into a scratch index using the configured
+``VECTOR_STORAGE`` mode, then measures semantic and keyword search latency
+for filters of decreasing selectivity, with and without facets. Filters
+are pushed into the kNN candidate search for quantized storage modes and
+into the script_score candidate query for float storage.
+
+Reports per filter: selectivity (share of documents matching), p50/p95/p99
+latency per search type, and the latency of the same query with facets.
+
+Usage:
+    python scripts/bench_filters.py --docs 100000 --queries 100 --output filters.json
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.config import settings
+from app.services.search import SearchService
+from benchlib import Timer, latency_summary, synthetic_documents, write_report
+
+
+FILTERS = {
+    "none": None,
+    "severity": {"metadata.severity": "critical"},
+    "languages": {"metadata.language": ["go", "node"]},
+    "language_and_severity": {"metadata.language": "java", "metadata.severity": "critical"},
+    "last_7_days": {"indexed_at": {"gte": "now-7d"}},
+    "error_type_last_7_days": {"metadata.error_type": "panic", "indexed_at": {"gte": "now-7d"}},
+}
+
+FACETS = ["metadata.category", "metadata.severity", "tags"]
+
+
+async def load(search_service, docs, dims, seed):
+    """Bulk load the corpus with random vectors and spread-out timestamps."""
+    rng = np.random.default_rng(seed)
+    dates = random.Random(seed)
+    now = datetime.utcnow()
+
+    async def actions():
+        for start in range(0, len(docs), 1000):
+            vectors = rng.standard_normal((min(1000, len(docs) - start), dims), dtype=np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            for doc, vector in zip(docs[start:start + 1000], vectors):
+                indexed_at = now - timedelta(minutes=dates.randrange(90 * 24 * 60))
+                yield search_service.build_action(
+                    {**doc, "embedding": vector, "indexed_at": indexed_at.isoformat()}
+                )
+
+    with Timer() as timer:
+        async for _ in search_service.stream_bulk(actions()):
+            pass
+        await search_service.es.indices.refresh(index=search_service.index)
+    return timer.elapsed
+
+
+async def measure(search, queries):
+    """Latency summary of ``search`` over all queries."""
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        await search(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latency_summary(latencies)
+
+
+async def main(args):
+    search_service = SearchService()
+    search_service.index = f"{settings.elasticsearch_index}_bench_filters"
+    dims = settings.embedding_dimension
+    docs = list(synthetic_documents(args.docs, seed=args.seed))
+
+    rng = np.random.default_rng(args.seed + 1)
+    query_vectors = rng.standard_normal((args.queries, dims), dtype=np.float32)
+    query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+    query_texts = [docs[i]["title"] for i in rng.integers(0, len(docs), args.queries)]
+
+    runs = []
+    try:
+        await search_service.es.indices.delete(index=search_service.index, ignore_unavailable=True)
+        await search_service.create_index(search_service.index)
+        load_seconds = await load(search_service, docs, dims, args.seed)
+
+        for name, filters in FILTERS.items():
+            print(f"Filter {name}...")
+            query = search_service._build_filter_query(filters) if filters else None
+            matching = await search_service.count_documents(query)
+
+            def semantic(vector, facets=None, filters=filters):
+                return search_service.semantic_search(
+                    vector, args.top_k, filters, facets=facets
+                )
+
+            def keyword(text, facets=None, filters=filters):
+                return search_service.keyword_search(text, args.top_k, filters, facets=facets)
+
+            runs.append({
+                "filter": name,
+                "filters": filters,
+                "selectivity": matching / len(docs),
+                "semantic": await measure(semantic, query_vectors),
+                "semantic_with_facets": await measure(
+                    lambda v: semantic(v, FACETS), query_vectors
+                ),
+                "keyword": await measure(keyword, query_texts),
+                "keyword_with_facets": await measure(lambda t: keyword(t, FACETS), query_texts),
+            })
+    finally:
+        await search_service.es.indices.delete(index=search_service.index, ignore_unavailable=True)
+        await search_service.close()
+
+    write_report(
+        "filters",
+        {
+            "docs": args.docs,
+            "queries": args.queries,
+            "vector_storage": settings.vector_storage,
+            "load_seconds": load_seconds,
+            "runs": runs,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=100000, help="Corpus size")
+    parser.add_argument("--queries", type=int, default=100, help="Queries per measurement")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk indexing throughput: sequential vs pipelined.
+
+The sequential baseline reproduces the previous ``index_batch`` behaviour
+(embed everything, build the full action list, one ``async_bulk`` call).
+The pipelined runs push the same corpus through ``IndexingPipeline`` with
+different writer concurrency. Each run writes into a scratch index that is
+deleted afterwards.
+
+Usage:
+    python scripts/bench_indexing.py --docs 5000 --concurrency 1 2 4 --output bench.json
+"""
+
+import argparse
+import asyncio
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from elasticsearch.helpers import async_bulk
+
+from app.services.embeddings import EmbeddingService
+from app.services.pipeline import IndexingPipeline
+from app.services.search import SearchService
+from benchlib import Timer, synthetic_documents, write_report
+
+
+async def _fresh_index(search_service: SearchService, name: str) -> None:
+    """Point the search service at an empty scratch index."""
+    search_service.index = name
+    await search_service.es.indices.delete(index=name, ignore_unavailable=True)
+    await search_service.ensure_index()
+
+
+async def run_sequential(search_service, embedding_service, docs_count):
+    """Embed all documents, then index them with a single bulk call."""
+    tracemalloc.start()
+    with Timer() as timer:
+        docs = list(synthetic_documents(docs_count))
+        embeddings = embedding_service.embed_batch([f"{d['title']} {d['content']}" for d in docs])
+        for doc, embedding in zip(docs, embeddings):
+            doc["embedding"] = embedding
+        actions = [search_service.build_action(doc) for doc in docs]
+        success, errors = await async_bulk(search_service.es, actions, raise_on_error=False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "mode": "sequential",
+        "indexed": success,
+        "failed": len(errors),
+        "seconds": timer.elapsed,
+        "docs_per_sec": docs_count / timer.elapsed,
+        "peak_python_mb": peak / 1024 / 1024,
+    }
+
+
+async def run_pipelined(search_service, embedding_service, docs_count, concurrency):
+    """Stream documents through the embed/index pipeline."""
+    pipeline = IndexingPipeline(embedding_service, search_service, concurrency=concurrency)
+    indexed = failed = 0
+    tracemalloc.start()
+    with Timer() as timer:
+        async for ok, _ in pipeline.run(synthetic_documents(docs_count)):
+            if ok:
+                indexed += 1
+            else:
+                failed += 1
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "mode": f"pipelined(concurrency={concurrency})",
+        "indexed": indexed,
+        "failed": failed,
+        "seconds": timer.elapsed,
+        "docs_per_sec": docs_count / timer.elapsed,
+        "peak_python_mb": peak / 1024 / 1024,
+    }
+
+
+async def main(args):
+    embedding_service = EmbeddingService()
+    search_service = SearchService()
+    scratch = f"{search_service.index}_bench_indexing"
+
+    runs = []
+    try:
+        await _fresh_index(search_service, scratch)
+        runs.append(await run_sequential(search_service, embedding_service, args.docs))
+        for concurrency in args.concurrency:
+            await _fresh_index(search_service, scratch)
+            runs.append(
+                await run_pipelined(search_service, embedding_service, args.docs, concurrency)
+            )
+    finally:
+        await search_service.es.indices.delete(index=scratch, ignore_unavailable=True)
+        await search_service.close()
+
+    baseline = runs[0]["docs_per_sec"]
+    for run in runs:
+        run["speedup"] = run["docs_per_sec"] / baseline
+    write_report("indexing_throughput", {"docs": args.docs, "runs": runs}, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=5000, help="Documents per run")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 2, 4], help="Writer counts to test"
+    )
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
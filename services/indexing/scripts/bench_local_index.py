@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark the embedded local vector index used as an Elasticsearch fallback.
+
+Loads a synthetic corpus into a scratch ``LocalVectorIndex`` and reports:
+- load throughput and on-disk size
+- reopen time (replaying the document log)
+- p50/p95/p99 latency of semantic, filtered semantic and keyword search
+
+Vectors are random unit vectors by default so the benchmark runs without
+the embedding model; queries are perturbed copies of corpus vectors.
+Pass ``--embed`` to embed the corpus with the configured model instead.
+
+Usage:
+    python scripts/bench_local_index.py --docs 100000 --queries 200 --output local.json
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.config import settings
+from app.services.local_index import LocalVectorIndex
+from benchlib import Timer, latency_summary, synthetic_documents, write_report
+
+
+def corpus_vectors(docs, dims, seed, embed):
+    """Embeddings for the corpus (random unit vectors unless ``embed``)."""
+    if embed:
+        from app.services.embeddings import EmbeddingService
+
+        texts = [f"{d['title']} {d['content']}" for d in docs]
+        return np.asarray(EmbeddingService().embed_batch(texts), dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((len(docs), dims), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def measure(fn, queries):
+    """Run ``fn`` for every query and summarize latency."""
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latency_summary(latencies)
+
+
+def main(args):
+    docs = list(synthetic_documents(args.docs, seed=args.seed))
+    vectors = corpus_vectors(docs, settings.embedding_dimension, args.seed, args.embed)
+    path = Path(args.path or tempfile.mkdtemp(prefix="local_index_bench_"))
+
+    try:
+        index = LocalVectorIndex(str(path), vectors.shape[1])
+        with Timer() as load:
+            for doc, vector in zip(docs, vectors):
+                metadata = doc["metadata"]
+                index.upsert(doc["id"], {
+                    "title": doc["title"],
+                    "content": doc["content"],
+                    "embedding": vector,
+                    "metadata": metadata,
+                    "source": metadata["source"],
+                    "tags": metadata["tags"],
+                })
+            index.flush()
+        index.close()
+
+        with Timer() as reopen:
+            index = LocalVectorIndex(str(path), vectors.shape[1])
+
+        rng = np.random.default_rng(args.seed + 1)
+        picks = rng.integers(0, len(docs), args.queries)
+        noise = rng.standard_normal((args.queries, vectors.shape[1]), dtype=np.float32) * 0.05
+        query_vectors = vectors[picks] + noise
+        query_texts = [docs[i]["title"] for i in picks]
+
+        results = {
+            "docs": args.docs,
+            "queries": args.queries,
+            "dims": vectors.shape[1],
+            "top_k": args.top_k,
+            "load_seconds": load.elapsed,
+            "load_docs_per_second": args.docs / load.elapsed,
+            "reopen_seconds": reopen.elapsed,
+            "disk_bytes": sum(f.stat().st_size for f in path.iterdir()),
+            "semantic": measure(
+                lambda q: index.semantic_search(q, args.top_k), query_vectors
+            ),
+            "semantic_filtered": measure(
+                lambda q: index.semantic_search(q, args.top_k, {"metadata.severity": "critical"}),
+                query_vectors,
+            ),
+            "keyword": measure(lambda q: index.keyword_search(q, args.top_k), query_texts),
+        }
+        index.close()
+    finally:
+        if not args.path:
+            shutil.rmtree(path, ignore_errors=True)
+
+    write_report("local_index", results, args.output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=100000, help="Corpus size")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per search type")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--embed", action="store_true", help="Embed with the configured model")
+    parser.add_argument("--path", help="Keep the index in this directory (default: temp dir)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    main(parser.parse_args())
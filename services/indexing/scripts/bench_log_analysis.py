@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Benchmark keyword search on log-shaped queries: standard vs log-aware analysis.
+
+Generates ``--docs`` stack-trace style failure reports: exceptions thrown
+from fully qualified classes (``com.acme.billing.PaymentGateway.charge``),
+source file paths with line numbers, and error codes (ORA-00942,
+ECONNREFUSED, E0432, exit code 137, ...). They are loaded once into a
+scratch index with the log-aware analyzers (with random vectors; only
+keyword search is measured).
+
+Log-shaped queries are built from a random report, one per kind:
+- class: simple class and exception names (``PaymentGateway NullPointerException``);
+  relevant: reports of that exception thrown from that class
+- camel: the class name split into words (``payment gateway failure``);
+  relevant: reports from that class
+- path: file name and line (``PaymentGateway.java:118``) or a partial path;
+  relevant: reports from that file
+- code: error code and module (``ORA-00942 billing``); relevant: reports of
+  that code from that module
+The report the query was built from has relevance 2, the others 1.
+
+Each query runs with the standard query (``title``/``content``, as before)
+and with the log-aware one (``log`` subfields, error codes, paths). Reports
+precision@k, recall@k, MRR@k, nDCG@k and p50/p95/p99 latency per query
+kind and overall.
+
+Usage:
+    python scripts/bench_log_analysis.py --docs 20000 --queries 100 --top-k 10
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from bench_retrieval import drop, load_random, make_backend, reset
+from benchlib import (
+    CAUSES,
+    FIXES,
+    Timer,
+    latency_summary,
+    mean_metrics,
+    ranking_metrics,
+    write_report,
+)
+
+MODULES = ["billing", "auth", "orders", "inventory", "search", "reports", "notify", "sessions"]
+CLASSES = [
+    "PaymentGateway", "UserService", "BatchProcessor", "AuthController", "OrderRepository",
+    "InventorySync", "NotificationWorker", "ReportExporter", "SessionCache", "SearchIndexer",
+    "TokenValidator", "LedgerWriter",
+]
+METHODS = ["process", "charge", "handle", "flush", "load", "validate", "sync", "render"]
+# (exception, error code, message with the code)
+FAILURES = [
+    ("NullPointerException", None, "Cannot invoke method on null reference"),
+    ("SQLSyntaxErrorException", "ORA-00942", "ORA-00942: table or view does not exist"),
+    ("SQLIntegrityConstraintViolationException", "ORA-00001", "ORA-00001: unique constraint"),
+    ("ConnectException", "ECONNREFUSED", "connect ECONNREFUSED 10.0.4.12:5432"),
+    ("SocketTimeoutException", "ETIMEDOUT", "read ETIMEDOUT after 30000ms"),
+    ("OutOfMemoryError", "EXIT_137", "container exited with code 137 (OOMKilled)"),
+    ("HttpServerErrorException", "HTTP_503", "upstream returned HTTP 503 Service Unavailable"),
+    ("PSQLException", "SQLSTATE_23505", "ERROR: duplicate key value SQLSTATE 23505"),
+    ("CompileError", "E0432", "error[E0432]: unresolved import"),
+    ("TypeScriptError", "TS2307", "error TS2307: Cannot find module"),
+]
+# How a code is written in a query (codes are stored qualified)
+CODE_QUERIES = {
+    "EXIT_137": "exit code 137",
+    "HTTP_503": "HTTP 503",
+    "SQLSTATE_23505": "SQLSTATE 23505",
+}
+KINDS = ["class", "camel", "path", "code"]
+
+
+def split_camel(name):
+    """PaymentGateway -> payment gateway."""
+    words, current = [], ""
+    for char in name:
+        if char.isupper() and current:
+            words.append(current)
+            current = ""
+        current += char.lower()
+    return " ".join(words + [current])
+
+
+def log_documents(count, seed):
+    """Stack-trace style failure reports; metadata carries the ground truth."""
+    rng = random.Random(seed)
+    for i in range(count):
+        module, cls, method = rng.choice(MODULES), rng.choice(CLASSES), rng.choice(METHODS)
+        exception, code, message = rng.choice(FAILURES)
+        line = rng.randint(20, 400)
+        path = f"src/main/java/com/acme/{module}/{cls}.java"
+        caller = rng.choice(CLASSES)
+        cause = rng.randrange(len(CAUSES))
+        content = (
+            f"Build #{rng.randint(1000, 9999)} failed in stage test.\n"
+            f"{exception}: {message}\n"
+            f"    at com.acme.{module}.{cls}.{method}({cls}.java:{line})\n"
+            f"    at com.acme.{module}.{caller}.run({caller}.java:{rng.randint(20, 400)})\n"
+            f"    at {path}:{line}\n"
+            f"Root cause: {CAUSES[cause]}. Fix: {FIXES[cause]}"
+        )
+        yield {
+            "id": f"log-{i:08d}",
+            "title": f"{exception} in {module}",
+            "content": content,
+            "metadata": {
+                "source": "synthetic",
+                "module": module,
+                "class": cls,
+                "exception": exception,
+                "code": code,
+                "path": path,
+                "line": line,
+            },
+        }
+
+
+def make_query(kind, doc, rng):
+    """A log-shaped query of ``kind`` and the key of the reports relevant to it."""
+    meta = doc["metadata"]
+    if kind == "class":
+        query = f"{meta['class']} {meta['exception']}"
+        key = ("class", meta["class"], meta["exception"])
+    elif kind == "camel":
+        query = f"{split_camel(meta['class'])} failure"
+        key = ("camel", meta["class"])
+    elif kind == "path":
+        if rng.random() < 0.5:
+            query = f"{meta['class']}.java:{meta['line']}"
+        else:
+            query = f"{meta['module']}/{meta['class']}.java"
+        key = ("path", meta["path"])
+    else:
+        query = f"{CODE_QUERIES.get(meta['code'], meta['code'])} {meta['module']}"
+        key = ("code", meta["code"], meta["module"])
+    return query, key
+
+
+def relevance_keys(doc):
+    """Keys of every query kind this report is relevant to."""
+    meta = doc["metadata"]
+    return [
+        ("class", meta["class"], meta["exception"]),
+        ("camel", meta["class"]),
+        ("path", meta["path"]),
+        ("code", meta["code"], meta["module"]),
+    ]
+
+
+async def run_queries(search_service, queries, top_k, log_analysis):
+    """Run every query with the standard or the log-aware query; metrics per kind."""
+    search_service.log_analysis = log_analysis
+    by_kind = {kind: {"latencies": [], "metrics": []} for kind in KINDS}
+    for query in queries:
+        started = time.perf_counter()
+        hits = await search_service.keyword_search(query["query"], top_k)
+        samples = by_kind[query["kind"]]
+        samples["latencies"].append((time.perf_counter() - started) * 1000)
+        ranked = [hit["id"] for hit in hits]
+        samples["metrics"].append(ranking_metrics(ranked, query["relevant"], top_k))
+
+    report = {
+        kind: {"latency": latency_summary(s["latencies"]), **mean_metrics(s["metrics"])}
+        for kind, s in by_kind.items()
+    }
+    report["all"] = {
+        "latency": latency_summary([v for s in by_kind.values() for v in s["latencies"]]),
+        **mean_metrics([m for s in by_kind.values() for m in s["metrics"]]),
+    }
+    return report
+
+
+async def main(args):
+    docs = list(log_documents(args.docs, args.seed))
+    ids_by_key = {}
+    for doc in docs:
+        for key in relevance_keys(doc):
+            ids_by_key.setdefault(key, []).append(doc["id"])
+
+    rng = random.Random(args.seed + 1)
+    queries = []
+    for kind in KINDS:
+        # Code queries are built from reports that have an error code
+        pool = [doc for doc in docs if kind != "code" or doc["metadata"]["code"]]
+        for doc in rng.sample(pool, min(args.queries, len(pool))):
+            text, key = make_query(kind, doc, rng)
+            relevant = {doc_id: 1 for doc_id in ids_by_key.get(key, [])}
+            relevant[doc["id"]] = 2
+            queries.append({"kind": kind, "query": text, "relevant": relevant})
+
+    search_service = make_backend("es", "log_analysis")
+    try:
+        await reset(search_service)
+        with Timer() as load:
+            await load_random(search_service, docs, settings.embedding_dimension, args.seed, set())
+        # Warm up both query shapes
+        for log_analysis in (False, True):
+            await run_queries(search_service, queries[:20], args.top_k, log_analysis)
+        standard = await run_queries(search_service, queries, args.top_k, log_analysis=False)
+        log_aware = await run_queries(search_service, queries, args.top_k, log_analysis=True)
+    finally:
+        await drop(search_service)
+
+    write_report(
+        "log_analysis",
+        {
+            "docs": args.docs,
+            "queries_per_kind": min(args.queries, len(docs)),
+            "top_k": args.top_k,
+            "ingest_seconds": load.elapsed,
+            "standard": standard,
+            "log_aware": log_aware,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=20000, help="Failure reports")
+    parser.add_argument("--queries", type=int, default=100, help="Queries per kind")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark an embedding model migration under search load.
+
+Runs against a live Indexing Service. Starts ``--clients`` clients sending
+/search requests back to back, then submits ``POST /migrate`` to
+``--model`` and polls the job until it finishes. Searches keep running for
+``--settle`` seconds after the cut-over.
+
+Reports, split into before/during/after the migration:
+- /search throughput and p50/p95/p99 latency
+- failed searches (the migration should cause none)
+plus the migration's duration, counts and the models before and after.
+
+Usage:
+    python scripts/bench_migration.py --url http://localhost:8003 \\
+        --model sentence-transformers/paraphrase-MiniLM-L3-v2 --clients 10 --output migration.json
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from bench_concurrency import queries
+from benchlib import latency_summary, write_report
+
+PHASES = ["before", "during", "after"]
+
+
+async def search_client(client, query_iter, search_type, phase, stop, samples):
+    """Send /search requests until ``stop`` is set, recording them per phase."""
+    while not stop.is_set():
+        current = phase[0]
+        started = time.perf_counter()
+        try:
+            response = await client.post(
+                "/search",
+                json={"query": next(query_iter), "top_k": 5, "search_type": search_type},
+            )
+            response.raise_for_status()
+            samples[current]["latencies"].append((time.perf_counter() - started) * 1000)
+        except httpx.HTTPError as e:
+            samples[current]["errors"].append(str(e))
+
+
+async def migrate(client, args, phase):
+    """Submit the migration and poll it to completion; returns the final job."""
+    await asyncio.sleep(args.warmup)
+    phase[0] = "during"
+    response = await client.post(
+        "/migrate",
+        json={"model": args.model, "backend": args.backend, "delete_old": args.delete_old},
+    )
+    response.raise_for_status()
+    job = response.json()
+    while job["status"] in ("pending", "running"):
+        await asyncio.sleep(args.poll_interval)
+        job = (await client.get(f"/migrate/{job['id']}")).json()
+    phase[0] = "after"
+    return job
+
+
+async def main(args):
+    samples = {name: {"latencies": [], "errors": []} for name in PHASES}
+    phase = ["before"]
+    stop = asyncio.Event()
+    query_iter = queries()
+    limits = httpx.Limits(max_connections=args.clients + 2)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60.0, limits=limits) as client:
+        before = (await client.get("/stats?refresh=true")).json()
+        # Warm up: load the model and open connections
+        await client.post("/search", json={"query": "warm up", "top_k": 1})
+
+        clients = [
+            asyncio.create_task(
+                search_client(client, query_iter, args.search_type, phase, stop, samples)
+            )
+            for _ in range(args.clients)
+        ]
+        phase_started = {"before": time.perf_counter()}
+        migration = asyncio.create_task(migrate(client, args, phase))
+        while phase[0] == "before":
+            await asyncio.sleep(0.05)
+        phase_started["during"] = time.perf_counter()
+        job = await migration
+        phase_started["after"] = time.perf_counter()
+        await asyncio.sleep(args.settle)
+        stop.set()
+        await asyncio.gather(*clients)
+        finished = time.perf_counter()
+        after = (await client.get("/stats?refresh=true")).json()
+
+    ends = {"before": phase_started["during"], "during": phase_started["after"], "after": finished}
+    phases = {}
+    for name in PHASES:
+        elapsed = ends[name] - phase_started[name]
+        latencies, errors = samples[name]["latencies"], samples[name]["errors"]
+        phases[name] = {
+            "seconds": elapsed,
+            "requests": len(latencies),
+            "errors": len(errors),
+            "error_examples": errors[:5],
+            "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+            "search": latency_summary(latencies),
+        }
+
+    write_report(
+        "migration",
+        {
+            "url": args.url,
+            "clients": args.clients,
+            "search_type": args.search_type,
+            "model_before": before.get("embedding_model"),
+            "model_after": after.get("embedding_model"),
+            "documents": after.get("document_count"),
+            "job": {key: job.get(key) for key in ("status", "counts", "details", "error")},
+            "migration_seconds": phases["during"]["seconds"],
+            "phases": phases,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:8003", help="Indexing Service URL")
+    parser.add_argument("--model", required=True, help="Model to migrate to")
+    parser.add_argument("--backend", choices=["torch", "onnx"], help="Backend of the new model")
+    parser.add_argument("--delete-old", action="store_true", help="Drop the old index afterwards")
+    parser.add_argument("--clients", type=int, default=10, help="Concurrent search clients")
+    parser.add_argument("--warmup", type=float, default=10.0, help="Seconds before migrating")
+    parser.add_argument("--settle", type=float, default=10.0, help="Seconds after the cut-over")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Job polling interval")
+    parser.add_argument(
+        "--search-type", default="hybrid", choices=["semantic", "keyword", "hybrid"]
+    )
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark the embedding -> bulk request path: Python lists vs NumPy arrays.
+
+The ``lists`` path reproduces the previous behaviour (``tolist()`` per
+vector, stdlib JSON serializer); the ``numpy`` path keeps float32 arrays
+and serializes them with the orjson serializer. For each path it reports:
+- seconds to build and serialize the bulk actions
+- peak traced Python memory and live allocated blocks (object churn)
+- serialized bulk body size
+
+With ``--index`` both paths also bulk index into a scratch index and
+report wall-clock indexing time.
+
+Usage:
+    python scripts/bench_numpy_path.py --docs 20000 --index --output numpy_path.json
+"""
+
+import argparse
+import asyncio
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from elasticsearch import AsyncElasticsearch
+from elasticsearch.serializer import JSONSerializer
+
+from app.config import settings
+from app.services.search import SearchService
+from app.services.serializer import OrjsonSerializer, es_serializers
+from benchlib import Timer, synthetic_documents, write_report
+
+
+def vectors_for(count: int, dims: int, seed: int) -> np.ndarray:
+    """Random unit vectors standing in for model output (float32, like encode)."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((count, dims), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def build_and_serialize(search_service, docs, vectors, as_lists, serializer):
+    """Build bulk actions and serialize them as the bulk helper would."""
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    with Timer() as timer:
+        embeddings = [v.tolist() for v in vectors] if as_lists else vectors
+        actions = [
+            search_service.build_action({**doc, "embedding": embedding})
+            for doc, embedding in zip(docs, embeddings)
+        ]
+        blocks_live = sys.getallocatedblocks() - blocks_before
+        body_bytes = sum(len(serializer.dumps(action["_source"])) for action in actions)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": timer.elapsed,
+        "peak_python_mb": peak / 1024 / 1024,
+        "allocated_blocks": blocks_live,
+        "body_mb": body_bytes / 1024 / 1024,
+    }
+
+
+async def bulk_index(search_service, docs, vectors, as_lists):
+    """Bulk index the corpus into a scratch index and time it."""
+    index = f"{settings.elasticsearch_index}_bench_numpy"
+    search_service.index = index
+    await search_service.es.indices.delete(index=index, ignore_unavailable=True)
+    await search_service.create_index(index)
+
+    async def actions():
+        for doc, vector in zip(docs, vectors):
+            embedding = vector.tolist() if as_lists else vector
+            yield search_service.build_action({**doc, "embedding": embedding})
+
+    failed = 0
+    with Timer() as timer:
+        async for ok, _ in search_service.stream_bulk(actions()):
+            failed += not ok
+    await search_service.es.indices.delete(index=index, ignore_unavailable=True)
+    return {"seconds": timer.elapsed, "docs_per_sec": len(docs) / timer.elapsed, "failed": failed}
+
+
+async def main(args):
+    docs = list(synthetic_documents(args.docs, seed=args.seed))
+    vectors = vectors_for(args.docs, settings.embedding_dimension, args.seed)
+    search_service = SearchService()
+
+    paths = {
+        "lists": (True, JSONSerializer(), {}),
+        "numpy": (False, OrjsonSerializer(), es_serializers()),
+    }
+    runs = []
+    try:
+        for name, (as_lists, serializer, client_serializers) in paths.items():
+            print(f"Benchmarking {name} path...")
+            run = {"path": name, **build_and_serialize(
+                search_service, docs, vectors, as_lists, serializer
+            )}
+            if args.index:
+                await search_service.es.close()
+                search_service.es = AsyncElasticsearch(
+                    [settings.elasticsearch_url], serializers=client_serializers or None
+                )
+                run["bulk_index"] = await bulk_index(search_service, docs, vectors, as_lists)
+            runs.append(run)
+    finally:
+        await search_service.close()
+
+    write_report(
+        "numpy_path",
+        {"docs": args.docs, "dims": settings.embedding_dimension, "runs": runs},
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=20000, help="Corpus size")
+    parser.add_argument("--index", action="store_true", help="Also bulk index into Elasticsearch")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Parity check and benchmark: torch vs ONNX (int8) embedding backends.
+
+Embeds the same synthetic corpus with both backends and reports:
+- cosine agreement between the two vectors of each text (mean/min/p1)
+- top-10 neighbour overlap between the two backends' rankings
+- encode speed (texts/second) for batch and single-text calls
+- resident memory added by loading each backend
+
+Each backend is measured in its own subprocess so RSS numbers do not
+include the other backend. Requires the ``onnx`` extra.
+
+Usage:
+    python scripts/bench_onnx_parity.py --docs 2000 --output parity.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from benchlib import latency_summary, synthetic_documents, write_report
+
+
+def rss_mb() -> float:
+    """Current resident set size in MiB (Linux)."""
+    with open("/proc/self/status", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def measure_backend(backend: str, docs: int, singles: int, seed: int, vectors_path: str):
+    """Load one backend, embed the corpus and save the vectors (runs in a subprocess)."""
+    from app.services.embeddings import EmbeddingService
+
+    texts = [f"{d['title']} {d['content']}" for d in synthetic_documents(docs, seed=seed)]
+    before = rss_mb()
+    started = time.perf_counter()
+    service = EmbeddingService(backend=backend)
+    load_seconds = time.perf_counter() - started
+    loaded = rss_mb()
+
+    # Warm up
+    service.embed_batch(texts[:32])
+
+    started = time.perf_counter()
+    vectors = np.asarray(service.embed_batch(texts), dtype=np.float32)
+    batch_seconds = time.perf_counter() - started
+
+    single_latencies = []
+    for text in texts[:singles]:
+        started = time.perf_counter()
+        service.embed_text(text)
+        single_latencies.append((time.perf_counter() - started) * 1000)
+
+    np.save(vectors_path, vectors)
+    service.close()
+    return {
+        "backend": backend,
+        "model_version": service.model_version,
+        "load_seconds": load_seconds,
+        "rss_model_mb": loaded - before,
+        "rss_peak_mb": rss_mb(),
+        "batch_texts_per_second": len(texts) / batch_seconds,
+        "single_text": latency_summary(single_latencies),
+    }
+
+
+def run_in_subprocess(backend: str, args, vectors_path: str):
+    """Run ``measure_backend`` in a fresh interpreter and return its result."""
+    output = subprocess.run(
+        [
+            sys.executable, __file__, "--measure", backend,
+            "--docs", str(args.docs), "--singles", str(args.singles),
+            "--seed", str(args.seed), "--vectors", vectors_path,
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def agreement(torch_vectors: np.ndarray, onnx_vectors: np.ndarray, top_k: int = 10):
+    """Cosine agreement and neighbour overlap between two embeddings of the same texts."""
+    a = torch_vectors / np.linalg.norm(torch_vectors, axis=1, keepdims=True)
+    b = onnx_vectors / np.linalg.norm(onnx_vectors, axis=1, keepdims=True)
+    cosines = (a * b).sum(axis=1)
+
+    # Use the first 200 texts as queries against the whole corpus
+    queries = min(200, len(a))
+    top_a = np.argsort(-(a[:queries] @ a.T), axis=1)[:, 1:top_k + 1]
+    top_b = np.argsort(-(b[:queries] @ b.T), axis=1)[:, 1:top_k + 1]
+    overlap = [len(set(x) & set(y)) / top_k for x, y in zip(top_a, top_b)]
+
+    return {
+        "cosine_mean": float(cosines.mean()),
+        "cosine_min": float(cosines.min()),
+        "cosine_p1": float(np.percentile(cosines, 1)),
+        f"neighbour_overlap@{top_k}": float(np.mean(overlap)),
+    }
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        runs, vectors = [], {}
+        for backend in ("torch", "onnx"):
+            print(f"Measuring {backend} backend...")
+            path = str(Path(tmp) / f"{backend}.npy")
+            runs.append(run_in_subprocess(backend, args, path))
+            vectors[backend] = np.load(path)
+
+    write_report(
+        "onnx_parity",
+        {
+            "docs": args.docs,
+            "runs": runs,
+            "agreement": agreement(vectors["torch"], vectors["onnx"]),
+            "speedup": runs[1]["batch_texts_per_second"] / runs[0]["batch_texts_per_second"],
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=2000, help="Texts to embed")
+    parser.add_argument("--singles", type=int, default=200, help="Single-text encode calls")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    parser.add_argument("--measure", choices=["torch", "onnx"], help=argparse.SUPPRESS)
+    parser.add_argument("--vectors", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        result = measure_backend(args.measure, args.docs, args.singles, args.seed, args.vectors)
+        print(json.dumps(result))
+    else:
+        main(args)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark search response size and latency with field projection.
+
+Loads synthetic runbooks with long content (``--content-repeat`` copies of
+the body) into a scratch index, then runs the same keyword and semantic
+queries three ways:
+- full: the previous behaviour, fetching the whole ``content`` field
+- summary: projecting to the stored ``summary`` (``RESULT_SOURCE_FIELDS``)
+- highlight: summary plus highlight fragments around matched terms
+
+Reports per mode and search type: p50/p95/p99 latency and the mean
+response size in bytes.
+
+Usage:
+    python scripts/bench_projection.py --docs 5000 --content-repeat 200 --output projection.json
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import orjson
+
+from app.config import settings
+from app.services.search import RESULT_SOURCE_FIELDS, SearchService
+from benchlib import Timer, latency_summary, synthetic_documents, write_report
+
+
+FULL_SOURCE_FIELDS = ["title", "content", "source", "url", "metadata"]
+
+
+async def load(search_service, docs, dims, seed):
+    """Bulk load the corpus with random vectors."""
+    rng = np.random.default_rng(seed)
+
+    async def actions():
+        for start in range(0, len(docs), 500):
+            vectors = rng.standard_normal((min(500, len(docs) - start), dims), dtype=np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            for doc, vector in zip(docs[start:start + 500], vectors):
+                yield search_service.build_action({**doc, "embedding": vector})
+
+    with Timer() as timer:
+        async for _ in search_service.stream_bulk(actions()):
+            pass
+        await search_service.es.indices.refresh(index=search_service.index)
+    return timer.elapsed
+
+
+async def measure(search_service, queries, top_k, source, highlight):
+    """Latency and response size of raw searches over all queries."""
+    latencies, sizes = [], []
+    for query in queries:
+        started = time.perf_counter()
+        result = await search_service.es.search(
+            index=search_service.index,
+            size=top_k,
+            _source=source,
+            highlight=search_service._build_highlight() if highlight else None,
+            **query,
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+        sizes.append(len(orjson.dumps(result.body)))
+    return {**latency_summary(latencies), "mean_bytes": sum(sizes) / len(sizes)}
+
+
+async def main(args):
+    search_service = SearchService()
+    search_service.index = f"{settings.elasticsearch_index}_bench_projection"
+    dims = settings.embedding_dimension
+    docs = list(
+        synthetic_documents(args.docs, seed=args.seed, content_repeat=args.content_repeat)
+    )
+
+    rng = np.random.default_rng(args.seed + 1)
+    vectors = rng.standard_normal((args.queries, dims), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    texts = [docs[i]["title"] for i in rng.integers(0, len(docs), args.queries)]
+    queries = {
+        "keyword": [
+            {"query": {"multi_match": {"query": text, "fields": ["title^2", "content"]}}}
+            for text in texts
+        ],
+        "semantic": [
+            {"query": search_service._vector_query(vector, args.top_k, None)}
+            for vector in vectors
+        ],
+    }
+    modes = {
+        "full": (FULL_SOURCE_FIELDS, False),
+        "summary": (RESULT_SOURCE_FIELDS, False),
+        "highlight": (RESULT_SOURCE_FIELDS, True),
+    }
+
+    runs = {}
+    try:
+        await search_service.es.indices.delete(index=search_service.index, ignore_unavailable=True)
+        await search_service.create_index(search_service.index)
+        load_seconds = await load(search_service, docs, dims, args.seed)
+
+        for search_type, search_queries in queries.items():
+            for mode, (source, highlight) in modes.items():
+                # Highlighting needs matched terms; vector queries have none
+                if highlight and search_type == "semantic":
+                    continue
+                print(f"{search_type} / {mode}...")
+                runs[f"{search_type}_{mode}"] = await measure(
+                    search_service, search_queries, args.top_k, source, highlight
+                )
+    finally:
+        await search_service.es.indices.delete(index=search_service.index, ignore_unavailable=True)
+        await search_service.close()
+
+    write_report(
+        "projection",
+        {
+            "docs": args.docs,
+            "queries": args.queries,
+            "top_k": args.top_k,
+            "mean_content_chars": sum(len(d["content"]) for d in docs) / len(docs),
+            "summary_length": settings.summary_length,
+            "load_seconds": load_seconds,
+            "runs": runs,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=5000, help="Corpus size")
+    parser.add_argument("--content-repeat", type=int, default=200, help="Runbook length factor")
+    parser.add_argument("--queries", type=int, default=100, help="Queries per measurement")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark searching pasted stack traces raw vs by their failure signature.
+
+Loads ``--docs`` stack-trace style failure reports (see
+bench_log_analysis) into a scratch index with the log-aware analyzers
+(with random vectors; keyword search is measured). Queries are log
+excerpts as an agent pastes them: a random report's exception and failing
+frame wrapped in timestamps, request IDs, thread names, framework frames
+and addresses. Relevant: reports of the same exception thrown from the same
+class; the report the excerpt was built from has relevance 2.
+
+Each excerpt is searched as is and by its signature (``query_signature``).
+Reports per variant: query length, p50/p95/p99 keyword search latency,
+precision@k, recall@k, MRR@k, nDCG@k, and how many distinct cache keys
+``--pastes`` pastes of the same failure produce. With ``--embed``, also the
+query embedding latency with the configured model.
+
+Usage:
+    python scripts/bench_query_signature.py --docs 20000 --queries 200 --embed
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.services.cache import SearchCache
+from app.services.embeddings import EmbeddingService
+from app.services.log_parsing import query_signature
+from bench_log_analysis import log_documents
+from bench_retrieval import drop, load_random, make_backend, reset
+from benchlib import Timer, latency_summary, mean_metrics, ranking_metrics, write_report
+
+# Frames of the framework around the application code
+FRAMEWORK_FRAMES = [
+    "org.springframework.web.servlet.FrameworkServlet.service(FrameworkServlet.java:897)",
+    "org.apache.catalina.core.ApplicationFilterChain.doFilter(ApplicationFilterChain.java:166)",
+    "org.apache.tomcat.util.threads.ThreadPoolExecutor.runWorker(ThreadPoolExecutor.java:1191)",
+    "java.base/java.lang.Thread.run(Thread.java:833)",
+]
+
+
+def timestamp(rng):
+    """A random ISO timestamp."""
+    return (
+        f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T"
+        f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}."
+        f"{rng.randint(0, 999):03d}Z"
+    )
+
+
+def pasted_trace(doc, rng):
+    """A log excerpt of the report's failure with fresh volatile tokens."""
+    failure, frame = doc["content"].splitlines()[1:3]
+    request_id = uuid.UUID(int=rng.getrandbits(128))
+    lines = [
+        f"{timestamp(rng)} ERROR [http-nio-8080-exec-{rng.randint(1, 64)}] "
+        f"request {request_id} failed",
+        failure,
+        frame,
+        *(f"    at {line}" for line in FRAMEWORK_FRAMES),
+        f"{timestamp(rng)} WARN  releasing connection 0x{rng.getrandbits(48):012x} "
+        f"(pool {doc['metadata']['module']}-pool@{rng.getrandbits(32):08x})",
+    ]
+    return "\n".join(lines)
+
+
+def cache_key(text):
+    """Cache key of a keyword search for ``text``."""
+    return SearchCache.make_key(text, "keyword", 10)
+
+
+async def run_queries(search_service, queries, top_k, field):
+    """Keyword search every query's ``field`` text; latency and relevance."""
+    latencies, metrics = [], []
+    for query in queries:
+        started = time.perf_counter()
+        hits = await search_service.keyword_search(query[field], top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        metrics.append(ranking_metrics([hit["id"] for hit in hits], query["relevant"], top_k))
+    return {"search": latency_summary(latencies), **mean_metrics(metrics)}
+
+
+async def embed_latency(embedding_service, queries, field):
+    """Query embedding latency of every query's ``field`` text."""
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        await embedding_service.aembed_text(query[field])
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latency_summary(latencies)
+
+
+async def main(args):
+    docs = list(log_documents(args.docs, args.seed))
+    ids_by_key = {}
+    for doc in docs:
+        meta = doc["metadata"]
+        ids_by_key.setdefault((meta["class"], meta["exception"]), []).append(doc["id"])
+
+    rng = random.Random(args.seed + 1)
+    queries = []
+    for doc in rng.sample(docs, min(args.queries, len(docs))):
+        raw = pasted_trace(doc, rng)
+        meta = doc["metadata"]
+        relevant = {doc_id: 1 for doc_id in ids_by_key[(meta["class"], meta["exception"])]}
+        relevant[doc["id"]] = 2
+        queries.append(
+            {"raw": raw, "signature": query_signature(raw) or raw, "relevant": relevant}
+        )
+
+    # Repeated pastes of the same failures: one cache key each, ideally
+    pastes = [[pasted_trace(doc, rng) for _ in range(args.pastes)] for doc in docs[:20]]
+    distinct = {
+        "raw": sum(len({cache_key(p) for p in same}) for same in pastes) / len(pastes),
+        "signature": sum(
+            len({cache_key(query_signature(p) or p) for p in same}) for same in pastes
+        ) / len(pastes),
+    }
+
+    variants = {}
+    search_service = make_backend("es", "query_signature")
+    try:
+        await reset(search_service)
+        with Timer() as load:
+            await load_random(search_service, docs, settings.embedding_dimension, args.seed, set())
+        for field in ("raw", "signature"):
+            # Warm up
+            await run_queries(search_service, queries[:20], args.top_k, field)
+        for field in ("raw", "signature"):
+            variants[field] = {
+                "query_chars": sum(len(q[field]) for q in queries) / len(queries),
+                "cache_keys_per_failure": distinct[field],
+                **await run_queries(search_service, queries, args.top_k, field),
+            }
+    finally:
+        await drop(search_service)
+
+    if args.embed:
+        embedding_service = EmbeddingService()
+        await embedding_service.aembed_text("warm up")
+        for field in ("raw", "signature"):
+            variants[field]["embed"] = await embed_latency(embedding_service, queries, field)
+
+    write_report(
+        "query_signature",
+        {
+            "docs": args.docs,
+            "queries": len(queries),
+            "pastes_per_failure": args.pastes,
+            "top_k": args.top_k,
+            "ingest_seconds": load.elapsed,
+            "embedding_model": settings.embedding_model if args.embed else None,
+            "example": {"raw": queries[0]["raw"], "signature": queries[0]["signature"]},
+            "variants": variants,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=20000, help="Failure reports")
+    parser.add_argument("--queries", type=int, default=200, help="Pasted excerpts searched")
+    parser.add_argument("--pastes", type=int, default=10, help="Pastes per failure (cache keys)")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--embed", action="store_true", help="Also time query embedding")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
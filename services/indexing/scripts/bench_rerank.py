@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark cross-encoder reranking on labeled log-failure queries.
+
+Indexes sample_data.json plus synthetic distractor documents into a scratch
+index, then runs every query in scripts/data/log_failure_queries.json
+through hybrid search with and without the rerank stage. Reports:
+- recall@k, MRR@k and nDCG@k for both
+- retrieval latency and added rerank latency (cold and cached)
+- how often the latency budget cut reranking short
+
+Usage:
+    python scripts/bench_rerank.py --distractors 2000 --top-k 5 --output rerank.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.services.embeddings import EmbeddingService
+from app.services.pipeline import IndexingPipeline
+from app.services.rerank import RerankService
+from app.services.search import SearchService
+from benchlib import (
+    latency_summary,
+    mean_metrics,
+    ranking_metrics,
+    synthetic_documents,
+    write_report,
+)
+
+ROOT = Path(__file__).parent.parent
+LABELS = Path(__file__).parent / "data" / "log_failure_queries.json"
+
+
+async def load_corpus(search_service, embedding_service, distractors, seed):
+    """Index the labeled corpus plus synthetic distractors into a scratch index."""
+    labels = json.loads(LABELS.read_text(encoding="utf-8"))
+    corpus = json.loads((ROOT / labels["corpus"]).read_text(encoding="utf-8"))
+    docs = [{**doc, "id": f"sample-{i}"} for i, doc in enumerate(corpus)]
+    docs += list(synthetic_documents(distractors, seed=seed))
+
+    search_service.index = f"{settings.elasticsearch_index}_bench_rerank"
+    await search_service.es.indices.delete(index=search_service.index, ignore_unavailable=True)
+    await search_service.create_index(search_service.index)
+    async for _ in IndexingPipeline(embedding_service, search_service).run(docs):
+        pass
+    await search_service.es.indices.refresh(index=search_service.index)
+    return labels["queries"]
+
+
+async def main(args):
+    embedding_service = EmbeddingService()
+    search_service = SearchService()
+    rerank_service = RerankService()
+    rerank_service.budget_ms = args.budget_ms
+
+    try:
+        queries = await load_corpus(
+            search_service, embedding_service, args.distractors, args.seed
+        )
+        baseline, reranked = [], []
+        retrieval_ms, rerank_cold_ms, rerank_cached_ms = [], [], []
+
+        for labeled in queries:
+            started = time.perf_counter()
+            embedding = await embedding_service.aembed_text(labeled["query"])
+            candidates = await search_service.hybrid_search(
+                labeled["query"], embedding, max(args.top_k, rerank_service.top_n)
+            )
+            retrieval_ms.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            results = await rerank_service.rerank(labeled["query"], candidates, args.top_k)
+            rerank_cold_ms.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            await rerank_service.rerank(labeled["query"], candidates, args.top_k)
+            rerank_cached_ms.append((time.perf_counter() - started) * 1000)
+
+            relevant = labeled["relevant"]
+            baseline.append(ranking_metrics([r["title"] for r in candidates], relevant, args.top_k))
+            reranked.append(ranking_metrics([r["title"] for r in results], relevant, args.top_k))
+
+        await search_service.es.indices.delete(index=search_service.index, ignore_unavailable=True)
+    finally:
+        rerank_service.close()
+        embedding_service.close()
+        await search_service.close()
+
+    write_report(
+        "rerank",
+        {
+            "queries": len(queries),
+            "distractors": args.distractors,
+            "rerank_model": rerank_service.model_name,
+            "top_n": rerank_service.top_n,
+            "budget_ms": rerank_service.budget_ms,
+            "hybrid": mean_metrics(baseline),
+            "hybrid_reranked": mean_metrics(reranked),
+            "retrieval_latency": latency_summary(retrieval_ms),
+            "rerank_latency_cold": latency_summary(rerank_cold_ms),
+            "rerank_latency_cached": latency_summary(rerank_cached_ms),
+            "budget_exhausted": rerank_service.budget_exhausted,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--distractors", type=int, default=2000, help="Synthetic distractors")
+    parser.add_argument("--top-k", type=int, default=5, help="Results the agent reads")
+    parser.add_argument("--budget-ms", type=float, default=settings.rerank_budget_ms)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
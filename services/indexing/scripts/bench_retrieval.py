@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Benchmark retrieval speed and relevance of the search service.
+
+For each corpus size in ``--scales`` (1k, 100k and 1M by default), loads a
+synthetic log-failure corpus into a scratch Elasticsearch index (``--backend
+es``) or the embedded local index (``--backend local``) and runs generated
+queries through semantic, keyword and hybrid search. Then does the same
+for the labeled query set in scripts/data/log_failure_queries.json over its
+corpus (sample_data.json), always embedded with the configured model.
+
+Synthetic queries are built from a corpus document (title, failing line and
+root cause); that document has relevance 2 and documents with the same
+failure text have relevance 1. With random vectors (the default for
+synthetic corpora) query vectors are perturbed copies of the source
+document's vector, so semantic relevance measures nearest-neighbour recall;
+pass ``--embed`` to embed corpus and queries with the model instead.
+
+Reports per corpus: ingest throughput, and per search type p50/p95/p99
+latency plus recall@k, MRR@k and nDCG@k, as JSON for comparing runs.
+
+Usage:
+    python scripts/bench_retrieval.py --scales 1000 100000 --backend es --output retrieval.json
+    python scripts/bench_retrieval.py --scales 1000000 --backend local --queries 500
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.config import settings
+from app.services.embeddings import EmbeddingService
+from app.services.local_index import LocalVectorIndex
+from app.services.pipeline import IndexingPipeline
+from app.services.search import SearchService
+from benchlib import (
+    Timer,
+    latency_summary,
+    mean_metrics,
+    ranking_metrics,
+    synthetic_documents,
+    write_report,
+)
+
+ROOT = Path(__file__).parent.parent
+LABELS = Path(__file__).parent / "data" / "log_failure_queries.json"
+SEARCH_TYPES = ["semantic", "keyword", "hybrid"]
+_LINE = re.compile(r"at line (\d+)")
+_CAUSE = re.compile(r"Root cause: (.*?)\. Fix:")
+
+
+def make_backend(kind, name):
+    """
+    Search service backed by a scratch ES index or a local index.
+
+    The local backend serves every search from a temporary
+    ``LocalVectorIndex`` through the same fusion code as Elasticsearch.
+    """
+    search_service = SearchService()
+    search_service.index = f"{settings.elasticsearch_index}_bench_{name}"
+    if kind == "local":
+        path = tempfile.mkdtemp(prefix=f"bench_{name}_")
+        search_service.local_index = LocalVectorIndex(path, settings.embedding_dimension)
+        search_service._prefer_local = lambda: True
+    return search_service
+
+
+async def reset(search_service):
+    """Start from an empty index."""
+    if search_service.local_index is not None:
+        search_service.local_index.clear()
+        return
+    await search_service.es.indices.delete(index=search_service.index, ignore_unavailable=True)
+    await search_service.create_index(search_service.index)
+
+
+async def drop(search_service):
+    """Delete the scratch index and close the service."""
+    if search_service.local_index is not None:
+        path = search_service.local_index.path
+        await search_service.close()
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    await search_service.es.indices.delete(index=search_service.index, ignore_unavailable=True)
+    await search_service.close()
+
+
+async def load_random(search_service, docs, dims, seed, keep):
+    """Load ``docs`` with random unit vectors; returns the vectors at positions in ``keep``."""
+    rng = np.random.default_rng(seed)
+    kept = {}
+
+    async def actions():
+        batch = []
+        for position, doc in enumerate(docs):
+            batch.append((position, doc))
+            if len(batch) == 1000:
+                for action in vectors_for(batch):
+                    yield action
+                batch = []
+        for action in vectors_for(batch):
+            yield action
+
+    def vectors_for(batch):
+        vectors = rng.standard_normal((len(batch), dims), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        for (position, doc), vector in zip(batch, vectors):
+            if position in keep:
+                kept[position] = vector
+            yield search_service.build_action({**doc, "embedding": vector})
+
+    if search_service.local_index is not None:
+        async for action in actions():
+            search_service.local_index.apply(action)
+        search_service.local_index.flush()
+    else:
+        async for _ in search_service.stream_bulk(actions()):
+            pass
+        await search_service.es.indices.refresh(index=search_service.index)
+    return kept
+
+
+async def load_embedded(search_service, embedding_service, docs, batch_size=256):
+    """Load ``docs`` embedded with the model (through the ingest pipeline for ES)."""
+    if search_service.local_index is None:
+        pipeline = IndexingPipeline(embedding_service, search_service, incremental=False)
+        async for ok, result in pipeline.run(docs):
+            if not ok:
+                print(f"  Failed to index {result['id']}: {result.get('error')}")
+        await search_service.es.indices.refresh(index=search_service.index)
+        return
+
+    batch = []
+    for doc in itertools.chain(docs, [None]):
+        if doc is not None:
+            batch.append(doc)
+        if batch and (doc is None or len(batch) == batch_size):
+            texts = [f"{d['title']} {d['content']}" for d in batch]
+            embeddings = await embedding_service.aembed_batch(texts)
+            for d, embedding in zip(batch, embeddings):
+                search_service.local_index.apply(
+                    search_service.build_action({**d, "embedding": embedding})
+                )
+            batch = []
+    search_service.local_index.flush()
+
+
+def relevance_key(doc):
+    """Documents with the same key describe the same failure."""
+    return doc["content"]
+
+
+def synthetic_query(doc):
+    """A query naming the failure, the failing line and the root cause of ``doc``."""
+    line = _LINE.search(doc["content"]).group(1)
+    cause = _CAUSE.search(doc["content"]).group(1)
+    return f"{doc['title']} at line {line}, probably {cause}"
+
+
+async def run_queries(search_service, queries, vectors, top_k):
+    """Run every query through each search type; returns latency and relevance per type."""
+    results = {}
+    for search_type in SEARCH_TYPES:
+        latencies, metrics = [], []
+        for labeled, vector in zip(queries, vectors):
+            started = time.perf_counter()
+            if search_type == "semantic":
+                hits = await search_service.semantic_search(vector, top_k)
+            elif search_type == "keyword":
+                hits = await search_service.keyword_search(labeled["query"], top_k)
+            else:
+                hits = await search_service.hybrid_search(labeled["query"], vector, top_k)
+            latencies.append((time.perf_counter() - started) * 1000)
+            ranked = [hit[labeled.get("key", "id")] for hit in hits]
+            metrics.append(ranking_metrics(ranked, labeled["relevant"], top_k))
+        results[search_type] = {"latency": latency_summary(latencies), **mean_metrics(metrics)}
+    return results
+
+
+async def bench_scale(args, scale, embedding_service):
+    """Load a synthetic corpus of ``scale`` documents and measure retrieval."""
+    dims = settings.embedding_dimension
+    rng = np.random.default_rng(args.seed + scale)
+    wanted = set(rng.integers(0, scale, args.queries).tolist())
+    picks = sorted(wanted)
+    sources = {
+        position: doc
+        for position, doc in enumerate(synthetic_documents(scale, seed=args.seed))
+        if position in wanted
+    }
+    by_key = {relevance_key(doc): position for position, doc in sources.items()}
+    relevant = {position: {doc["id"]: 2} for position, doc in sources.items()}
+
+    def corpus():
+        # Second pass over the (deterministic) corpus: collect same-failure documents
+        for doc in synthetic_documents(scale, seed=args.seed):
+            position = by_key.get(relevance_key(doc))
+            if position is not None:
+                relevant[position].setdefault(doc["id"], 1)
+            yield doc
+
+    search_service = make_backend(args.backend, f"retrieval_{scale}")
+    try:
+        await reset(search_service)
+        with Timer() as load:
+            if args.embed:
+                await load_embedded(search_service, embedding_service, corpus())
+            else:
+                kept = await load_random(search_service, corpus(), dims, args.seed, wanted)
+
+        queries = [
+            {"query": synthetic_query(sources[p]), "relevant": relevant[p]} for p in picks
+        ]
+        if args.embed:
+            vectors = await embedding_service.aembed_batch([q["query"] for q in queries])
+        else:
+            noise = rng.standard_normal((len(picks), dims), dtype=np.float32) * 0.05
+            vectors = np.stack([kept[p] for p in picks]) + noise
+
+        return {
+            "docs": scale,
+            "queries": len(queries),
+            "vectors": "model" if args.embed else "random",
+            "ingest_seconds": load.elapsed,
+            "ingest_docs_per_second": scale / load.elapsed,
+            **await run_queries(search_service, queries, vectors, args.top_k),
+        }
+    finally:
+        await drop(search_service)
+
+
+async def bench_labeled(args, embedding_service):
+    """Measure retrieval quality on the labeled log-failure queries."""
+    labels = json.loads(Path(args.labels).read_text(encoding="utf-8"))
+    corpus = json.loads((ROOT / labels["corpus"]).read_text(encoding="utf-8"))
+    docs = [{**doc, "id": f"labeled-{i}"} for i, doc in enumerate(corpus)]
+    docs += list(synthetic_documents(args.distractors, seed=args.seed))
+
+    search_service = make_backend(args.backend, "retrieval_labeled")
+    try:
+        await reset(search_service)
+        with Timer() as load:
+            await load_embedded(search_service, embedding_service, docs)
+
+        # Labels refer to documents by title
+        queries = [{**labeled, "key": "title"} for labeled in labels["queries"]]
+        vectors = await embedding_service.aembed_batch([q["query"] for q in queries])
+        return {
+            "labels": str(args.labels),
+            "docs": len(docs),
+            "queries": len(queries),
+            "ingest_seconds": load.elapsed,
+            "ingest_docs_per_second": len(docs) / load.elapsed,
+            **await run_queries(search_service, queries, vectors, args.top_k),
+        }
+    finally:
+        await drop(search_service)
+
+
+async def main(args):
+    embedding_service = EmbeddingService()
+    try:
+        runs = []
+        for scale in args.scales:
+            print(f"Synthetic corpus of {scale} documents ({args.backend})...")
+            runs.append(await bench_scale(args, scale, embedding_service))
+        labeled = None
+        if not args.skip_labeled:
+            print(f"Labeled queries ({args.backend})...")
+            labeled = await bench_labeled(args, embedding_service)
+    finally:
+        embedding_service.close()
+
+    write_report(
+        "retrieval",
+        {
+            "backend": args.backend,
+            "top_k": args.top_k,
+            "embedding_model": settings.embedding_model,
+            "vector_storage": settings.vector_storage,
+            "synthetic": runs,
+            "labeled": labeled,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=[1000, 100000, 1000000],
+        help="Synthetic corpus sizes",
+    )
+    parser.add_argument("--backend", choices=["es", "local"], default="es")
+    parser.add_argument("--queries", type=int, default=200, help="Synthetic queries per corpus")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--embed", action="store_true", help="Embed synthetic corpora too")
+    parser.add_argument("--labels", default=str(LABELS), help="Labeled query set")
+    parser.add_argument("--distractors", type=int, default=2000, help="For the labeled set")
+    parser.add_argument("--skip-labeled", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark restoring the knowledge base from a snapshot vs re-embedding it.
+
+Loads ``--docs`` synthetic log-failure documents (1M by default) with
+random vectors into a scratch index, exports it to a Parquet and an Arrow
+snapshot, and restores each into an empty scratch index with the stored
+embeddings. Restored documents are checked against the source: count and
+the vectors of a sample.
+
+Re-embedding is measured by importing the first ``--reembed-docs`` of the
+snapshot with ``reembed`` (the configured model embeds every document, as
+rebuilding through /index would); its throughput is extrapolated to the
+full corpus, since re-embedding 1M documents on CPU takes hours.
+
+Reports per format: export seconds, file size, restore seconds and
+documents/second; and re-embed documents/second with the projected time
+for the corpus.
+
+Usage:
+    python scripts/bench_snapshot.py --docs 1000000 --reembed-docs 20000 --output snapshot.json
+"""
+
+import argparse
+import asyncio
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.config import settings
+from app.services.embeddings import EmbeddingService
+from app.services.snapshot import export_snapshot, import_snapshot
+from bench_retrieval import drop, load_random, make_backend, reset
+from benchlib import Timer, synthetic_documents, write_report
+
+FORMATS = {"parquet": "kb.parquet", "arrow": "kb.arrow"}
+
+
+async def check_restore(source, target, sample):
+    """Compare document count and a sample of vectors between two indices."""
+    count = await target.count_documents()
+    expected = await source.get_documents(sample)
+    restored = await target.get_documents(sample)
+    mismatched = sum(
+        1
+        for doc_id, doc in expected.items()
+        if doc_id not in restored
+        or not np.allclose(doc["embedding"], restored[doc_id]["embedding"], atol=1e-6)
+    )
+    return {"documents": count, "sample": len(sample), "mismatched": mismatched}
+
+
+def reembed_subset(snapshot, path, docs):
+    """Write the first ``docs`` rows of a Parquet snapshot to ``path``."""
+    table = pq.read_table(snapshot).slice(0, docs)
+    pq.write_table(table, path)
+    return table.num_rows
+
+
+async def main(args):
+    workdir = Path(tempfile.mkdtemp(prefix="bench_snapshot_"))
+    source = make_backend("es", "snapshot_source")
+    target = make_backend("es", "snapshot_target")
+    formats, reembed = {}, {}
+    try:
+        print(f"Loading {args.docs} documents...")
+        await reset(source)
+        with Timer() as load:
+            await load_random(
+                source,
+                synthetic_documents(args.docs, seed=args.seed),
+                settings.embedding_dimension,
+                args.seed,
+                set(),
+            )
+        sample = [f"synthetic-{i:08d}" for i in range(0, args.docs, max(1, args.docs // 1000))]
+
+        for name, file_name in FORMATS.items():
+            path = workdir / file_name
+            print(f"Exporting to {name}...")
+            with Timer() as export:
+                exported = await export_snapshot(source, path)
+            print(f"Restoring from {name}...")
+            await reset(target)
+            with Timer() as restore:
+                imported = await import_snapshot(target, path)
+            formats[name] = {
+                "export_seconds": export.elapsed,
+                "bytes": exported["bytes"],
+                "bytes_per_document": exported["bytes"] / max(exported["documents"], 1),
+                "restore_seconds": restore.elapsed,
+                "restore_docs_per_second": imported["imported"] / restore.elapsed,
+                "failed": imported["failed"],
+                "reembedded": imported["reembedded"],
+                "check": await check_restore(source, target, sample),
+            }
+
+        print(f"Re-embedding {args.reembed_docs} documents...")
+        subset = workdir / "subset.parquet"
+        rows = reembed_subset(workdir / FORMATS["parquet"], subset, args.reembed_docs)
+        embedding_service = EmbeddingService()
+        await embedding_service.aembed_text("warm up")
+        await reset(target)
+        with Timer() as timer:
+            imported = await import_snapshot(
+                target, subset, embedding_service=embedding_service, reembed=True
+            )
+        rate = imported["imported"] / timer.elapsed
+        reembed = {
+            "documents": rows,
+            "seconds": timer.elapsed,
+            "docs_per_second": rate,
+            "projected_seconds": args.docs / rate,
+        }
+    finally:
+        await drop(source)
+        await drop(target)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    write_report(
+        "snapshot",
+        {
+            "docs": args.docs,
+            "dimension": settings.embedding_dimension,
+            "embedding_model": settings.embedding_model,
+            "ingest_seconds": load.elapsed,
+            "pyarrow": pa.__version__,
+            "formats": formats,
+            "reembed": reembed,
+            "restore_speedup": {
+                name: reembed["projected_seconds"] / result["restore_seconds"]
+                for name, result in formats.items()
+            },
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=1_000_000, help="Documents in the corpus")
+    parser.add_argument(
+        "--reembed-docs", type=int, default=20000, help="Documents re-embedded to measure the rate"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Benchmark tenant-scoped search with and without shard routing.
+
+Loads ``--tenants`` tenants (repositories) of ``--docs-per-tenant``
+synthetic log-failure documents each, plus ``--shared`` documents shared
+by all tenants, into a scratch index of ``--shards`` shards, with random
+vectors so no model is needed. The corpus is loaded twice: routed by
+document ID and routed by tenant.
+
+Queries are built from a random document of a random tenant (see
+bench_retrieval); that document has relevance 2 and documents of the same
+tenant with the same failure text have relevance 1. Same-text documents of
+other tenants are not relevant: they describe another repository.
+
+Setups:
+- unscoped: no tenant scope, every shard searched (the previous behaviour)
+- filtered: tenant filter, index routed by ID (every shard searched)
+- routed: tenant filter, index routed by tenant (the tenant's shard and
+  the shared documents' shard searched)
+
+Reports per setup and search type: p50/p95/p99 latency, recall@k, MRR@k,
+nDCG@k and the share of results from other tenants.
+
+Usage:
+    python scripts/bench_tenants.py --tenants 100 --docs-per-tenant 10000 --shards 8
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.config import settings
+from app.services.tenants import SHARED_TENANT, tenant_scope
+from bench_retrieval import drop, load_random, make_backend, relevance_key, reset, synthetic_query
+from benchlib import (
+    Timer,
+    latency_summary,
+    mean_metrics,
+    ranking_metrics,
+    synthetic_documents,
+    write_report,
+)
+
+SEARCH_TYPES = ["semantic", "keyword", "hybrid"]
+
+
+def tenant_name(number):
+    """Name of the ``number``-th tenant."""
+    return f"repo-{number:03d}"
+
+
+def corpus(tenants, docs_per_tenant, shared, seed):
+    """Every tenant's documents, then the shared ones; IDs are ``<tenant>/<id>``."""
+    owners = [(tenant_name(t), docs_per_tenant, seed + t) for t in range(tenants)]
+    owners.append((SHARED_TENANT, shared, seed - 1))
+    for tenant, count, tenant_seed in owners:
+        for doc in synthetic_documents(count, seed=tenant_seed):
+            yield {**doc, "id": f"{tenant}/{doc['id']}", "tenant": tenant}
+
+
+async def load(args, routed, picks):
+    """Load the corpus into a scratch index; returns it with the picked documents' vectors."""
+    settings.tenant_routing = routed
+    search_service = make_backend("es", f"tenants_{'routed' if routed else 'id'}")
+    search_service.tenant_routing = routed
+    await reset(search_service)
+
+    # First pass over the (deterministic) corpus: the picked query documents
+    wanted = set(picks)
+    sources = {
+        position: doc
+        for position, doc in enumerate(
+            corpus(args.tenants, args.docs_per_tenant, args.shared, args.seed)
+        )
+        if position in wanted
+    }
+    by_key = {(doc["tenant"], relevance_key(doc)): p for p, doc in sources.items()}
+    relevant = {position: {doc["id"]: 2} for position, doc in sources.items()}
+
+    def labeled():
+        # Second pass: collect same-failure documents of the same tenant
+        for doc in corpus(args.tenants, args.docs_per_tenant, args.shared, args.seed):
+            position = by_key.get((doc["tenant"], relevance_key(doc)))
+            if position is not None:
+                relevant[position].setdefault(doc["id"], 1)
+            yield doc
+
+    with Timer() as timer:
+        kept = await load_random(
+            search_service, labeled(), settings.embedding_dimension, args.seed, wanted
+        )
+    return search_service, sources, relevant, kept, timer.elapsed
+
+
+async def run_setup(search_service, queries, top_k, scoped):
+    """Run every query through each search type; returns latency, relevance and leakage."""
+    results = {}
+    for search_type in SEARCH_TYPES:
+        latencies, metrics, foreign = [], [], []
+        for query in queries:
+            filters = {"tenant": tenant_scope(query["tenant"])} if scoped else None
+            started = time.perf_counter()
+            if search_type == "semantic":
+                hits = await search_service.semantic_search(query["vector"], top_k, filters)
+            elif search_type == "keyword":
+                hits = await search_service.keyword_search(query["query"], top_k, filters)
+            else:
+                hits = await search_service.hybrid_search(
+                    query["query"], query["vector"], top_k, filters
+                )
+            latencies.append((time.perf_counter() - started) * 1000)
+            ranked = [hit["id"] for hit in hits]
+            metrics.append(ranking_metrics(ranked, query["relevant"], top_k))
+            owners = [doc_id.split("/", 1)[0] for doc_id in ranked]
+            others = [o for o in owners if o not in (query["tenant"], SHARED_TENANT)]
+            foreign.append(len(others) / len(owners) if owners else 0.0)
+        results[search_type] = {
+            "latency": latency_summary(latencies),
+            **mean_metrics(metrics),
+            "foreign_tenant_results": sum(foreign) / len(foreign),
+        }
+    return results
+
+
+async def main(args):
+    tenant_docs = args.tenants * args.docs_per_tenant
+    total = tenant_docs + args.shared
+    rng = np.random.default_rng(args.seed)
+    # Queries come from tenant documents, not the shared ones
+    picks = sorted(set(rng.integers(0, tenant_docs, args.queries).tolist()))
+    # Same query vectors for both loads (random vectors are seeded alike)
+    noise = rng.standard_normal((len(picks), settings.embedding_dimension), dtype=np.float32)
+    original = settings.tenant_routing, settings.elasticsearch_shards
+    settings.elasticsearch_shards = args.shards
+
+    setups, loads = {}, {}
+    try:
+        for routed in (False, True):
+            print(f"Loading {total} documents routed by {'tenant' if routed else 'ID'}...")
+            search_service, sources, relevant, kept, elapsed = await load(args, routed, picks)
+            loads["tenant" if routed else "id"] = {
+                "ingest_seconds": elapsed,
+                "ingest_docs_per_second": total / elapsed,
+            }
+            try:
+                queries = [
+                    {
+                        "query": synthetic_query(sources[p]),
+                        "tenant": sources[p]["tenant"],
+                        "vector": kept[p] + noise[i] * 0.05,
+                        "relevant": relevant[p],
+                    }
+                    for i, p in enumerate(picks)
+                ]
+                runs = [("routed", True)] if routed else [("unscoped", False), ("filtered", True)]
+                for name, scoped in runs:
+                    print(f"  {name}...")
+                    setups[name] = await run_setup(search_service, queries, args.top_k, scoped)
+            finally:
+                await drop(search_service)
+    finally:
+        settings.tenant_routing, settings.elasticsearch_shards = original
+
+    write_report(
+        "tenants",
+        {
+            "tenants": args.tenants,
+            "docs_per_tenant": args.docs_per_tenant,
+            "shared_docs": args.shared,
+            "documents": total,
+            "shards": args.shards,
+            "queries": len(picks),
+            "top_k": args.top_k,
+            "vector_storage": settings.vector_storage,
+            "loads": loads,
+            "setups": setups,
+        },
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenants", type=int, default=100, help="Tenants (repositories)")
+    parser.add_argument("--docs-per-tenant", type=int, default=10000)
+    parser.add_argument("--shared", type=int, default=1000, help="Documents shared by all")
+    parser.add_argument("--shards", type=int, default=8, help="Primary shards")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per setup")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark vector storage modes: float vs int8_hnsw vs binary.
+
+For each mode the same embedded corpus is loaded into a scratch index built
+with that mode's mapping, then a set of held-out queries is run through
+``SearchService.semantic_search``. Reports per mode:
+- estimated vector RAM per million vectors (HNSW graph + quantized vectors)
+- on-disk size of the vector fields (``_disk_usage``)
+- p50/p95/p99 query latency
+- recall@10 against exact cosine ranking computed with NumPy
+
+int8_hnsw requires Elasticsearch >= 8.12, binary requires >= 8.15.
+
+Usage:
+    python scripts/bench_vector_storage.py --docs 20000 --queries 200 --output vectors.json
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.config import settings
+from app.services.embeddings import EmbeddingService
+from app.services.search import SearchService
+from benchlib import latency_summary, synthetic_documents, write_report
+
+
+MODES = ["float", "int8_hnsw", "binary"]
+
+# Approximate HNSW graph overhead per vector (m=16 neighbours, 2 layers, 4-byte ids)
+HNSW_GRAPH_BYTES = 16 * 2 * 4
+
+
+def vector_ram_bytes(mode: str, dims: int) -> int:
+    """Estimated off-heap bytes per vector that must stay in RAM for fast kNN."""
+    if mode == "int8_hnsw":
+        # int8 vector plus a float correction term
+        return dims + 4 + HNSW_GRAPH_BYTES
+    if mode == "binary":
+        return dims // 8 + HNSW_GRAPH_BYTES
+    return dims * 4 + HNSW_GRAPH_BYTES
+
+
+async def bench_mode(mode, search_service, docs, doc_vectors, queries, query_vectors, top_k):
+    """Load the corpus with ``mode`` and measure latency and recall."""
+    settings.vector_storage = mode
+    index = f"{settings.elasticsearch_index}_bench_{mode}"
+    search_service.index = index
+    await search_service.es.indices.delete(index=index, ignore_unavailable=True)
+    await search_service.create_index(index)
+
+    async def actions():
+        for doc, vector in zip(docs, doc_vectors):
+            yield search_service.build_action({**doc, "embedding": vector.tolist()}, index=index)
+
+    async for _ in search_service.stream_bulk(actions()):
+        pass
+    await search_service.es.indices.refresh(index=index)
+    await search_service.es.indices.forcemerge(index=index, max_num_segments=1)
+
+    # Exact ground truth
+    truth = np.argsort(-(query_vectors @ doc_vectors.T), axis=1)[:, :top_k]
+    ids = [doc["id"] for doc in docs]
+
+    latencies, recalls = [], []
+    for query_vector, expected in zip(query_vectors, truth):
+        started = time.perf_counter()
+        results = await search_service.semantic_search(query_vector.tolist(), top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        expected_ids = {ids[i] for i in expected}
+        recalls.append(len(expected_ids & {r["id"] for r in results}) / top_k)
+
+    disk = await search_service.es.indices.disk_usage(index=index, run_expensive_tasks=True)
+    fields = disk[index]["fields"]
+    vector_disk = sum(
+        fields.get(name, {}).get("total_in_bytes", 0) for name in ("embedding", "embedding_bits")
+    )
+
+    await search_service.es.indices.delete(index=index, ignore_unavailable=True)
+    dims = doc_vectors.shape[1]
+    return {
+        "mode": mode,
+        "ram_bytes_per_vector": vector_ram_bytes(mode, dims),
+        "ram_mb_per_million": vector_ram_bytes(mode, dims) * 1_000_000 / 1024 / 1024,
+        "vector_disk_bytes_per_vector": vector_disk / len(docs),
+        "latency": latency_summary(latencies),
+        f"recall@{top_k}": sum(recalls) / len(recalls),
+    }
+
+
+async def main(args):
+    embedding_service = EmbeddingService()
+    search_service = SearchService()
+    original_mode = settings.vector_storage
+
+    corpus = list(synthetic_documents(args.docs + args.queries, seed=args.seed))
+    docs, held_out = corpus[: args.docs], corpus[args.docs:]
+    print(f"Embedding {len(corpus)} documents...")
+    doc_vectors = np.asarray(
+        embedding_service.embed_batch([f"{d['title']} {d['content']}" for d in docs]),
+        dtype=np.float32,
+    )
+    query_vectors = np.asarray(
+        embedding_service.embed_batch([d["content"] for d in held_out]),
+        dtype=np.float32,
+    )
+    # Normalize so the dot product equals cosine similarity
+    doc_vectors /= np.linalg.norm(doc_vectors, axis=1, keepdims=True)
+    query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+
+    runs = []
+    try:
+        for mode in args.modes:
+            print(f"Benchmarking {mode}...")
+            runs.append(
+                await bench_mode(
+                    mode, search_service, docs, doc_vectors, held_out, query_vectors, args.top_k
+                )
+            )
+    finally:
+        settings.vector_storage = original_mode
+        await search_service.close()
+
+    write_report(
+        "vector_storage",
+        {"docs": args.docs, "queries": args.queries, "dims": doc_vectors.shape[1], "runs": runs},
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=20000, help="Corpus size")
+    parser.add_argument("--queries", type=int, default=200, help="Held-out queries")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    asyncio.run(main(parser.parse_args()))
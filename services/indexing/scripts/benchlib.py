@@ -0,0 +1,198 @@
+"""
+Shared helpers for Indexing Service benchmark scripts.
+
+Provides a deterministic synthetic corpus of CI/log-failure documents,
+latency summaries and JSON report output so runs can be compared.
+"""
+
+import json
+import math
+import platform
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# Building blocks for synthetic failure documents
+EXCEPTIONS = [
+    ("java", "NullPointerException", "java.lang.NullPointerException"),
+    ("java", "OutOfMemoryError", "java.lang.OutOfMemoryError: Java heap space"),
+    ("java", "ClassNotFoundException", "java.lang.ClassNotFoundException"),
+    ("python", "ModuleNotFoundError", "ModuleNotFoundError: No module named"),
+    ("python", "KeyError", "KeyError"),
+    ("python", "TimeoutError", "asyncio.exceptions.TimeoutError"),
+    ("go", "panic", "panic: runtime error: invalid memory address or nil pointer dereference"),
+    ("node", "ECONNREFUSED", "Error: connect ECONNREFUSED 127.0.0.1:5432"),
+    ("docker", "ExitCode137", "container exited with code 137 (OOMKilled)"),
+    ("k8s", "CrashLoopBackOff", "Back-off restarting failed container (CrashLoopBackOff)"),
+    ("gradle", "BuildFailed", "FAILURE: Build failed with an exception. Execution failed for task"),
+    ("npm", "ERESOLVE", "npm ERR! code ERESOLVE unable to resolve dependency tree"),
+]
+
+COMPONENTS = [
+    "UserService", "PaymentGateway", "BatchProcessor", "AuthController", "OrderRepository",
+    "InventorySync", "NotificationWorker", "ReportExporter", "SessionCache", "SearchIndexer",
+]
+
+CAUSES = [
+    "missing null check before dereferencing the result of a database lookup",
+    "connection pool exhaustion caused by connections that are never closed",
+    "loading the full dataset into memory instead of streaming it in pages",
+    "a dependency version conflict introduced by an unpinned transitive package",
+    "a flaky integration test that depends on wall-clock timing",
+    "an expired credential mounted from the CI secret store",
+    "a race condition between cache invalidation and concurrent writers",
+    "a misconfigured health check that kills the container during warm-up",
+]
+
+FIXES = [
+    "Add a guard clause and return a 404 when the entity does not exist.",
+    "Use a context manager so connections are always returned to the pool.",
+    "Process records in batches of 1000 using an iterator.",
+    "Pin the dependency and regenerate the lock file.",
+    "Replace sleeps with explicit readiness polling in the test.",
+    "Rotate the credential and reference it from the secret manager.",
+    "Serialize writers with a lock or use compare-and-set updates.",
+    "Increase the start period of the health check and add a readiness probe.",
+]
+
+
+def synthetic_documents(
+    count: int,
+    seed: int = 42,
+    content_repeat: int = 1,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generate deterministic synthetic log-failure documents.
+
+    Args:
+        count: Number of documents
+        seed: Random seed (same seed -> same corpus)
+        content_repeat: Repeat the body this many times to simulate long runbooks
+
+    Yields:
+        Documents shaped like ``DocumentIndexRequest`` payloads (with ``id``)
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        language, name, message = rng.choice(EXCEPTIONS)
+        component = rng.choice(COMPONENTS)
+        cause_idx = rng.randrange(len(CAUSES))
+        body = (
+            f"{message} in {component}.process() at line {rng.randint(10, 900)}. "
+            f"Root cause: {CAUSES[cause_idx]}. Fix: {FIXES[cause_idx]}"
+        )
+        yield {
+            "id": f"synthetic-{i:08d}",
+            "title": f"{name} in {component}",
+            "content": " ".join([body] * content_repeat),
+            "metadata": {
+                "source": "synthetic",
+                "category": language,
+                "language": language,
+                "error_type": name,
+                "severity": rng.choice(["low", "medium", "high", "critical"]),
+                "tags": [language, component.lower(), name.lower()],
+            },
+        }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the ``pct`` percentile (0-100) of ``values`` using nearest rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def latency_summary(samples_ms: List[float]) -> Dict[str, float]:
+    """Summarize latency samples in milliseconds."""
+    return {
+        "count": len(samples_ms),
+        "mean_ms": sum(samples_ms) / len(samples_ms) if samples_ms else 0.0,
+        "p50_ms": percentile(samples_ms, 50),
+        "p95_ms": percentile(samples_ms, 95),
+        "p99_ms": percentile(samples_ms, 99),
+    }
+
+
+def ranking_metrics(
+    ranked: List[str],
+    relevant: Dict[str, int],
+    k: int,
+) -> Dict[str, float]:
+    """
+    Rank-quality metrics for one query.
+
+    Args:
+        ranked: Result keys, best first
+        relevant: Relevance grade per relevant key (> 0)
+        k: Cutoff
+
+    Returns:
+        precision@k, recall@k, MRR@k (first relevant hit) and nDCG@k (graded)
+    """
+    top = ranked[:k]
+    hits = [key for key in top if relevant.get(key, 0) > 0]
+    rr = next((1.0 / (i + 1) for i, key in enumerate(top) if relevant.get(key, 0) > 0), 0.0)
+    dcg = sum((2 ** relevant.get(key, 0) - 1) / math.log2(i + 2) for i, key in enumerate(top))
+    ideal = sorted(relevant.values(), reverse=True)[:k]
+    idcg = sum((2 ** grade - 1) / math.log2(i + 2) for i, grade in enumerate(ideal))
+    return {
+        f"precision@{k}": len(hits) / k,
+        f"recall@{k}": len(hits) / len(relevant) if relevant else 0.0,
+        f"mrr@{k}": rr,
+        f"ndcg@{k}": dcg / idcg if idcg else 0.0,
+    }
+
+
+def mean_metrics(per_query: List[Dict[str, float]]) -> Dict[str, float]:
+    """Average per-query metric dicts."""
+    if not per_query:
+        return {}
+    return {key: sum(m[key] for m in per_query) / len(per_query) for key in per_query[0]}
+
+
+class Timer:
+    """Context manager measuring elapsed wall-clock time in seconds."""
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.elapsed = time.perf_counter() - self.start
+
+
+def write_report(
+    name: str,
+    results: Dict[str, Any],
+    output: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Print a benchmark report and optionally write it as JSON.
+
+    Args:
+        name: Benchmark name
+        results: Benchmark results
+        output: Optional path for the JSON report
+
+    Returns:
+        Full report including run metadata
+    """
+    report = {
+        "benchmark": name,
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        Path(output).write_text(text, encoding="utf-8")
+    return report
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Back up and restore the knowledge base with its embeddings.
+
+``export`` writes every document behind the alias (or one tenant's) with
+its stored embedding to a Parquet (``.parquet``) or Arrow IPC (``.arrow``)
+snapshot. ``import`` bulk-loads a snapshot back into the index, creating
+it if needed, without re-embedding: embeddings are only recomputed for
+documents whose model differs from the index's (or all of them with
+``--reembed``). To restore into a new cluster without re-embedding,
+configure the snapshot's model (``info`` shows it) before importing.
+
+Requires the ``snapshot`` extra (pyarrow).
+
+Usage:
+    python scripts/kb_snapshot.py export kb.parquet
+    python scripts/kb_snapshot.py export repo-a.arrow --tenant repo-a
+    python scripts/kb_snapshot.py info kb.parquet
+    python scripts/kb_snapshot.py import kb.parquet
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.search import SearchService
+from app.services.snapshot import export_snapshot, import_snapshot, read_snapshot_meta
+from app.services.tenants import tenant_filter, tenant_scope
+
+
+async def main(args):
+    if args.command == "info":
+        print(json.dumps(read_snapshot_meta(args.path), indent=2))
+        return
+
+    search_service = SearchService()
+    try:
+        await search_service.ensure_index()
+        if args.command == "export":
+            query = None
+            if args.tenant:
+                query = {"bool": {"filter": [tenant_filter(tenant_scope(args.tenant, False))]}}
+            result = await export_snapshot(search_service, args.path, query, args.batch_size)
+            print(
+                f"Exported {result['documents']} documents "
+                f"({result['bytes'] / 1e6:.1f} MB) to {args.path}"
+            )
+        else:
+            meta = read_snapshot_meta(args.path)
+            if meta.get("embedding_model_version") != search_service.embedding_model_version:
+                print(
+                    f"Snapshot embeddings come from {meta.get('embedding_model_version')}, "
+                    f"the index uses {search_service.embedding_model_version}: re-embedding"
+                )
+            result = await import_snapshot(
+                search_service, args.path, reembed=args.reembed, batch_size=args.batch_size
+            )
+            print(
+                f"Imported {result['imported']} of {result['documents']} documents in "
+                f"{result['seconds']:.1f}s ({result['reembedded']} re-embedded, "
+                f"{result['failed']} failed)"
+            )
+    finally:
+        await search_service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", choices=["export", "import", "info"])
+    parser.add_argument("path", type=Path, help="Snapshot file (.parquet or .arrow)")
+    parser.add_argument("--tenant", help="Export only this tenant's documents")
+    parser.add_argument("--reembed", action="store_true", help="Re-embed every document on import")
+    parser.add_argument("--batch-size", type=int, help="Documents per record batch")
+    asyncio.run(main(parser.parse_args()))
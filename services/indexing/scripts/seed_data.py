@@ -13,6 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.config import settings
 from app.services.embeddings import EmbeddingService
+from app.services.pipeline import IndexingPipeline
 from app.services.search import SearchService
 
 
@@ -361,46 +362,56 @@ SEED_DOCUMENTS = [
 
 
 async def seed_knowledge_base():
-    """Seed the knowledge base with initial documents."""
+    """
+    Seed the knowledge base with initial documents.
+
+    Seeding is incremental: documents whose content and embedding model are
+    unchanged since the last run are skipped, so re-running is cheap.
+    """
     print(f"Starting knowledge base seeding...")
-    print(f"Elasticsearch URL: {settings.ELASTICSEARCH_URL}")
-    print(f"Target index: {settings.ELASTICSEARCH_INDEX}")
-    print(f"Embedding model: {settings.EMBEDDING_MODEL}")
+    print(f"Elasticsearch URL: {settings.elasticsearch_url}")
+    print(f"Target index: {settings.elasticsearch_index}")
+    print(f"Embedding model: {settings.embedding_model}")
     
     # Initialize services
     print("\nInitializing embedding service...")
     embedding_service = EmbeddingService()
     
     print("Initializing search service...")
-    search_service = SearchService(embedding_service)
-    await search_service.initialize()
-    
-    # Prepare documents for batch indexing
-    print(f"\nPreparing {len(SEED_DOCUMENTS)} documents for indexing...")
-    documents_to_index = []
+    search_service = SearchService()
+    await search_service.ensure_index()
     
-    for doc in SEED_DOCUMENTS:
-        # Generate embedding for the content
-        full_text = f"{doc['title']} {doc['content']}"
-        embedding = embedding_service.embed_text(full_text)
-        
-        documents_to_index.append({
-            "doc_id": doc["doc_id"],
+    # Documents are embedded by the pipeline only if they changed
+    documents = [
+        {
+            "id": doc["doc_id"],
             "title": doc["title"],
             "content": doc["content"],
-            "embedding": embedding,
-            "metadata": doc["metadata"]
-        })
-        print(f"  Prepared: {doc['doc_id']} - {doc['title'][:50]}...")
+            "metadata": doc["metadata"],
+        }
+        for doc in SEED_DOCUMENTS
+    ]
     
-    # Batch index documents
-    print(f"\nIndexing {len(documents_to_index)} documents...")
-    success_count, fail_count = await search_service.index_batch(documents_to_index)
+    print(f"\nIndexing {len(documents)} documents...")
+    counts = {"created": 0, "updated": 0, "skipped": 0, "failed": 0}
+    pipeline = IndexingPipeline(embedding_service, search_service)
+    async for ok, result in pipeline.run(documents):
+        if not ok:
+            counts["failed"] += 1
+            print(f"  Failed: {result['id']} - {result.get('error')}")
+        elif result.get("result") in ("skipped", "noop"):
+            counts["skipped"] += 1
+        elif result.get("result") == "created":
+            counts["created"] += 1
+        else:
+            counts["updated"] += 1
     
     print(f"\n{'='*60}")
     print(f"Seeding completed!")
-    print(f"  Successfully indexed: {success_count} documents")
-    print(f"  Failed: {fail_count} documents")
+    print(f"  Created: {counts['created']} documents")
+    print(f"  Updated: {counts['updated']} documents")
+    print(f"  Skipped (unchanged): {counts['skipped']} documents")
+    print(f"  Failed: {counts['failed']} documents")
     print(f"{'='*60}")
     
     # Close connections
@@ -412,8 +423,8 @@ async def verify_seeding():
     print("\nVerifying indexed documents...")
     
     embedding_service = EmbeddingService()
-    search_service = SearchService(embedding_service)
-    await search_service.initialize()
+    search_service = SearchService()
+    await search_service.ensure_index()
     
     # Test semantic search
     test_query = "How do I fix connection timeout errors?"
@@ -428,7 +439,7 @@ async def verify_seeding():
     print(f"Found {len(results)} results:")
     for i, result in enumerate(results, 1):
         print(f"\n{i}. {result['title']} (score: {result['score']:.4f})")
-        print(f"   ID: {result['doc_id']}")
+        print(f"   ID: {result['id']}")
         print(f"   Content: {result['content'][:100]}...")
     
     await search_service.close()
@@ -0,0 +1,204 @@
+"""Test configuration: in-memory stand-ins for Elasticsearch and the embedding model."""
+
+import hashlib
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services.embeddings import EmbeddingService
+from app.services.search import SearchService
+
+DIMENSION = 8
+
+
+class FakeEncoder:
+    """Deterministic encoder: each text maps to a fixed unit vector."""
+
+    def __init__(self, dimension: int = DIMENSION):
+        self.dimension = dimension
+        self.calls: List[List[str]] = []
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.calls.append(batch)
+        vectors = np.stack([self.vector(text) for text in batch])
+        return vectors[0] if single else vectors
+
+    def vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+        vector = np.random.default_rng(seed).standard_normal(self.dimension)
+        return (vector / np.linalg.norm(vector)).astype(np.float32)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+
+class FakeEmbeddingService(EmbeddingService):
+    """Embedding service running the real batching code on a ``FakeEncoder``."""
+
+    def _load_torch(self):
+        self.model = FakeEncoder()
+
+
+class FakeIndices:
+    """Index-level API calls made around bulk loads."""
+
+    def __init__(self):
+        self.settings: List[Dict[str, Any]] = []
+        self.refreshed = 0
+
+    async def put_settings(self, index: str, settings: Dict[str, Any]):
+        self.settings.append(settings)
+
+    async def refresh(self, index: str):
+        self.refreshed += 1
+
+
+class FakeElasticsearch:
+    """Client answering ``msearch`` from canned responses."""
+
+    def __init__(self):
+        self.indices = FakeIndices()
+        self.msearch_responses: List[Dict[str, Any]] = []
+        self.searches: List[List[Dict[str, Any]]] = []
+
+    async def msearch(self, searches: List[Dict[str, Any]]):
+        self.searches.append(searches)
+        count = len(searches) // 2
+        responses = self.msearch_responses[:count]
+        responses += [{"hits": {"hits": []}}] * (count - len(responses))
+        return {"responses": responses}
+
+    async def close(self):
+        pass
+
+
+class FakeSearchService(SearchService):
+    """
+    Search service writing to in-memory indices.
+
+    Bulk requests are applied as Elasticsearch would: the alias resolves
+    to ``<alias>_v1`` and every action yields one result item. Everything
+    else in ``stream_bulk`` (holds, model checks, dual writes) is real.
+    """
+
+    def __init__(self):
+        super().__init__(es=FakeElasticsearch())
+        self.physical = self.versioned_name(1)
+        self.indices: Dict[str, Dict[str, Dict[str, Any]]] = {self.physical: {}}
+        self.bulk_requests: List[List[Dict[str, Any]]] = []
+
+    @property
+    def documents(self) -> Dict[str, Dict[str, Any]]:
+        """Documents behind the alias."""
+        return self.indices[self.physical]
+
+    def _resolve(self, index: Optional[str]) -> str:
+        return self.physical if index in (None, self.index) else index
+
+    async def current_index(self) -> str:
+        return self.physical
+
+    async def _bulk(
+        self,
+        actions: AsyncIterable[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+        max_chunk_bytes: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[bool, Dict[str, Any]]]:
+        chunk_size = chunk_size or settings.bulk_chunk_size
+        chunk: List[Dict[str, Any]] = []
+        async for action in actions:
+            chunk.append(action)
+            if len(chunk) >= chunk_size:
+                for result in self._apply(chunk):
+                    yield result
+                chunk = []
+        if chunk:
+            for result in self._apply(chunk):
+                yield result
+
+    def _apply(self, request: List[Dict[str, Any]]) -> List[Tuple[bool, Dict[str, Any]]]:
+        """Apply one bulk request."""
+        self.bulk_requests.append(request)
+        results = []
+        for action in request:
+            op = action.get("_op_type", "index")
+            index = self._resolve(action.get("_index"))
+            docs = self.indices.setdefault(index, {})
+            info = {"_index": index, "_id": action["_id"], "status": 200}
+            ok = True
+            if op in ("index", "create"):
+                if op == "create" and action["_id"] in docs:
+                    ok = False
+                    info.update(status=409, error={"type": "version_conflict_engine_exception"})
+                else:
+                    info["result"] = "updated" if action["_id"] in docs else "created"
+                    info["status"] = 200 if action["_id"] in docs else 201
+                    docs[action["_id"]] = dict(action["_source"])
+            elif op == "update":
+                if action["_id"] in docs:
+                    docs[action["_id"]].update(action["doc"])
+                    info["result"] = "updated"
+                else:
+                    ok = False
+                    info.update(status=404, error={"type": "document_missing_exception"})
+            elif docs.pop(action["_id"], None) is not None:
+                info["result"] = "deleted"
+            else:
+                info.update(status=404, result="not_found")
+            results.append((ok, {op: info}))
+        return results
+
+    async def get_fingerprints(
+        self,
+        doc_ids: List[str],
+        tenants: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        fields = ["content_hash", "metadata_hash", "embedding_model", "cluster_id"]
+        return {
+            doc_id: {field: self.documents[doc_id].get(field) for field in fields}
+            for doc_id in doc_ids
+            if doc_id in self.documents
+        }
+
+    async def scan_documents(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        source=None,
+        index: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        ids = (query or {}).get("ids", {}).get("values")
+        for doc_id, doc in list(self.indices.get(self._resolve(index), {}).items()):
+            if ids is None or doc_id in ids:
+                yield {"_id": doc_id, "_source": doc}
+
+    async def count_documents(self, query: Optional[Dict[str, Any]] = None) -> int:
+        return len(self.documents)
+
+
+@pytest.fixture
+def search_service():
+    """Search service backed by in-memory indices."""
+    return FakeSearchService()
+
+
+@pytest.fixture
+def embedding_service():
+    """Embedding service with a deterministic fake model."""
+    service = FakeEmbeddingService()
+    yield service
+    service.close()
+
+
+def make_doc(doc_id: str, content: str = "", **fields) -> Dict[str, Any]:
+    """Document as accepted by the pipeline."""
+    return {
+        "id": doc_id,
+        "title": fields.pop("title", f"Document {doc_id}"),
+        "content": content or f"Content of document {doc_id}",
+        "metadata": fields.pop("metadata", {}),
+        **fields,
+    }
@@ -0,0 +1,103 @@
+"""Unit tests for the search result cache."""
+
+import time
+
+from app.services.cache import SearchCache
+from tests.conftest import make_doc
+
+RESULTS = [{"id": "doc-0", "score": 1.0}]
+
+
+def cache(**options):
+    options.setdefault("enabled", True)
+    options.setdefault("ttl_seconds", 60)
+    options.setdefault("max_bytes", 1 << 20)
+    return SearchCache(**options)
+
+
+def test_keys_ignore_query_case_and_whitespace():
+    key = SearchCache.make_key("Connection  Timeout", "hybrid", 5)
+
+    assert key == SearchCache.make_key(" connection timeout ", "hybrid", 5)
+    assert key != SearchCache.make_key("connection timeout", "keyword", 5)
+    assert key != SearchCache.make_key("connection timeout", "hybrid", 5, {"tenant": "a"})
+
+
+def test_hit_at_same_generation():
+    search_cache = cache()
+    key = SearchCache.make_key("timeout", "hybrid", 5)
+    assert search_cache.get(key, 0) is None
+
+    search_cache.put(key, RESULTS, 0, compute_ms=12.0)
+
+    assert search_cache.get(key, 0) == RESULTS
+    assert search_cache.stats()["hits"] == 1
+    assert search_cache.stats()["saved_ms"] == 12.0
+
+
+def test_newer_generation_drops_everything():
+    search_cache = cache()
+    search_cache.put("a", RESULTS, 0, compute_ms=1.0)
+    search_cache.put("b", RESULTS, 0, compute_ms=1.0)
+
+    assert search_cache.get("a", 1) is None
+    assert search_cache.get("b", 1) is None
+    assert search_cache.stats()["invalidations"] == 1
+    assert search_cache.stats()["entries"] == 0
+
+
+def test_results_computed_across_a_write_are_not_stored():
+    search_cache = cache()
+    search_cache.get("a", 1)
+
+    # Computed at generation 0, but a write bumped the generation meanwhile
+    search_cache.put("a", RESULTS, 0, compute_ms=1.0)
+    search_cache.put("b", RESULTS, 1, compute_ms=1.0, cacheable=False)
+
+    assert search_cache.get("a", 1) is None
+    assert search_cache.get("b", 1) is None
+
+
+async def test_writes_invalidate_through_the_service_generation(search_service):
+    search_cache = cache()
+    search_cache.put("a", RESULTS, search_service.generation, compute_ms=1.0)
+    assert search_cache.get("a", search_service.generation) == RESULTS
+
+    async def actions():
+        for action in search_service.write_actions({**make_doc("doc-1"), "embedding": [0.0] * 8}):
+            yield action
+
+    async for _ in search_service.stream_bulk(actions()):
+        pass
+
+    assert search_cache.get("a", search_service.generation) is None
+
+
+def test_expired_entries_miss():
+    search_cache = cache(ttl_seconds=0.01)
+    search_cache.put("a", RESULTS, 0, compute_ms=1.0)
+    time.sleep(0.02)
+
+    assert search_cache.get("a", 0) is None
+
+
+def test_least_recently_used_entries_are_evicted_over_budget():
+    size = len('[{"id": "doc-0", "score": 1.0}]')
+    search_cache = cache(max_bytes=2 * size)
+    search_cache.put("a", RESULTS, 0, compute_ms=1.0)
+    search_cache.put("b", RESULTS, 0, compute_ms=1.0)
+    search_cache.get("a", 0)
+
+    search_cache.put("c", RESULTS, 0, compute_ms=1.0)
+
+    assert search_cache.get("b", 0) is None
+    assert search_cache.get("a", 0) == RESULTS
+    assert search_cache.get("c", 0) == RESULTS
+    assert search_cache.stats()["evictions"] == 1
+
+
+def test_disabled_cache_never_hits():
+    search_cache = cache(enabled=False)
+    search_cache.put("a", RESULTS, 0, compute_ms=1.0)
+
+    assert search_cache.get("a", 0) is None
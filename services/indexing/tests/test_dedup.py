@@ -0,0 +1,154 @@
+"""Unit tests for SimHash near-duplicate detection at ingest."""
+
+import pytest
+from pydantic import ValidationError
+
+from app.config import Settings
+from app.services.dedup import (
+    SIMHASH_BANDS,
+    NearDuplicateDetector,
+    hamming,
+    simhash,
+    simhash_bands,
+)
+from app.services.pipeline import IndexingPipeline
+from tests.conftest import make_doc
+
+FAILURE = (
+    "Build {n} failed at 2024-03-0{n} 10:1{n}:00: java.net.SocketTimeoutException: "
+    "connect timed out after 3000{n} ms while fetching artifacts from nexus for job "
+    "deploy-{n} on agent 0x7f3a{n}c"
+)
+TITLE = "Artifact fetch timeout"
+
+
+def failure(n: int) -> str:
+    return FAILURE.format(n=n)
+
+
+def report(doc_id: str, n: int, **fields):
+    return make_doc(doc_id, failure(n), title=TITLE, **fields)
+
+
+def test_volatile_tokens_do_not_change_the_fingerprint():
+    assert simhash(failure(1)) == simhash(failure(2))
+    assert hamming(simhash(failure(1)), simhash("Disk quota exceeded on /var/lib/docker")) > 3
+
+
+def test_fingerprint_bands():
+    fingerprint = simhash(failure(1))
+
+    bands = simhash_bands(fingerprint)
+
+    assert len(fingerprint) == 16
+    assert len(bands) == SIMHASH_BANDS
+    assert "".join(band.split(":")[1] for band in bands) == fingerprint
+
+
+@pytest.mark.parametrize("policy", ["link", "skip", "merge"])
+async def test_duplicates_within_a_batch(search_service, policy):
+    detector = NearDuplicateDetector(search_service, policy)
+    docs = [report("a", 1), report("b", 2), make_doc("c", "Disk full")]
+
+    keep, actions, results = await detector.resolve(docs)
+
+    assert actions == []
+    assert keep[0]["cluster_id"] == "a"
+    assert keep[-1]["cluster_id"] == "c"
+    if policy == "link":
+        assert [doc["id"] for doc in keep] == ["a", "b", "c"]
+        assert keep[1]["cluster_id"] == "a"
+    else:
+        assert [doc["id"] for doc in keep] == ["a", "c"]
+        assert results == [
+            {"id": "b", "status": 200, "result": "duplicate", "duplicate_of": "a"}
+        ]
+    if policy == "merge":
+        assert keep[0]["occurrences"] == 2
+        assert keep[0]["duplicate_ids"] == ["b"]
+
+
+async def test_duplicates_of_other_tenants_are_kept(search_service):
+    detector = NearDuplicateDetector(search_service, "skip")
+    docs = [report("a", 1, tenant="repo-a"), report("b", 2, tenant="repo-b")]
+
+    keep, _, results = await detector.resolve(docs)
+
+    assert [doc["id"] for doc in keep] == ["a", "b"]
+    assert results == []
+
+
+async def test_merge_into_an_indexed_original(search_service):
+    search_service.es.msearch_responses = [{
+        "hits": {"hits": [{
+            "_id": "a",
+            "_source": {
+                "simhash": simhash(f"{TITLE} {failure(1)}"),
+                "cluster_id": "a",
+                "occurrences": 3,
+            },
+        }]}
+    }]
+    detector = NearDuplicateDetector(search_service, "merge")
+
+    keep, actions, results = await detector.resolve([report("b", 2)])
+
+    assert keep == []
+    assert results[0]["duplicate_of"] == "a"
+    assert len(actions) == 1
+    assert actions[0]["_op_type"] == "update"
+    assert actions[0]["_id"] == "a"
+    assert actions[0]["doc"]["occurrences"] == 4
+    assert actions[0]["doc"]["duplicate_ids"] == ["b"]
+
+
+async def test_pipeline_reports_only_the_duplicate_when_merging(
+    search_service, embedding_service
+):
+    pipeline = IndexingPipeline(
+        embedding_service, search_service, incremental=False, dedup_policy="merge"
+    )
+    original = report("a", 1)
+    [(_, written)] = [item async for item in pipeline.run([original])]
+    assert written["result"] == "created"
+
+    search_service.es.msearch_responses = [{
+        "hits": {"hits": [{"_id": "a", "_source": search_service.documents["a"]}]}
+    }]
+    results = [item async for item in pipeline.run([report("b", 2)])]
+
+    assert results == [
+        (True, {"id": "b", "status": 200, "result": "duplicate", "duplicate_of": "a"})
+    ]
+    assert search_service.documents["a"]["occurrences"] == 2
+    assert "b" not in search_service.documents
+
+
+async def test_changed_documents_are_rewritten_in_place(search_service, embedding_service):
+    pipeline = IndexingPipeline(
+        embedding_service, search_service, incremental=True, dedup_policy="skip"
+    )
+    docs = [report("a", 1), make_doc("b", "Disk quota exceeded on /var/lib/docker")]
+    [item async for item in pipeline.run(docs)]
+    # Indexed before near-duplicate detection
+    del search_service.documents["b"]["cluster_id"]
+
+    search_service.es.msearch_responses = [{
+        "hits": {"hits": [{"_id": "a", "_source": search_service.documents["a"]}]}
+    }]
+    [(ok, result)] = [item async for item in pipeline.run([report("b", 2)])]
+
+    assert ok and result["result"] == "updated"
+    assert search_service.documents["b"]["content"] == failure(2)
+    assert search_service.documents["b"]["cluster_id"] == "b"
+
+
+def test_max_distance_must_stay_below_the_band_count(search_service):
+    with pytest.raises(ValueError, match="max_distance"):
+        NearDuplicateDetector(search_service, "link", max_distance=SIMHASH_BANDS)
+    with pytest.raises(ValidationError):
+        Settings(dedup_max_distance=SIMHASH_BANDS)
+
+
+def test_search_results_are_not_collapsed_by_default():
+    assert Settings().dedup_collapse is False
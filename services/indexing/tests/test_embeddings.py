@@ -0,0 +1,99 @@
+"""Unit tests for the embedding executor and cross-caller batching."""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+
+async def test_sequential_calls_each_complete(embedding_service):
+    for _ in range(3):
+        result = await asyncio.wait_for(embedding_service.aembed_batch(["a", "b"]), 5)
+        assert result.shape == (2, 8)
+
+
+async def test_concurrent_callers_get_their_own_embeddings(embedding_service):
+    requests = [[f"text {i}-{j}" for j in range(i + 1)] for i in range(5)]
+
+    results = await asyncio.gather(*(embedding_service.aembed_batch(r) for r in requests))
+
+    for texts, result in zip(requests, results):
+        expected = np.stack([embedding_service.model.vector(text) for text in texts])
+        np.testing.assert_allclose(result, expected)
+    assert sum(len(call) for call in embedding_service.model.calls) == 15
+
+
+async def test_encode_runs_off_the_event_loop(embedding_service):
+    threads = []
+    encode = embedding_service.model.encode
+
+    def record_thread(texts, **kwargs):
+        threads.append(threading.current_thread().name)
+        return encode(texts, **kwargs)
+
+    embedding_service.model.encode = record_thread
+    await embedding_service.aembed_text("query")
+
+    assert threads and threads[0].startswith("embedding")
+
+
+async def test_encode_errors_reach_every_waiting_caller(embedding_service):
+    def fail(texts, **kwargs):
+        raise RuntimeError("out of memory")
+
+    embedding_service.model.encode = fail
+    results = await asyncio.gather(
+        embedding_service.aembed_text("a"),
+        embedding_service.aembed_text("b"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_empty_batch(embedding_service):
+    result = await embedding_service.aembed_batch([])
+
+    assert result.shape == (0, 8)
+    assert embedding_service.model.calls == []
+
+
+@pytest.mark.parametrize("calls", [1, 10])
+async def test_no_drainer_is_left_behind(embedding_service, calls):
+    await asyncio.gather(*(embedding_service.aembed_text(str(i)) for i in range(calls)))
+
+    assert not embedding_service._drainers
+    assert not embedding_service._pending
+
+
+async def test_concurrent_queries_coalesce_into_one_encode_call(embedding_service):
+    embedding_service.coalesce_window = 0.05
+
+    results = await asyncio.gather(
+        *(embedding_service.aembed_text(f"query {i}") for i in range(10))
+    )
+
+    assert len(embedding_service.model.calls) == 1
+    for i, result in enumerate(results):
+        np.testing.assert_allclose(result, embedding_service.model.vector(f"query {i}"))
+    stats = embedding_service.batching_stats()
+    assert (stats["encode_calls"], stats["requests"], stats["texts"]) == (1, 10, 10)
+
+
+async def test_coalesced_batches_respect_the_size_limit(embedding_service):
+    embedding_service.coalesce_window = 0.05
+    embedding_service.max_batch_size = 4
+
+    await asyncio.gather(*(embedding_service.aembed_text(f"query {i}") for i in range(10)))
+
+    sizes = [len(call) for call in embedding_service.model.calls]
+    assert sum(sizes) == 10
+    assert max(sizes) <= 4
+
+
+async def test_full_batch_skips_the_window(embedding_service):
+    embedding_service.coalesce_window = 10.0
+    embedding_service.max_batch_size = 2
+
+    await asyncio.wait_for(embedding_service.aembed_batch(["a", "b"]), 1.0)
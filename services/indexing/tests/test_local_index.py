@@ -0,0 +1,141 @@
+"""Unit tests for the embedded local vector index."""
+
+import numpy as np
+import pytest
+
+from app.services.local_index import LocalVectorIndex
+
+
+def source(content: str, vector, **fields):
+    return {"title": "", "content": content, "embedding": list(vector), **fields}
+
+
+@pytest.fixture
+def index(tmp_path):
+    local_index = LocalVectorIndex(str(tmp_path / "local"), dimension=3, initial_capacity=2)
+    yield local_index
+    local_index.close()
+
+
+@pytest.fixture
+def timeout_docs(index):
+    index.upsert("a", source("connection timeout to db", [1, 0, 0]))
+    index.upsert("b", source("read timeout from cache", [0, 1, 0]))
+    index.upsert("c", source("disk full", [0, 0, 1]))
+    index.upsert("d", source("permission denied", [1, 1, 0]))
+    return index
+
+
+def ids(results):
+    return [result["id"] for result in results]
+
+
+def test_semantic_search_ranks_by_cosine(timeout_docs):
+    results = timeout_docs.semantic_search([1, 0.1, 0], top_k=2)
+
+    assert ids(results) == ["a", "d"]
+    assert results[0]["score"] == pytest.approx(1 + 1 / np.sqrt(1.01), rel=1e-5)
+
+
+def test_keyword_search_scores_matching_documents(timeout_docs):
+    assert sorted(ids(timeout_docs.keyword_search("timeout"))) == ["a", "b"]
+    assert ids(timeout_docs.keyword_search("cache timeout")) == ["b", "a"]
+
+
+def test_keyword_search_after_re_upserts(timeout_docs):
+    for _ in range(2):
+        timeout_docs.upsert("a", source("connection timeout to db", [1, 0, 0]))
+        timeout_docs.upsert("b", source("read timeout from cache", [0, 1, 0]))
+
+    results = timeout_docs.keyword_search("timeout")
+
+    assert sorted(ids(results)) == ["a", "b"]
+    assert all(result["score"] > 0 for result in results)
+
+
+def test_keyword_search_after_delete(index):
+    for doc_id in "abc":
+        index.upsert(doc_id, source("build failed", [1, 0, 0]))
+    index.delete("c")
+
+    results = index.keyword_search("failed")
+
+    assert sorted(ids(results)) == ["a", "b"]
+    assert all(result["score"] > 0 for result in results)
+
+
+def test_replaced_text_is_no_longer_found(timeout_docs):
+    timeout_docs.upsert("a", source("out of memory", [1, 0, 0]))
+
+    assert ids(timeout_docs.keyword_search("timeout")) == ["b"]
+    assert ids(timeout_docs.keyword_search("memory")) == ["a"]
+    assert len(timeout_docs) == 4
+
+
+def test_bulk_actions_and_filters(index):
+    index.apply({"_id": "a", "_source": source("timeout", [1, 0, 0], tenant="repo-a")})
+    index.apply({"_id": "b", "_source": source("timeout", [1, 0, 0])})
+    index.apply({"_op_type": "update", "_id": "b", "doc": {"tenant": "repo-b"}})
+
+    assert ids(index.keyword_search("timeout", filters={"tenant": "repo-b"})) == ["b"]
+
+    index.apply({"_op_type": "delete", "_id": "b"})
+    assert ids(index.semantic_search([1, 0, 0])) == ["a"]
+
+
+def test_state_survives_reopening(tmp_path, timeout_docs):
+    timeout_docs.upsert("a", source("out of memory", [1, 0, 0]))
+    timeout_docs.delete("c")
+    timeout_docs.flush()
+
+    reopened = LocalVectorIndex(str(tmp_path / "local"), dimension=3)
+    try:
+        assert len(reopened) == 3
+        assert ids(reopened.keyword_search("timeout")) == ["b"]
+        assert ids(reopened.semantic_search([0, 0, 1], top_k=1)) != ["c"]
+    finally:
+        reopened.close()
+
+
+def test_re_upserts_keep_the_files_bounded(tmp_path):
+    path = tmp_path / "local"
+    index = LocalVectorIndex(str(path), dimension=3, initial_capacity=2, min_garbage=8)
+    try:
+        for i in range(100):
+            index.upsert("a", source(f"timeout {i}", [1, 0, 0]))
+            index.update("a", {"tenant": f"repo-{i}"})
+        index.upsert("b", source("disk full", [0, 1, 0]))
+        index.flush()
+
+        assert index._size <= 10
+        assert len((path / "docs.jsonl").read_text().splitlines()) <= 10
+        assert (path / "embeddings.f32").stat().st_size <= 16 * 3 * 4
+        assert ids(index.keyword_search("99")) == ["a"]
+        assert ids(index.keyword_search("98")) == []
+        assert ids(index.keyword_search("disk")) == ["b"]
+        assert ids(index.semantic_search([0, 1, 0], top_k=1)) == ["b"]
+        assert index.keyword_search("timeout", filters={"tenant": "repo-99"})
+    finally:
+        index.close()
+
+    reopened = LocalVectorIndex(str(path), dimension=3)
+    try:
+        assert len(reopened) == 2
+        assert ids(reopened.semantic_search([1, 0, 0], top_k=1)) == ["a"]
+    finally:
+        reopened.close()
+
+
+def test_reopening_compacts_a_grown_log(tmp_path):
+    path = str(tmp_path / "local")
+    index = LocalVectorIndex(path, dimension=3, initial_capacity=2)
+    for i in range(20):
+        index.upsert("a", source(f"timeout {i}", [1, 0, 0]))
+    index.close()
+
+    reopened = LocalVectorIndex(path, dimension=3, initial_capacity=2, min_garbage=4)
+    try:
+        assert reopened._size == 1
+        assert ids(reopened.keyword_search("timeout 19")) == ["a"]
+    finally:
+        reopened.close()
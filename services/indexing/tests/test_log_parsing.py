@@ -0,0 +1,115 @@
+"""Unit tests for error code, path and failure signature extraction."""
+
+import pytest
+
+from app.services.log_parsing import error_codes, failure_signature, file_paths, query_signature
+
+
+@pytest.mark.parametrize(
+    "text, codes",
+    [
+        ("ORA-00942: table or view does not exist", ["ORA-00942"]),
+        ("Log4Shell (CVE-2021-44228) in log4j-core", ["CVE-2021-44228"]),
+        ("error[E0432]: unresolved import `crate::db`", ["E0432"]),
+        ("src/app.ts(3,21): error TS2307: Cannot find module", ["TS2307"]),
+        ("main.cpp(12): error C2065: 'x': undeclared identifier", ["C2065"]),
+        ("error MSB3073: The command exited with code 1", ["MSB3073", "EXIT_1"]),
+        ("app.py:1:1: F401 'os' imported but unused", ["F401"]),
+        ("connect ECONNREFUSED 127.0.0.1:5432", ["ECONNREFUSED"]),
+        ("ERROR: SQLSTATE[23505] duplicate key", ["SQLSTATE_23505"]),
+        ("Process exited with code 137", ["EXIT_137"]),
+        ("upstream returned HTTP 503", ["HTTP_503"]),
+    ],
+)
+def test_error_codes(text, codes):
+    assert error_codes(text) == codes
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "SHA256 checksum mismatch for artifact.jar",
+        "TLS handshake failed: AES128 cipher not offered",
+        "X509 certificate signed by unknown authority",
+        "Reverted in PR1234 and JIRA-42",
+        "UnicodeDecodeError: 'ISO-8859' codec can't decode byte",
+        "JWT signed with RS256 instead of HS256",
+    ],
+)
+def test_names_and_ticket_keys_are_not_error_codes(text):
+    assert error_codes(text) == []
+
+
+def test_error_codes_are_distinct_and_upper_case():
+    assert error_codes("ORA-00942 then ORA-00942, exit code 1 and exit status 1") == [
+        "ORA-00942", "EXIT_1"
+    ]
+
+
+def test_file_paths():
+    text = (
+        'File "/srv/app/billing/charge.py", line 12, in charge\n'
+        "  at src/main/App.java:42:7 from build.gradle on 10.0.0.1 with v1.2.3"
+    )
+
+    assert file_paths(text) == ["/srv/app/billing/charge.py", "src/main/App.java", "build.gradle"]
+
+
+TRACE = """2024-05-01 12:30:45,123 ERROR [main] Payment failed
+java.lang.NullPointerException: Cannot invoke "Card.number()" on object@1b6d3586
+    at com.acme.billing.PaymentGateway.charge(PaymentGateway.java:42)
+    at com.acme.billing.CheckoutService.pay(CheckoutService.java:17)
+    at org.springframework.aop.Proxy.invoke(Proxy.java:99)
+Caused by: java.sql.SQLException: ORA-00942: table or view does not exist
+"""
+PROSE = (
+    "Our nightly deploy of the billing service keeps failing after the database upgrade. "
+    "It started last week, right after we moved the staging cluster to the new region, "
+    "and nobody on the team has found the cause yet."
+)
+
+
+def test_failure_signature():
+    signature = failure_signature(TRACE)
+
+    assert signature.exceptions == ["NullPointerException", "SQLException"]
+    assert signature.message == 'Cannot invoke "Card.number()" on object'
+    assert signature.frames == [
+        ("PaymentGateway.charge", "PaymentGateway.java"),
+        ("CheckoutService.pay", "CheckoutService.java"),
+    ]
+    assert signature.codes == ["ORA-00942"]
+    assert signature.text() == (
+        'NullPointerException: Cannot invoke "Card.number()" on object SQLException '
+        "at PaymentGateway.charge PaymentGateway.java "
+        "at CheckoutService.pay CheckoutService.java ORA-00942"
+    )
+
+
+def test_query_signature_of_a_log_excerpt():
+    assert query_signature(TRACE) == failure_signature(TRACE).text()
+
+
+def test_query_signature_of_the_same_failure_is_stable():
+    other = TRACE.replace("12:30:45,123", "09:01:02,004").replace("1b6d3586", "7a81197d")
+
+    assert query_signature(other) == query_signature(TRACE)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "NullPointerException in checkout",
+        PROSE,
+        "  ".join(PROSE.split(" ")),
+        PROSE + " It first failed at 2024-05-01 12:30:45.",
+    ],
+)
+def test_queries_without_log_structure_are_searched_as_is(query):
+    assert query_signature(query) is None
+
+
+def test_prose_with_an_exception_loses_volatile_tokens():
+    query = PROSE + " The log says TimeoutException at 2024-05-01 12:30:45 on host 0x7f3a."
+
+    assert query_signature(query) == PROSE + " The log says TimeoutException at on host ."
@@ -0,0 +1,58 @@
+"""Unit tests for vector mappings and the cluster version they need."""
+
+import pytest
+
+from app.config import settings
+
+
+@pytest.fixture
+def cluster_version(search_service):
+    """Set the Elasticsearch version reported by the fake cluster."""
+    def set_version(number: str):
+        async def info():
+            return {"version": {"number": number}}
+
+        search_service.es.info = info
+
+    return set_version
+
+
+def test_float_storage_is_pinned_to_hnsw(search_service, monkeypatch):
+    monkeypatch.setattr(settings, "vector_storage", "float")
+
+    embedding = search_service._vector_mappings(8)["embedding"]
+
+    assert embedding["index_options"] == {"type": "hnsw"}
+    assert embedding["similarity"] == "cosine"
+
+
+def test_int8_storage(search_service, monkeypatch):
+    monkeypatch.setattr(settings, "vector_storage", "int8_hnsw")
+
+    assert search_service._vector_mappings(8)["embedding"]["index_options"] == {
+        "type": "int8_hnsw"
+    }
+
+
+@pytest.mark.parametrize(
+    "storage, number, supported",
+    [
+        ("float", "8.11.0", True),
+        ("int8_hnsw", "8.11.0", False),
+        ("int8_hnsw", "8.12.2", True),
+        ("binary", "8.14.3", False),
+        ("binary", "8.15.0-SNAPSHOT", True),
+        ("binary", "9.0.0", True),
+    ],
+)
+async def test_storage_modes_need_a_recent_cluster(
+    search_service, cluster_version, monkeypatch, storage, number, supported
+):
+    monkeypatch.setattr(settings, "vector_storage", storage)
+    cluster_version(number)
+
+    if supported:
+        await search_service._check_vector_storage()
+    else:
+        with pytest.raises(RuntimeError, match=f"VECTOR_STORAGE={storage} needs"):
+            await search_service._check_vector_storage()
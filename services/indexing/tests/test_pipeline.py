@@ -0,0 +1,134 @@
+"""Unit tests for the pipelined ingest (embedding stage feeding bulk writers)."""
+
+import numpy as np
+import pytest
+
+from app.services.pipeline import IndexingPipeline
+from tests.conftest import FakeSearchService, make_doc
+
+
+async def run(pipeline, documents):
+    return [item async for item in pipeline.run(documents)]
+
+
+def pipeline_for(search_service, embedding_service, **options):
+    options.setdefault("incremental", False)
+    options.setdefault("dedup_policy", "off")
+    return IndexingPipeline(embedding_service, search_service, **options)
+
+
+async def test_every_document_is_embedded_and_written_once(search_service, embedding_service):
+    pipeline = pipeline_for(
+        search_service, embedding_service, batch_size=3, queue_size=1, concurrency=3
+    )
+    docs = [make_doc(f"doc-{i}") for i in range(10)]
+
+    results = await run(pipeline, docs)
+
+    assert sorted(result["id"] for _, result in results) == sorted(d["id"] for d in docs)
+    assert all(ok and result["result"] == "created" for ok, result in results)
+    assert set(search_service.documents) == {d["id"] for d in docs}
+    # Micro-batches of at most batch_size texts
+    assert [len(call) for call in embedding_service.model.calls] == [3, 3, 3, 1]
+    stored = search_service.documents["doc-0"]
+    assert stored["embedding_model"] == embedding_service.model_version
+    expected = embedding_service.model.vector(f"{docs[0]['title']} {docs[0]['content']}")
+    np.testing.assert_allclose(stored["embedding"], expected)
+
+
+async def test_async_document_sources(search_service, embedding_service):
+    async def documents():
+        for i in range(5):
+            yield make_doc(f"doc-{i}")
+
+    results = await run(pipeline_for(search_service, embedding_service, batch_size=2), documents())
+
+    assert len(results) == 5
+    assert len(search_service.documents) == 5
+
+
+async def test_precomputed_embeddings_are_not_re_embedded(search_service, embedding_service):
+    vector = np.ones(8, dtype=np.float32)
+    docs = [make_doc(f"doc-{i}", embedding=vector) for i in range(4)]
+
+    results = await run(pipeline_for(search_service, embedding_service), docs)
+
+    assert all(ok for ok, _ in results)
+    assert embedding_service.model.calls == []
+    np.testing.assert_array_equal(search_service.documents["doc-0"]["embedding"], vector)
+
+
+async def test_missing_embedding_service_fails_the_run(search_service):
+    pipeline = pipeline_for(search_service, None)
+
+    with pytest.raises(ValueError, match="require an embedding service"):
+        await run(pipeline, [make_doc("doc-0")])
+
+
+async def test_failed_writes_are_reported_per_document(embedding_service):
+    class FailingSearchService(FakeSearchService):
+        async def stream_bulk(self, actions, chunk_size=None, max_chunk_bytes=None):
+            async for action in actions:
+                if action["_id"] == "doc-1":
+                    error = {"type": "mapper_parsing_exception", "reason": "bad field"}
+                    info = {"_index": self.physical, "_id": "doc-1", "status": 400, "error": error}
+                    yield False, {"index": info}
+                else:
+                    async for item in super().stream_bulk(_single(action)):
+                        yield item
+
+    service = FailingSearchService()
+    docs = [make_doc("doc-0"), make_doc("doc-1"), make_doc("doc-2")]
+    results = {
+        result["id"]: (ok, result)
+        for ok, result in await run(pipeline_for(service, embedding_service), docs)
+    }
+
+    assert results["doc-0"][0] and results["doc-2"][0]
+    ok, failed = results["doc-1"]
+    assert not ok
+    assert failed["status"] == 400
+    assert failed["error"] == "bad field"
+
+
+async def _single(action):
+    yield action
+
+
+async def test_incremental_skips_unchanged_and_updates_metadata(search_service, embedding_service):
+    docs = [make_doc(f"doc-{i}") for i in range(3)]
+    await run(pipeline_for(search_service, embedding_service), [dict(d) for d in docs])
+    embedding_service.model.calls.clear()
+
+    docs[1]["metadata"] = {"source": "jira"}
+    docs[2]["content"] = "Edited content"
+    results = {
+        result["id"]: result
+        for _, result in await run(
+            pipeline_for(search_service, embedding_service, incremental=True), docs
+        )
+    }
+
+    assert results["doc-0"]["result"] == "skipped"
+    assert results["doc-1"]["result"] == "updated"
+    assert results["doc-2"]["result"] == "updated"
+    # Only the document whose text changed is re-embedded
+    assert embedding_service.model.calls == [[f"{docs[2]['title']} Edited content"]]
+    assert search_service.documents["doc-1"]["source"] == "jira"
+    assert search_service.documents["doc-2"]["content"] == "Edited content"
+
+
+async def test_incremental_re_embeds_documents_of_another_model(
+    search_service, embedding_service
+):
+    docs = [make_doc("doc-0")]
+    await run(pipeline_for(search_service, embedding_service), [dict(d) for d in docs])
+    search_service.documents["doc-0"]["embedding_model"] = "old-model"
+    embedding_service.model.calls.clear()
+
+    results = await run(pipeline_for(search_service, embedding_service, incremental=True), docs)
+
+    assert [result["result"] for _, result in results] == ["updated"]
+    assert len(embedding_service.model.calls) == 1
+    stored = search_service.documents["doc-0"]
+    assert stored["embedding_model"] == embedding_service.model_version
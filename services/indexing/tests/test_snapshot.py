@@ -0,0 +1,100 @@
+"""Unit tests for knowledge base snapshot export and import."""
+
+import numpy as np
+import pytest
+
+from app.services.pipeline import IndexingPipeline
+from app.services.snapshot import (
+    export_snapshot,
+    import_snapshot,
+    read_snapshot_meta,
+    snapshot_format,
+)
+from tests.conftest import DIMENSION, FakeSearchService, make_doc
+
+pytest.importorskip("pyarrow")
+
+FIELDS = ["title", "content", "tenant", "cluster_id", "simhash", "metadata", "embedding_model"]
+
+
+def fresh_service() -> FakeSearchService:
+    service = FakeSearchService()
+    service.embedding_dimension = DIMENSION
+    return service
+
+
+@pytest.fixture
+async def source(embedding_service):
+    service = fresh_service()
+    pipeline = IndexingPipeline(embedding_service, service, incremental=False, dedup_policy="off")
+    docs = [
+        make_doc("a", tenant="repo-a", metadata={"source": "github", "labels": ["ci"]}),
+        make_doc("b", title="", metadata={}),
+        make_doc("c", tenant="repo-b"),
+    ]
+    async for _ in pipeline.run(docs):
+        pass
+    service.documents["a"].update(occurrences=3, duplicate_ids=["x", "y"])
+    return service
+
+
+@pytest.mark.parametrize("name", ["kb.parquet", "kb.arrow"])
+async def test_round_trip(tmp_path, source, embedding_service, name):
+    path = tmp_path / name
+    exported = await export_snapshot(source, path, batch_size=2)
+    target = fresh_service()
+    calls = len(embedding_service.model.calls)
+
+    imported = await import_snapshot(target, path, embedding_service, batch_size=2)
+
+    assert exported["documents"] == 3
+    assert (imported["imported"], imported["reembedded"], imported["failed"]) == (3, 0, 0)
+    assert len(embedding_service.model.calls) == calls
+    assert target.documents.keys() == source.documents.keys()
+    for doc_id, stored in source.documents.items():
+        restored = target.documents[doc_id]
+        for field in FIELDS:
+            assert restored.get(field) == stored.get(field), field
+        np.testing.assert_array_equal(
+            np.asarray(restored["embedding"], dtype=np.float32),
+            np.asarray(stored["embedding"], dtype=np.float32),
+        )
+    assert target.documents["a"]["occurrences"] == 3
+    assert target.documents["a"]["duplicate_ids"] == ["x", "y"]
+
+
+async def test_embeddings_of_another_model_are_re_embedded(tmp_path, source, embedding_service):
+    path = tmp_path / "kb.parquet"
+    await export_snapshot(source, path)
+    target = fresh_service()
+    target.embedding_model = "another-model"
+
+    imported = await import_snapshot(target, path, embedding_service)
+
+    assert imported["reembedded"] == 3
+    assert imported["snapshot"]["embedding_model_version"] == source.embedding_model_version
+    for doc in target.documents.values():
+        assert doc["embedding_model"] == "another-model"
+        np.testing.assert_allclose(
+            doc["embedding"],
+            embedding_service.model.vector(f"{doc['title']} {doc['content']}"),
+            rtol=1e-6,
+        )
+
+
+async def test_snapshot_meta(tmp_path, source):
+    path = tmp_path / "kb.arrow"
+    await export_snapshot(source, path)
+
+    meta = read_snapshot_meta(path)
+
+    assert meta["index"] == source.physical
+    assert meta["embedding_dimension"] == str(DIMENSION)
+    assert meta["embedding_model_version"] == source.embedding_model_version
+
+
+def test_snapshot_format():
+    assert snapshot_format("kb.PQ") == "parquet"
+    assert snapshot_format("kb.feather") == "arrow"
+    with pytest.raises(ValueError, match="Unknown snapshot format"):
+        snapshot_format("kb.csv")
@@ -0,0 +1,70 @@
+"""Unit tests for tenant scoping and shard routing."""
+
+from app.services.tenants import (
+    SHARED_TENANT,
+    filter_tenants,
+    tenant_filter,
+    tenant_of,
+    tenant_scope,
+)
+from tests.conftest import make_doc
+
+
+def test_tenant_of():
+    assert tenant_of({"tenant": "repo-a", "metadata": {"tenant": "repo-b"}}) == "repo-a"
+    assert tenant_of({"metadata": {"tenant": "repo-b"}}) == "repo-b"
+    assert tenant_of({"metadata": None}) == SHARED_TENANT
+    assert tenant_of({}) == SHARED_TENANT
+
+
+def test_tenant_scope():
+    assert tenant_scope("repo-a") == ["repo-a", SHARED_TENANT]
+    assert tenant_scope("repo-a", include_shared=False) == ["repo-a"]
+    assert tenant_scope(SHARED_TENANT) == [SHARED_TENANT]
+
+
+def test_tenant_filter_counts_untagged_documents_as_shared():
+    assert tenant_filter(["repo-a"]) == {"terms": {"tenant": ["repo-a"]}}
+
+    clause = tenant_filter(["repo-a", SHARED_TENANT])["bool"]
+
+    assert clause["minimum_should_match"] == 1
+    assert {"terms": {"tenant": ["repo-a", SHARED_TENANT]}} in clause["should"]
+    assert {"bool": {"must_not": {"exists": {"field": "tenant"}}}} in clause["should"]
+
+
+def test_filter_tenants():
+    assert filter_tenants(None) is None
+    assert filter_tenants({"source": "github"}) is None
+    assert filter_tenants({"tenant": {"gte": "a"}}) is None
+    assert filter_tenants({"tenant": "repo-a"}) == ["repo-a"]
+    assert filter_tenants({"tenant": ["repo-a", SHARED_TENANT]}) == ["repo-a", SHARED_TENANT]
+
+
+def test_writes_are_routed_only_in_routed_indices(search_service):
+    doc = make_doc("a", tenant="repo-a", embedding=[0.0] * 8)
+
+    search_service.tenant_routing = False
+    assert "_routing" not in search_service.build_action(doc)
+    assert search_service._search_routing({"tenant": ["repo-a", SHARED_TENANT]}) is None
+
+    search_service.tenant_routing = True
+    assert search_service.build_action(doc)["_routing"] == "repo-a"
+    assert search_service.build_action(make_doc("b", embedding=[0.0] * 8))["_routing"] == (
+        SHARED_TENANT
+    )
+    assert search_service._search_routing({"tenant": ["repo-a", SHARED_TENANT]}) == (
+        f"repo-a,{SHARED_TENANT}"
+    )
+    assert search_service._search_routing({"source": "github"}) is None
+
+
+def test_rebuild_target_uses_its_own_routing(search_service):
+    doc = make_doc("a", tenant="repo-a", embedding=[0.0] * 8)
+    target = search_service.versioned_name(2)
+    search_service.tenant_routing = False
+    search_service.start_dual_write(target)
+    search_service.rebuild_routing = True
+
+    assert "_routing" not in search_service.build_action(doc)
+    assert search_service.build_action(doc, index=target)["_routing"] == "repo-a"
@@ -0,0 +1,120 @@
+"""Unit tests for bulk writes around a rebuild cut-over."""
+
+import asyncio
+
+import numpy as np
+
+from tests.conftest import DIMENSION, make_doc
+
+
+def action(search_service, doc_id, model=None, index=None):
+    doc = make_doc(
+        doc_id,
+        embedding=[1.0] + [0.0] * (DIMENSION - 1),
+        embedding_model=model or search_service.embedding_model_version,
+    )
+    return search_service.build_action(doc, index=index)
+
+
+async def stream(*actions):
+    for item in actions:
+        yield item
+
+
+async def write(search_service, *actions, **kwargs):
+    return [item async for item in search_service.stream_bulk(stream(*actions), **kwargs)]
+
+
+async def test_alias_writes_wait_while_held(search_service):
+    queue = asyncio.Queue()
+
+    async def actions():
+        while (item := await queue.get()) is not None:
+            yield item
+
+    async def consume():
+        return [item async for item in search_service.stream_bulk(actions())]
+
+    writer = asyncio.create_task(consume())
+    queue.put_nowait(action(search_service, "a"))
+    await asyncio.sleep(0.01)
+    old_index = search_service.physical
+    new_index = search_service.versioned_name(2)
+
+    async with asyncio.timeout(1):
+        async with search_service.hold_writes():
+            # The half-filled bulk request was sent before the hold took effect
+            assert "a" in search_service.indices[old_index]
+            queue.put_nowait(action(search_service, "b"))
+            await asyncio.sleep(0.01)
+            assert "b" not in search_service.indices[old_index]
+
+            await write(search_service, action(search_service, "c", index=new_index),
+                        bypass_hold=True)
+            assert "c" in search_service.indices[new_index]
+            search_service.physical = new_index
+
+        queue.put_nowait(None)
+        results = await writer
+
+    assert len(results) == 2
+    assert "b" in search_service.indices[new_index]
+    assert "b" not in search_service.indices[old_index]
+
+
+async def test_hold_waits_for_writes_in_flight(search_service):
+    sent = asyncio.Event()
+    release = asyncio.Event()
+
+    async def bulk(actions, chunk_size=None, max_chunk_bytes=None):
+        request = [item async for item in actions]
+        sent.set()
+        await release.wait()
+        for result in search_service._apply(request):
+            yield result
+
+    search_service._bulk = bulk
+    writer = asyncio.create_task(write(search_service, action(search_service, "a")))
+    await sent.wait()
+
+    hold = asyncio.create_task(search_service.hold_writes().__aenter__())
+    await asyncio.sleep(0.01)
+    assert not hold.done()
+
+    release.set()
+    async with asyncio.timeout(1):
+        await hold
+        assert "a" in search_service.documents
+    await writer
+
+
+async def test_stale_model_writes_are_re_embedded_when_sent(
+    search_service, embedding_service
+):
+    async def aembedding_service():
+        return embedding_service
+
+    search_service.aembedding_service = aembedding_service
+    doc = make_doc("a")
+
+    await write(search_service, action(search_service, "a", model="retired-model"))
+
+    stored = search_service.documents["a"]
+    assert stored["embedding_model"] == search_service.embedding_model_version
+    np.testing.assert_allclose(
+        stored["embedding"],
+        embedding_service.model.vector(f"{doc['title']} {doc['content']}"),
+        rtol=1e-6,
+    )
+
+
+async def test_late_mirror_writes_are_dropped(search_service):
+    target = search_service.versioned_name(2)
+    search_service.start_dual_write(target)
+    mirror = action(search_service, "a", index=target)
+    search_service.stop_dual_write()
+
+    results = await write(search_service, mirror, action(search_service, "b"))
+
+    assert [next(iter(item.values()))["_id"] for _, item in results] == ["b"]
+    assert target not in search_service.indices